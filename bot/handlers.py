@@ -445,6 +445,30 @@ async def settings_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         db.close()
         return
 
+    # Вибір STT рушія: "stt: local" / "stt: openai" / "stt: auto" (з конфігу)
+    elif isinstance(text, str) and text.lower().startswith("stt:"):
+        from voice.stt_engine import USER_STT_ENGINES
+
+        choice = text.split(":", 1)[1].strip().lower()
+        if choice in USER_STT_ENGINES:
+            user.stt_engine = None if choice == "auto" else choice
+            db.commit()
+            note = (
+                f"✅ Розпізнавання мови: {choice}. Перезапусти голосовий режим, щоб застосувати."
+                if user.language == "uk" else
+                f"✅ Speech recognition: {choice}. Restart voice mode to apply."
+            )
+        else:
+            options = ", ".join(USER_STT_ENGINES)
+            note = (
+                f"❌ Невідомий рушій. Доступні: {options}"
+                if user.language == "uk" else
+                f"❌ Unknown engine. Available: {options}"
+            )
+        await message.reply_text(note)
+        db.close()
+        return
+
     # Назад до налаштувань
     elif text in ["🔙 Назад до налаштувань", "🔙 Back to Settings", "🔙 Zurück zu Einstellungen"]:
         await message.reply_text(
@@ -777,9 +801,13 @@ async def send_voice_response(user_id: int, message, text: str, lang: str = "uk"
         try:
             from core.tts import text_to_speech
             from core.audio_manager import AudioManager
+            from config import get_settings
             
-            # Генеруємо TTS
-            audio_response = text_to_speech(user_id, text, lang, voice="onyx")
+            # Генеруємо TTS (для динаміка — сирий PCM, без декодування MP3)
+            audio_response = text_to_speech(
+                user_id, text, lang, voice="onyx",
+                response_format=get_settings().tts_playback_format
+            )
             
             # Відтворюємо через динамік
             audio_manager = AudioManager()
@@ -920,15 +948,11 @@ async def music_control_handler(update: Update, context: ContextTypes.DEFAULT_TY
             # Сповіщаємо голосового бота що може слухати
             try:
                 from core.tts import text_to_speech
-                # Відправляємо коротке голосове повідомлення
-                if lang == "uk":
-                    voice_msg = "Музику зупинено. Я слухаю!"
-                elif lang == "de":
-                    voice_msg = "Musik gestoppt. Ich höre!"
-                else:
-                    voice_msg = "Music stopped. I'm listening!"
+                from core.phrases import MUSIC_STOPPED
+                # Відправляємо коротке голосове повідомлення (фраза прогріта в TTS-кеші)
+                voice_msg = MUSIC_STOPPED.get(lang, MUSIC_STOPPED["en"])
                     
-                audio_data = text_to_speech(user_id, voice_msg)
+                audio_data = text_to_speech(user_id, voice_msg, lang)
                 if audio_data:
                     # Відправляємо голосове повідомлення в чат
                     from io import BytesIO
@@ -1038,16 +1062,15 @@ async def timer_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     async def timer_callback(ctx):
                         try:
                             from core.tts import text_to_speech
+                            from core.phrases import TIMER_DONE
                             
                             if lang == "uk":
                                 text_msg = f"⏰ Таймер на {minutes} хв спрацював!"
-                                voice_msg = f"Таймер на {minutes} хвилин спрацював!"
                             elif lang == "de":
                                 text_msg = f"⏰ Timer für {minutes} Min ist abgelaufen!"
-                                voice_msg = f"Timer für {minutes} Minuten ist abgelaufen!"
                             else:
                                 text_msg = f"⏰ Timer for {minutes} min is up!"
-                                voice_msg = f"Timer for {minutes} minutes is up!"
+                            voice_msg = TIMER_DONE.get(lang, TIMER_DONE["en"]).format(minutes=minutes)
                             
                             # Текстове повідомлення
                             await ctx.bot.send_message(
@@ -1057,7 +1080,7 @@ async def timer_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                             
                             # Голосове повідомлення
                             try:
-                                audio_data = text_to_speech(user_id, voice_msg)
+                                audio_data = text_to_speech(user_id, voice_msg, lang)
                                 if audio_data:
                                     from io import BytesIO
                                     audio_file = BytesIO(audio_data)
@@ -47,6 +47,7 @@ class Settings(BaseSettings):
     # Picovoice (Wake Word)
     PICOVOICE_ACCESS_KEY: Optional[str] = Field(default=None)
     WAKE_WORD: str = Field(default="hey google", description="Wake word для Porcupine (hey google, alexa, ok google)")
+    WAKE_WORD_MODE: str = Field(default="vad", description="Режим детектора: vad, spectral, keyword, always_on, fallback")
 
     # LED Control
     LED_GPIO_PIN: int = Field(default=18, description="GPIO pin для WS2812B LED кільця")
@@ -56,6 +57,39 @@ class Settings(BaseSettings):
     DEFAULT_LANGUAGE: str = Field(default="uk")
     VOICE_GENDER: str = Field(default="male")
 
+    # Audio capture
+    VOICE_PREROLL_SECONDS: float = Field(default=1.5, description="Скільки секунд звуку до тригера додавати на початок команди")
+    VOICE_ENDPOINT_HANGOVER: float = Field(default=0.5, description="Тиша (с) після завершеної фрази до кінця запису")
+    VOICE_ENDPOINT_MAX_SILENCE: float = Field(default=1.2, description="Тиша (с), якщо фраза схожа на незавершену")
+    VOICE_SPECULATIVE_STT: bool = Field(default=True, description="Відправляти запис у STT на першій паузі, не чекаючи кінця тиші")
+    VOICE_SPECULATIVE_PAUSE: float = Field(default=0.25, description="Тиша (с) після мови, з якої стартує спекулятивне STT")
+    VOICE_STREAMING_STT: bool = Field(default=False, description="Часткові гіпотези STT під час запису (ранні інтенти: час, дата); кожні VOICE_PARTIAL_INTERVAL с — платний запит Whisper")
+    VOICE_PARTIAL_INTERVAL: float = Field(default=0.8, description="Секунд нового аудіо між частковими запитами STT")
+    VOICE_SPEECH_GATE_THRESHOLD: float = Field(default=0.5, description="Мінімальна ймовірність мови в записі для відправки в STT")
+    STT_ENGINE: str = Field(default="openai", description="STT рушій за замовчуванням: openai, local (faster-whisper), fake")
+    STT_LOCAL_MODEL: str = Field(default="base", description="Модель faster-whisper (tiny, base, small)")
+    STT_LOCAL_COMPUTE_TYPE: str = Field(default="int8", description="Тип обчислень faster-whisper на CPU")
+    STT_UPLOAD_FORMAT: str = Field(default="flac", description="Формат запису для STT: flac, opus або wav")
+    LLM_STREAMING: bool = Field(default=True, description="Озвучувати відповідь LLM по клаузах, поки вона генерується")
+    INTENT_CLASSIFIER: bool = Field(default=True, description="Локальний класифікатор інтентів для фраз, які не впізнали шаблони (до LLM)")
+    INTENT_CLASSIFIER_THRESHOLD: float = Field(default=0.35, description="Мінімальна схожість (0–1), з якою класифікатор приймає інтент")
+    LLM_RACE_POLICY: str = Field(default="content", description="LLM паралельно з повільними інтентами: off, content (пошук, жарт, факт), all (+ погода)")
+    TTS_ENGINE: str = Field(default="openai", description="TTS рушій відповідей: openai, local (Piper/espeak-ng), fake")
+    TTS_SYSTEM_ENGINE: str = Field(default="", description="Рушій коротких системних фраз (порожньо — як TTS_ENGINE)")
+    TTS_LOCAL_MODEL: str = Field(default="", description="Модель Piper (.onnx, можна з {language}); порожньо — espeak-ng")
+    TTS_CLOUD_TIMEOUT: float = Field(default=4.0, description="Скільки чекати початку відповіді хмарного TTS до локального fallback, с (0 — без fallback)")
+    TTS_PLAYBACK_FORMAT: str = Field(default="pcm", description="Формат TTS для динаміка: pcm (без декодування) або mp3")
+    TTS_STREAMING: bool = Field(default=True, description="Відтворювати відповідь TTS, поки вона ще завантажується")
+    TTS_STREAM_PREBUFFER: float = Field(default=0.15, description="Jitter-буфер (с) перед стартом потокового TTS")
+    TTS_PIPELINE_WORKERS: int = Field(default=3, description="Паралельний синтез речень довгої відповіді (0 — вимкнено)")
+    TTS_CACHE_DIR: str = Field(default=str(PROJECT_ROOT / "storage" / "tts_cache"), description="Тека дискового кешу озвучених фраз")
+    TTS_CACHE_MAX_MB: float = Field(default=50.0, description="Ліміт кешу TTS у МБ (0 — вимкнено)")
+    PCM_CACHE_DIR: str = Field(default=str(PROJECT_ROOT / "storage" / "pcm_cache"), description="Тека PCM гарячих фраз у форматі пристрою (mmap)")
+    PCM_CACHE_MAX_MB: float = Field(default=64.0, description="Бюджет пам'яті PCM-кешу в МБ (0 — вимкнено)")
+    CLIP_SPEECH: bool = Field(default=True, description="Озвучувати час і дату склеюванням кліпів (без TTS-запиту)")
+    CLIP_LIBRARY_DIR: str = Field(default=str(PROJECT_ROOT / "storage" / "clips"), description="Тека кліпів для озвучки часу і дати")
+    AUDIO_DEVICE_CACHE_PATH: str = Field(default=str(PROJECT_ROOT / "storage" / "audio_devices.json"), description="Кеш можливостей аудіо-пристроїв")
+
     # Database
     DATABASE_URL: str = Field(default=f"sqlite:///{PROJECT_ROOT / 'storage' / 'app.db'}")
 
@@ -108,6 +142,10 @@ class Settings(BaseSettings):
     def wake_word(self) -> str:
         return self.WAKE_WORD
 
+    @property
+    def wake_word_mode(self) -> str:
+        return self.WAKE_WORD_MODE
+
     @property
     def default_language(self) -> str:
         return self.DEFAULT_LANGUAGE
@@ -116,6 +154,130 @@ class Settings(BaseSettings):
     def voice_gender(self) -> str:
         return self.VOICE_GENDER
 
+    @property
+    def voice_preroll_seconds(self) -> float:
+        return self.VOICE_PREROLL_SECONDS
+
+    @property
+    def voice_endpoint_hangover(self) -> float:
+        return self.VOICE_ENDPOINT_HANGOVER
+
+    @property
+    def voice_endpoint_max_silence(self) -> float:
+        return self.VOICE_ENDPOINT_MAX_SILENCE
+
+    @property
+    def voice_speculative_stt(self) -> bool:
+        return self.VOICE_SPECULATIVE_STT
+
+    @property
+    def voice_speculative_pause(self) -> float:
+        return self.VOICE_SPECULATIVE_PAUSE
+
+    @property
+    def voice_streaming_stt(self) -> bool:
+        return self.VOICE_STREAMING_STT
+
+    @property
+    def voice_partial_interval(self) -> float:
+        return self.VOICE_PARTIAL_INTERVAL
+
+    @property
+    def voice_speech_gate_threshold(self) -> float:
+        return self.VOICE_SPEECH_GATE_THRESHOLD
+
+    @property
+    def stt_engine(self) -> str:
+        return self.STT_ENGINE
+
+    @property
+    def stt_local_model(self) -> str:
+        return self.STT_LOCAL_MODEL
+
+    @property
+    def stt_local_compute_type(self) -> str:
+        return self.STT_LOCAL_COMPUTE_TYPE
+
+    @property
+    def stt_upload_format(self) -> str:
+        return self.STT_UPLOAD_FORMAT
+
+    @property
+    def tts_playback_format(self) -> str:
+        return self.TTS_PLAYBACK_FORMAT
+
+    @property
+    def tts_streaming(self) -> bool:
+        return self.TTS_STREAMING
+
+    @property
+    def tts_stream_prebuffer(self) -> float:
+        return self.TTS_STREAM_PREBUFFER
+
+    @property
+    def tts_pipeline_workers(self) -> int:
+        return self.TTS_PIPELINE_WORKERS
+
+    @property
+    def llm_streaming(self) -> bool:
+        return self.LLM_STREAMING
+
+    @property
+    def intent_classifier(self) -> bool:
+        return self.INTENT_CLASSIFIER
+
+    @property
+    def intent_classifier_threshold(self) -> float:
+        return self.INTENT_CLASSIFIER_THRESHOLD
+
+    @property
+    def llm_race_policy(self) -> str:
+        return self.LLM_RACE_POLICY
+
+    @property
+    def tts_engine(self) -> str:
+        return self.TTS_ENGINE
+
+    @property
+    def tts_system_engine(self) -> str:
+        return self.TTS_SYSTEM_ENGINE
+
+    @property
+    def tts_local_model(self) -> str:
+        return self.TTS_LOCAL_MODEL
+
+    @property
+    def tts_cloud_timeout(self) -> float:
+        return self.TTS_CLOUD_TIMEOUT
+
+    @property
+    def tts_cache_dir(self) -> str:
+        return self.TTS_CACHE_DIR
+
+    @property
+    def tts_cache_max_mb(self) -> float:
+        return self.TTS_CACHE_MAX_MB
+
+    @property
+    def pcm_cache_dir(self) -> str:
+        return self.PCM_CACHE_DIR
+
+    @property
+    def pcm_cache_max_mb(self) -> float:
+        return self.PCM_CACHE_MAX_MB
+
+    @property
+    def clip_speech(self) -> bool:
+        return self.CLIP_SPEECH
+
+    @property
+    def clip_library_dir(self) -> str:
+        return self.CLIP_LIBRARY_DIR
+
+    @property
+    def audio_device_cache_path(self) -> str:
+        return self.AUDIO_DEVICE_CACHE_PATH
+
     @property
     def led_gpio_pin(self) -> int:
         return self.LED_GPIO_PIN
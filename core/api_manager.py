@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+import threading
+from typing import Any, Dict, Optional, Tuple
 
 from storage.database import SessionLocal
 from storage.models import User, UserSecrets
@@ -94,3 +95,17 @@ class APIManager:
 api_manager = APIManager()
 
 
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def openai_client(api_key: str) -> Any:
+    """Один клієнт OpenAI (і пул з'єднань) на ключ — спільний для STT і TTS"""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            from openai import OpenAI
+            client = _clients[api_key] = OpenAI(api_key=api_key)
+        return client
+
+
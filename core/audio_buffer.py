@@ -0,0 +1,77 @@
+"""
+Кільцевий буфер аудіо-чанків для спільного потоку захоплення.
+
+Один писач (callback PyAudio) додає чанки, будь-яка кількість читачів
+читає їх за власним курсором (порядковим номером чанка), не забираючи
+дані в інших читачів.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import List, Optional, Tuple
+
+
+class AudioRingBuffer:
+    """Кільце фіксованого розміру з порядковими номерами чанків"""
+
+    def __init__(self, capacity_chunks: int):
+        if capacity_chunks < 1:
+            raise ValueError("capacity_chunks має бути >= 1")
+        self.capacity = capacity_chunks
+        self._chunks: List[Optional[bytes]] = [None] * capacity_chunks
+        self._next_seq = 0  # номер, який отримає наступний записаний чанк
+        self._cond = threading.Condition()
+        self.closed = False
+
+    @property
+    def next_seq(self) -> int:
+        """Номер наступного (ще не записаного) чанка"""
+        with self._cond:
+            return self._next_seq
+
+    @property
+    def oldest_seq(self) -> int:
+        """Номер найстарішого чанка, який ще зберігається в кільці"""
+        with self._cond:
+            return max(0, self._next_seq - self.capacity)
+
+    def append(self, chunk: bytes) -> None:
+        """Додає чанк і будить читачів (викликається з audio callback)"""
+        with self._cond:
+            self._chunks[self._next_seq % self.capacity] = chunk
+            self._next_seq += 1
+            self._cond.notify_all()
+
+    def read(self, seq: int, timeout: Optional[float] = None) -> Optional[Tuple[int, bytes]]:
+        """
+        Повертає чанк з номером seq (або найстаріший доступний, якщо seq вже перезаписано)
+
+        Returns:
+            (фактичний номер, дані) або None, якщо таймаут чи буфер закрито
+        """
+        with self._cond:
+            if seq >= self._next_seq:
+                self._cond.wait_for(lambda: self.closed or seq < self._next_seq, timeout=timeout)
+                if seq >= self._next_seq:
+                    return None
+            oldest = max(0, self._next_seq - self.capacity)
+            if seq < oldest:
+                seq = oldest
+            chunk = self._chunks[seq % self.capacity]
+            if chunk is None:
+                return None
+            return seq, chunk
+
+    def snapshot(self, max_chunks: int) -> List[bytes]:
+        """Копія останніх max_chunks чанків (від старих до нових)"""
+        with self._cond:
+            count = min(max_chunks, self.capacity, self._next_seq)
+            start = self._next_seq - count
+            return [self._chunks[i % self.capacity] or b"" for i in range(start, self._next_seq)]
+
+    def close(self) -> None:
+        """Закриває буфер: всі очікуючі читачі повертають None"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
@@ -0,0 +1,287 @@
+"""
+Довгоживучий сервіс захоплення звуку з мікрофона.
+
+Єдиний власник вхідного пристрою: відкриває PyAudio-потік у callback-режимі
+один раз і складає чанки в кільцевий буфер. Детектор wake word, запис команди
+та будь-які інші споживачі підписуються на буфер замість того, щоб самостійно
+відкривати й закривати пристрій на кожен хід розмови.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import List, Optional
+
+import pyaudio
+
+from config import get_settings
+from core.audio_buffer import AudioRingBuffer
+from core.audio_devices import device_registry
+
+
+class CaptureSubscription:
+    """Незалежний курсор читання по спільному буферу захоплення"""
+
+    def __init__(self, service: "AudioCaptureService", start_seq: int):
+        self._service = service
+        self._buffer = service.buffer
+        self._seq = start_seq
+        self.dropped_chunks = 0  # скільки чанків пропущено через відставання
+        self.closed = False
+
+    def read(self, timeout: Optional[float] = 1.0) -> Optional[bytes]:
+        """
+        Повертає наступний чанк PCM (int16 mono @ service.sample_rate)
+
+        Returns:
+            bytes або None, якщо даних немає за timeout чи підписку закрито
+        """
+        if self.closed:
+            return None
+        buffer = self._service.buffer
+        if buffer is None:
+            return None
+        if buffer is not self._buffer:
+            # Потік перевідкрито — починаємо з живої позиції нового буфера
+            self._buffer = buffer
+            self._seq = buffer.next_seq
+        result = buffer.read(self._seq, timeout=timeout)
+        if result is None:
+            return None
+        seq, chunk = result
+        if seq > self._seq:
+            self.dropped_chunks += seq - self._seq
+        self._seq = seq + 1
+        return chunk
+
+    def skip_to_live(self) -> None:
+        """Відкидає все накопичене — наступний read() поверне лише нові дані"""
+        buffer = self._service.buffer
+        if buffer is not None:
+            self._buffer = buffer
+            self._seq = buffer.next_seq
+
+    def close(self) -> None:
+        """Відписується від сервісу"""
+        if not self.closed:
+            self.closed = True
+            self._service._unsubscribe(self)
+
+
+class AudioCaptureService:
+    """Спільний callback-потік мікрофона з кільцевим буфером"""
+
+    def __init__(self, chunk_size: int = 1024, buffer_seconds: float = 5.0):
+        self.chunk_size = chunk_size
+        self.buffer_seconds = buffer_seconds
+        self.sample_rate = 16000  # буде уточнено при відкритті пристрою
+        self.channels = 1
+        self.format = pyaudio.paInt16
+        self.device_index: Optional[int] = None
+
+        self.audio: Optional[pyaudio.PyAudio] = None
+        self.stream = None
+        self.buffer: Optional[AudioRingBuffer] = None
+
+        self._lock = threading.RLock()
+        self._subscriptions: List[CaptureSubscription] = []
+        # Межа, раніше якої pre-roll не заглядає (наприклад, кінець відповіді бота)
+        self._barrier_seq = 0
+
+    # ------------------------------------------------------------------
+    # Життєвий цикл
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """Відкриває пристрій, якщо він ще не відкритий. Повертає True при успіху."""
+        with self._lock:
+            if self.is_running():
+                return True
+            return self._open_stream()
+
+    def is_running(self) -> bool:
+        """Чи активний callback-потік"""
+        if self.stream is None:
+            return False
+        try:
+            return bool(self.stream.is_active())
+        except Exception:
+            return False
+
+    def restart(self) -> bool:
+        """Перевідкриває пристрій (наприклад, після помилки ALSA)"""
+        with self._lock:
+            self._close_stream()
+            return self._open_stream()
+
+    def check_hotplug(self) -> bool:
+        """Перевідкриває потік, якщо пристрої під'єднали/від'єднали. True — якщо перевідкрито."""
+        if not device_registry.has_changed():
+            return False
+        print("🔌 Змінився набір аудіо-пристроїв — перевідкриваю мікрофон")
+        self.restart()
+        return True
+
+    def stop(self) -> None:
+        """Закриває пристрій і звільняє PyAudio"""
+        with self._lock:
+            self._close_stream()
+
+    # ------------------------------------------------------------------
+    # Підписки
+    # ------------------------------------------------------------------
+
+    def subscribe(self, preroll_seconds: float = 0.0) -> CaptureSubscription:
+        """
+        Створює підписку на буфер захоплення
+
+        Args:
+            preroll_seconds: Скільки секунд вже записаного звуку віддати першими
+                (обмежено розміром кільця та останнім mark_barrier())
+        """
+        with self._lock:
+            if not self.is_running():
+                self._open_stream()
+            start_seq = 0
+            if self.buffer is not None:
+                start_seq = self.buffer.next_seq
+                if preroll_seconds > 0:
+                    preroll_chunks = self.seconds_to_chunks(preroll_seconds)
+                    start_seq = max(
+                        start_seq - preroll_chunks,
+                        self.buffer.oldest_seq,
+                        self._barrier_seq,
+                    )
+            subscription = CaptureSubscription(self, start_seq)
+            self._subscriptions.append(subscription)
+            return subscription
+
+    def mark_barrier(self) -> None:
+        """Позначає поточну позицію як межу для pre-roll (все раніше — не команда)"""
+        with self._lock:
+            if self.buffer is not None:
+                self._barrier_seq = self.buffer.next_seq
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def _unsubscribe(self, subscription: CaptureSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def seconds_to_chunks(self, seconds: float) -> int:
+        """Кількість чанків, що покриває задану тривалість на поточній частоті"""
+        return max(1, int(round(seconds * self.sample_rate / self.chunk_size)))
+
+    # ------------------------------------------------------------------
+    # Робота з пристроєм
+    # ------------------------------------------------------------------
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: лише кладе чанк у кільце (без блокувань I/O)"""
+        buffer = self.buffer
+        if buffer is not None and in_data:
+            buffer.append(in_data)
+        return (None, pyaudio.paContinue)
+
+    def _open_stream(self) -> bool:
+        """Відкриває мікрофон у callback-режимі одним викликом за даними реєстру пристроїв."""
+        attempts = 3
+        backoff = 0.4
+        last_error: Optional[Exception] = None
+
+        for attempt in range(1, attempts + 1):
+            try:
+                # Свіжий контекст PyAudio: лише він бачить під'єднані/від'єднані пристрої
+                self._close_stream()
+                self.audio = pyaudio.PyAudio()
+
+                # Пробування відбувається лише при зміні набору карт (інакше — кеш)
+                device_registry.refresh(self.audio)
+                selection = device_registry.select_input()
+                if selection is None:
+                    # Невідомі можливості — дефолтний пристрій на поточній частоті
+                    selection = (None, self.sample_rate)
+
+                device_index, rate = selection
+                self._open_with(device_index, rate)
+                return True
+
+            except Exception as e:
+                print(f"⚠️ Помилка при відкритті мікрофона (спроба {attempt}/{attempts}): {e}")
+                last_error = e
+                # Кеш міг застаріти (інший пристрій на тому ж слоті) — перепробуємо
+                device_registry.invalidate()
+                # Невеликий бекоф перед повтором
+                time.sleep(backoff)
+                continue
+
+        # Після всіх спроб — віддати останню помилку та прибрати ресурси
+        self._close_stream()
+        if last_error:
+            print(f"⚠️ Помилка при відкритті мікрофона (остаточно): {last_error}")
+        return False
+
+    def _open_with(self, device_index: Optional[int], rate: int) -> None:
+        """Відкриває callback-потік на конкретному пристрої та частоті"""
+        if self.audio is None:
+            raise RuntimeError("PyAudio не ініціалізований")
+
+        capacity = max(1, int(self.buffer_seconds * rate / self.chunk_size) + 1)
+        buffer = AudioRingBuffer(capacity)
+        self.buffer = buffer
+        self._barrier_seq = 0
+        self.sample_rate = rate
+        try:
+            self.stream = self.audio.open(
+                format=self.format,
+                channels=self.channels,
+                rate=rate,
+                input=True,
+                input_device_index=device_index,
+                frames_per_buffer=self.chunk_size,
+                stream_callback=self._callback,
+            )
+            self.stream.start_stream()
+        except Exception:
+            self.buffer = None
+            self.stream = None
+            raise
+        self.device_index = device_index
+        print(
+            "✅ Мікрофон відкрито"
+            + (f" (device {device_index})" if device_index is not None else " (default device)")
+            + f" @ {rate} Hz, буфер {self.buffer_seconds:.1f}s"
+        )
+
+    def _close_stream(self) -> None:
+        """Звільнення аудіо ресурсів"""
+        if self.stream is not None:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+        if self.audio is not None:
+            try:
+                self.audio.terminate()
+            except Exception:
+                pass
+            self.audio = None
+
+
+# Глобальний екземпляр (пристрій відкривається при першому start()/subscribe()).
+# Кільце завжди вміщує pre-roll з запасом.
+audio_capture = AudioCaptureService(
+    buffer_seconds=max(5.0, get_settings().voice_preroll_seconds + 2.0),
+)
@@ -0,0 +1,95 @@
+"""
+Декодування відповіді TTS у PCM16 прямо в процесі.
+
+Старий ланцюжок: pydub (підпроцес ffmpeg) → set_frame_rate → set_channels →
+export WAV → повторний розбір WAV у pygame. Тут:
+
+- WAV (у т.ч. сирий PCM від TTS, загорнутий у заголовок) читається модулем wave;
+- MP3/OGG/FLAC декодуються libsndfile (soundfile) у процесі, без підпроцесу;
+- pydub лишається запасним шляхом, якщо soundfile недоступний.
+
+WAV читається по блоках по мірі відтворення (сирий PCM взагалі не
+декодується), тож перший семпл іде в динамік одразу. Ресемплінг до частоти
+пристрою робить core/playback (полі-фазний ресемплер з core/dsp).
+"""
+
+from __future__ import annotations
+
+import wave
+from io import BytesIO
+from typing import Iterator, Tuple
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):  # OSError — немає libsndfile
+    sf = None
+    SOUNDFILE_AVAILABLE = False
+
+
+# OpenAI TTS response_format="pcm": 24 кГц, 16 біт, mono, little-endian, без заголовка
+TTS_PCM_RATE = 24000
+
+DEFAULT_BLOCK_FRAMES = 4096
+
+
+def wrap_pcm(pcm: bytes, rate: int = TTS_PCM_RATE, channels: int = 1) -> bytes:
+    """Сирий PCM16 → WAV (лише заголовок, без перекодування)"""
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def _wav_blocks(wf: wave.Wave_read, block_frames: int) -> Iterator[bytes]:
+    try:
+        while True:
+            block = wf.readframes(block_frames)
+            if not block:
+                return
+            yield block
+    finally:
+        wf.close()
+
+
+def _split_blocks(pcm: bytes, block_bytes: int) -> Iterator[bytes]:
+    view = memoryview(pcm)
+    for start in range(0, len(pcm), block_bytes):
+        yield bytes(view[start:start + block_bytes])
+
+
+def open_decoder(audio_data: bytes, block_frames: int = DEFAULT_BLOCK_FRAMES) -> Tuple[int, int, Iterator[bytes]]:
+    """
+    Готує потокове декодування
+
+    Returns:
+        (частота, кількість каналів, ітератор блоків PCM16 interleaved)
+    """
+    if audio_data[:4] == b"RIFF":
+        wf = wave.open(BytesIO(audio_data), "rb")
+        if wf.getsampwidth() == 2:
+            return wf.getframerate(), wf.getnchannels(), _wav_blocks(wf, block_frames)
+        wf.close()  # 8/24/32 біт — нехай конвертує libsndfile
+
+    if SOUNDFILE_AVAILABLE:
+        try:
+            # Одним викликом: покрокове читання MP3 у libsndfile 1.2 губить кадри
+            samples, rate = sf.read(BytesIO(audio_data), dtype="int16", always_2d=True)
+            channels = samples.shape[1]
+            return rate, channels, _split_blocks(samples.tobytes(), block_frames * 2 * channels)
+        except Exception as e:
+            print(f"⚠️  soundfile не декодував аудіо ({e}) — пробую pydub")
+
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(BytesIO(audio_data)).set_sample_width(2)
+    return audio.frame_rate, audio.channels, iter((audio.raw_data,))
+
+
+def decode_audio(audio_data: bytes) -> Tuple[bytes, int, int]:
+    """Декодує весь файл: (PCM16, частота, канали)"""
+    rate, channels, blocks = open_decoder(audio_data)
+    return b"".join(blocks), rate, channels
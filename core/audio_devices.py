@@ -0,0 +1,306 @@
+"""
+Реєстр аудіо-пристроїв з кешованими можливостями.
+
+Пристрої пробуються (підтримувані частоти/канали) лише один раз, результат
+зберігається на диск з ключем — назвою ALSA-карти. Повторне пробування
+відбувається тільки коли змінюється набір карт (USB-мікрофон під'єднали або
+від'єднали), тож сервіс захоплення відкриває пристрій одним викликом.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import get_settings
+
+
+PROBE_RATES: List[int] = [16000, 44100, 48000, 22050, 32000, 24000, 8000]
+PA_INT16 = 8  # pyaudio.paInt16
+
+_HW_RE = re.compile(r"\((hw:\d+,\d+)\)")
+
+
+class AudioDeviceInfo:
+    """Можливості одного пристрою (знімок пробування)"""
+
+    def __init__(
+        self,
+        key: str,
+        name: str,
+        hw: Optional[str] = None,
+        max_input_channels: int = 0,
+        max_output_channels: int = 0,
+        default_rate: int = 0,
+        input_rates: Optional[List[int]] = None,
+        output_rates: Optional[List[int]] = None,
+    ):
+        self.key = key  # назва ALSA-карти без (hw:X,Y) — стабільна між перепід'єднаннями
+        self.name = name
+        self.hw = hw
+        self.max_input_channels = max_input_channels
+        self.max_output_channels = max_output_channels
+        self.default_rate = default_rate
+        self.input_rates = input_rates or []
+        self.output_rates = output_rates or []
+        self.index: Optional[int] = None  # індекс у поточному екземплярі PyAudio
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "hw": self.hw,
+            "max_input_channels": self.max_input_channels,
+            "max_output_channels": self.max_output_channels,
+            "default_rate": self.default_rate,
+            "input_rates": self.input_rates,
+            "output_rates": self.output_rates,
+        }
+
+    @classmethod
+    def from_dict(cls, key: str, data: Dict[str, Any]) -> "AudioDeviceInfo":
+        return cls(
+            key=key,
+            name=str(data.get("name", key)),
+            hw=data.get("hw"),
+            max_input_channels=int(data.get("max_input_channels", 0)),
+            max_output_channels=int(data.get("max_output_channels", 0)),
+            default_rate=int(data.get("default_rate", 0)),
+            input_rates=[int(r) for r in data.get("input_rates", [])],
+            output_rates=[int(r) for r in data.get("output_rates", [])],
+        )
+
+    def preferred_input_rate(self) -> Optional[int]:
+        """Частота для захоплення: рідна частота пристрою, далі 16k і типові"""
+        for rate in [self.default_rate, 16000, 44100, 48000, 22050]:
+            if rate in self.input_rates:
+                return rate
+        return self.input_rates[0] if self.input_rates else None
+
+
+def card_key(device_name: str) -> str:
+    """'USB PnP Sound Device: Audio (hw:2,0)' → 'USB PnP Sound Device: Audio'"""
+    return _HW_RE.sub("", device_name).strip()
+
+
+class AudioDeviceRegistry:
+    """Пробує пристрої один раз і кешує можливості на диску"""
+
+    def __init__(self, cache_path: Optional[str] = None, cards_path: str = "/proc/asound/cards"):
+        settings = get_settings()
+        self.cache_path = Path(cache_path or settings.audio_device_cache_path)
+        self.cards_path = cards_path
+        self._lock = threading.Lock()
+        self._devices: Dict[str, AudioDeviceInfo] = {}
+        self._fingerprint: Optional[str] = None
+        self.probe_count = 0  # скільки разів реально пробували пристрої (діагностика)
+        self._load_cache()
+
+    # ------------------------------------------------------------------
+    # Кеш
+    # ------------------------------------------------------------------
+
+    def _load_cache(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._fingerprint = data.get("fingerprint")
+            self._devices = {
+                key: AudioDeviceInfo.from_dict(key, info)
+                for key, info in data.get("devices", {}).items()
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Кеш аудіо-пристроїв пошкоджено, буде перепробувано: {e}")
+            self._fingerprint = None
+            self._devices = {}
+
+    def _save_cache(self) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "fingerprint": self._fingerprint,
+                        "devices": {key: info.to_dict() for key, info in self._devices.items()},
+                    },
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"⚠️  Не вдалося зберегти кеш аудіо-пристроїв: {e}")
+
+    def invalidate(self) -> None:
+        """Примусово перепробувати пристрої при наступному refresh()"""
+        with self._lock:
+            self._fingerprint = None
+
+    # ------------------------------------------------------------------
+    # Пробування
+    # ------------------------------------------------------------------
+
+    def hardware_fingerprint(self, pa: Any = None) -> str:
+        """Відбиток набору звукових карт (змінюється при hot-plug)"""
+        try:
+            with open(self.cards_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            # Не Linux/ALSA — беремо список назв PyAudio-пристроїв
+            names = []
+            if pa is not None:
+                for i in range(pa.get_device_count()):
+                    try:
+                        names.append(str(pa.get_device_info_by_index(i).get("name", "")))
+                    except Exception:
+                        continue
+            content = "\n".join(names)
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def has_changed(self) -> bool:
+        """Швидка перевірка hot-plug: чи змінився набір ALSA-карт з останнього пробування"""
+        if not os.path.exists(self.cards_path):
+            return False
+        with self._lock:
+            known = self._fingerprint
+        return known is not None and self.hardware_fingerprint() != known
+
+    def refresh(self, pa: Any) -> bool:
+        """
+        Прив'язує кеш до поточного екземпляра PyAudio
+
+        Пробує пристрої лише якщо набір карт змінився (або кешу немає).
+
+        Returns:
+            True, якщо довелося пробувати пристрої
+        """
+        with self._lock:
+            fingerprint = self.hardware_fingerprint(pa)
+            reprobe = fingerprint != self._fingerprint or not self._devices
+
+            devices: Dict[str, AudioDeviceInfo] = {}
+            probed_new = False
+            for index in range(pa.get_device_count()):
+                try:
+                    raw = pa.get_device_info_by_index(index)
+                except Exception:
+                    continue
+                name = str(raw.get("name", ""))
+                key = card_key(name)
+                if key in devices:
+                    continue
+                info = None if reprobe else self._devices.get(key)
+                if info is None:
+                    info = self._probe_device(pa, index, raw, key)
+                    probed_new = True
+                info.index = index
+                devices[key] = info
+
+            self._devices = devices
+            if reprobe:
+                self.probe_count += 1
+                self._fingerprint = fingerprint
+                print(f"🔎 Аудіо-пристрої пропробувано: {len(devices)} (кеш: {self.cache_path})")
+            if probed_new:
+                self._save_cache()
+            return reprobe
+
+    def _probe_device(self, pa: Any, index: int, raw: Dict[str, Any], key: str) -> AudioDeviceInfo:
+        """Визначає підтримувані частоти пристрою через is_format_supported"""
+        name = str(raw.get("name", ""))
+        hw_match = _HW_RE.search(name)
+        max_in = int(raw.get("maxInputChannels", 0))
+        max_out = int(raw.get("maxOutputChannels", 0))
+        default_rate = int(float(raw.get("defaultSampleRate", 0) or 0))
+        rates = [default_rate] + PROBE_RATES if default_rate else list(PROBE_RATES)
+        rates = list(dict.fromkeys(rates))
+
+        input_rates: List[int] = []
+        output_rates: List[int] = []
+        for rate in rates:
+            if max_in > 0:
+                try:
+                    pa.is_format_supported(rate, input_device=index, input_channels=1, input_format=PA_INT16)
+                    input_rates.append(rate)
+                except Exception:
+                    pass
+            if max_out > 0:
+                try:
+                    pa.is_format_supported(
+                        rate, output_device=index, output_channels=min(2, max_out), output_format=PA_INT16
+                    )
+                    output_rates.append(rate)
+                except Exception:
+                    pass
+
+        return AudioDeviceInfo(
+            key=key,
+            name=name,
+            hw=hw_match.group(1) if hw_match else None,
+            max_input_channels=max_in,
+            max_output_channels=max_out,
+            default_rate=default_rate,
+            input_rates=input_rates,
+            output_rates=output_rates,
+        )
+
+    # ------------------------------------------------------------------
+    # Вибір пристрою
+    # ------------------------------------------------------------------
+
+    @property
+    def devices(self) -> List[AudioDeviceInfo]:
+        with self._lock:
+            return list(self._devices.values())
+
+    def select_input(self) -> Optional[Tuple[Optional[int], int]]:
+        """
+        Обирає вхідний пристрій і частоту без жодних спроб відкриття
+
+        Пріоритет: MIC_ALSA_HW → USB мікрофон → будь-який вхідний.
+
+        Returns:
+            (індекс PyAudio, частота) або None, якщо вхідних пристроїв немає
+        """
+        candidates = [d for d in self.devices if d.max_input_channels > 0 and d.input_rates and d.index is not None]
+        if not candidates:
+            return None
+
+        chosen: Optional[AudioDeviceInfo] = None
+        hw_hint = os.environ.get("MIC_ALSA_HW")
+        if hw_hint:
+            normalized = hw_hint
+            if "," in normalized and not normalized.startswith("hw:"):
+                normalized = f"hw:{normalized}"
+            chosen = next((d for d in candidates if normalized.lower() in d.name.lower()), None)
+            if chosen is None:
+                print(f"⚠️ MIC_ALSA_HW задано ({normalized}), але відповідний пристрій не знайдено")
+
+        if chosen is None:
+            chosen = next((d for d in candidates if "usb" in d.name.lower()), None)
+        if chosen is None:
+            chosen = candidates[0]
+
+        rate = chosen.preferred_input_rate()
+        if rate is None:
+            return None
+        print(f"✅ Обрано вхідний пристрій: {chosen.name} @ {rate} Hz")
+        return chosen.index, rate
+
+    def find_output(self, name_hint: str) -> Optional[AudioDeviceInfo]:
+        """Вихідний пристрій, у назві якого є name_hint (наприклад 'hw:3,0')"""
+        for device in self.devices:
+            if device.max_output_channels > 0 and name_hint.lower() in device.name.lower():
+                return device
+        return None
+
+
+# Глобальний реєстр (кеш читається з диска при імпорті, пробування — ліниво)
+device_registry = AudioDeviceRegistry()
@@ -7,15 +7,27 @@
 import os
 os.environ['JACK_NO_START_SERVER'] = '1'  # Заткнути Jack spam
 
-from typing import Optional
+from typing import Callable, Iterable, Optional, TYPE_CHECKING
 import pyaudio
 import wave
-import audioop
 from io import BytesIO
 import time
 import subprocess
 import os
 
+from config import get_settings
+from core.audio_capture import audio_capture
+from core.audio_devices import device_registry
+from core.endpointer import Endpointer
+from core.audio_decode import TTS_PCM_RATE, wrap_pcm
+from core.pcm_cache import pcm_cache
+from core.playback import playback
+from core.metrics import metrics
+from core import dsp
+
+if TYPE_CHECKING:
+    from voice.speculative_stt import SpeculativeTranscriber
+
 
 class AudioManager:
     """Керування аудіо записом і відтворенням з ReSpeaker"""
@@ -28,23 +40,30 @@ class AudioManager:
         
         self.pa = pyaudio.PyAudio()
         
-        # INPUT: USB мікрофон (device 0)
-        self.input_device_index = 0
-        self.device_rate = 44100  # USB мікрофон працює на 44100
+        # INPUT: спільний потік захоплення (той самий, що слухає wake word).
+        # Пристрій відкривається при першій підписці, тож AudioManager лише
+        # для відтворення не чіпає мікрофон.
+        self.capture = audio_capture
+        self.last_speech_threshold: Optional[int] = None  # поріг мови останнього запису (для обрізання тиші)
         
         # OUTPUT: ReSpeaker - шукаємо hw:3,0
         self.output_device_index = self._find_respeaker()
         
-        print(f"✅ INPUT: USB мікрофон (device {self.input_device_index}) @ {self.device_rate}Hz")
+        print(f"✅ INPUT: спільний потік мікрофона (core/audio_capture)")
         if self.output_device_index is not None:
             print(f"✅ OUTPUT: ReSpeaker (device {self.output_device_index})")
         else:
             print(f"⚠️  OUTPUT: ReSpeaker не знайдено")
         print(f"✅ Whisper sample rate: {self.sample_rate}Hz")
-        
-        # Ініціалізуємо pygame.mixer
-        self._init_pygame_mixer()
+        # Відтворення — через спільний вихідний потік (core/playback);
+        # pygame.mixer ініціалізується лише як fallback
+        self.stream_prebuffer = get_settings().tts_stream_prebuffer  # jitter-буфер потокового TTS
     
+    @property
+    def device_rate(self) -> int:
+        """Частота, на якій працює потік захоплення"""
+        return self.capture.sample_rate
+
     def _init_pygame_mixer(self):
         """Ініціалізує pygame.mixer для відтворення"""
         try:
@@ -63,21 +82,16 @@ class AudioManager:
             print(f"⚠️  pygame.mixer не ініціалізовано: {e}")
     
     def _find_respeaker(self) -> Optional[int]:
-        """Шукає ReSpeaker hw:3,0"""
+        """Шукає ReSpeaker hw:3,0 у реєстрі пристроїв (без повторного пробування)"""
         if self.pa is None:
             print("⚠️  PyAudio не ініціалізований")
             return None
-            
-        for i in range(self.pa.get_device_count()):
-            info = self.pa.get_device_info_by_index(i)
-            name = str(info.get('name', ''))
-            
-            # Шукаємо hw:3,0 напряму
-            if 'hw:3,0' in name:
-                max_output = int(info.get('maxOutputChannels', 0))
-                if max_output > 0:
-                    print(f"✅ Знайдено ReSpeaker: {name}")
-                    return i
+        
+        device_registry.refresh(self.pa)
+        device = device_registry.find_output('hw:3,0')
+        if device is not None:
+            print(f"✅ Знайдено ReSpeaker: {device.name}")
+            return device.index
         
         print("⚠️  hw:3,0 не знайдено!")
         return None
@@ -116,157 +130,211 @@ class AudioManager:
         """Записує N секунд аудіо з мікрофона"""
         print(f"🎤 Запис {duration} секунд...")
         
-        if self.pa is None:
-            raise RuntimeError("AudioManager не ініціалізований. Викличте __init__ або перезапустіть.")
-        
-        stream = self.pa.open(
-            format=self.format,
-            channels=1,  # USB мікрофон mono
-            rate=self.device_rate,  # USB мікрофон працює на 44100
-            input=True,
-            input_device_index=self.input_device_index,
-            frames_per_buffer=self.chunk
-        )
-        
+        subscription = self.capture.subscribe()
+        # Ресемплінг device_rate → 16000 по чанках, прямо під час запису
+        resampler = dsp.PolyphaseResampler(self.device_rate, self.sample_rate)
         frames = []
-        for _ in range(0, int(self.device_rate / self.chunk * duration)):
-            data = stream.read(self.chunk, exception_on_overflow=False)
-            frames.append(data)
-            
-        stream.stop_stream()
-        stream.close()
-        
-        # Об'єднуємо всі фрейми
-        raw_audio = b''.join(frames)
-        
-        # Конвертуємо sample rate: 44100 → 16000
-        resampled = audioop.ratecv(
-            raw_audio,
-            2,  # 2 bytes per sample (paInt16)
-            1,  # mono
-            self.device_rate,  # from 44100
-            self.sample_rate,  # to 16000
-            None
-        )[0]
+        try:
+            chunks_needed = int(self.device_rate / self.capture.chunk_size * duration)
+            for _ in range(chunks_needed):
+                data = subscription.read(timeout=1.0)
+                if data is None:
+                    break
+                frames.append(resampler.process(data))
+        finally:
+            subscription.close()
         
         # Конвертуємо в WAV формат
-        return self._bytes_to_wav(resampled)
+        return self._bytes_to_wav(b''.join(frames))
     
     def record_until_silence(
         self, 
         silence_threshold: int = 500,
         silence_duration: float = 1.5,
-        max_duration: int = 10
+        max_duration: int = 10,
+        preroll_seconds: float = 0.0,
+        noise_rms: Optional[float] = None,
+        hangover: Optional[float] = None,
+        speculative: Optional["SpeculativeTranscriber"] = None,
+        stop_when: Optional[Callable[[bytes], bool]] = None
     ) -> bytes:
-        """Записує поки не буде тиша"""
+        """
+        Записує поки не буде тиша
+
+        Кінець репліки визначає адаптивний endpointer (core/endpointer.py):
+        поріг від рівня шуму, коротка тиша після завершеної фрази і довша
+        (silence_duration) — якщо фраза схожа на незавершену.
+
+        Args:
+            silence_threshold: Нижня межа порогу мови (RMS)
+            silence_duration: Максимальна тиша для незавершеної фрази
+            preroll_seconds: Скільки секунд звуку ДО виклику додати на початок
+                (мова, сказана разом із тригером, не губиться)
+            noise_rms: Живий рівень шуму (від wake-детектора)
+            hangover: Тиша після завершеної фрази (None — з налаштувань)
+            speculative: Якщо задано — запис до першої паузи відправляється в STT
+                наперед (результат забирає speculative.finish())
+            stop_when: Отримує кожен чанк PCM 16 кГц; True — зупинити запис
+                одразу (наприклад, ранній інтент із часткової гіпотези STT)
+        """
+        settings = get_settings()
+        endpointer = Endpointer(
+            self.device_rate,
+            self.capture.chunk_size,
+            noise_rms=noise_rms,
+            min_threshold=silence_threshold,
+            hangover=settings.voice_endpoint_hangover if hangover is None else hangover,
+            incomplete_hangover=silence_duration,
+            # Pre-roll не з'їдає ліміт тривалості самої команди
+            max_duration=max_duration + preroll_seconds,
+        )
+        self.last_speech_threshold = endpointer.threshold
         print("🎤 Запис до тиші...")
-        print(f"  📋 Параметри: поріг={silence_threshold}, тривалість_тиші={silence_duration}s, макс={max_duration}s")
-        
-        if self.pa is None:
-            raise RuntimeError("AudioManager не ініціалізований. Викличте __init__ або перезапустіть.")
-        
-        stream = self.pa.open(
-            format=self.format,
-            channels=1,
-            rate=self.device_rate,  # USB мікрофон працює на 44100
-            input=True,
-            input_device_index=self.input_device_index,
-            frames_per_buffer=self.chunk
+        print(
+            f"  📋 Параметри: поріг={endpointer.threshold} (шум={int(endpointer.noise_rms)}), "
+            f"тиша={endpointer.hangover}..{endpointer.incomplete_hangover}s, макс={max_duration}s, pre-roll={preroll_seconds}s"
         )
         
-        frames = []
-        silent_chunks = 0
-        chunks_per_silence = int(self.device_rate / self.chunk * silence_duration)
-        max_chunks = int(self.device_rate / self.chunk * max_duration)
+        subscription = self.capture.subscribe(preroll_seconds=preroll_seconds)
         
-        start_time = time.time()
+        # Ресемплінг device_rate → 16000 по чанках, прямо під час запису
+        resampler = dsp.PolyphaseResampler(self.device_rate, self.sample_rate)
+        resampled_frames = []
+        chunks = 0
         
-        speech_detected = False
-        speech_chunks = 0
+        start_time = time.time()
         
-        while len(frames) < max_chunks:
-            data = stream.read(self.chunk, exception_on_overflow=False)
-            frames.append(data)
+        while True:
+            data = subscription.read(timeout=1.0)
+            if data is None:
+                print("⚠️  Потік мікрофона не віддає даних, завершую запис")
+                break
+            chunks += 1
+            resampled = resampler.process(data)
+            resampled_frames.append(resampled)
             
-            # Перевіряємо рівень звуку
-            rms = audioop.rms(data, 2)
+            if stop_when is not None and stop_when(resampled):
+                print("⏹️  Запис зупинено достроково")
+                break
             
-            # Показуємо RMS кожні 10 chunks для кращої діагностики
-            if len(frames) % 10 == 0:
-                print(f"  📊 RMS: {rms}, Тиша: {silent_chunks}/{chunks_per_silence}, Поріг: {silence_threshold}")
+            done = endpointer.feed(data)
             
-            # Якщо RMS вище порогу - це мова
-            if rms >= silence_threshold:
-                speech_detected = True
-                speech_chunks += 1
-                silent_chunks = 0
-                print(f"  🗣️ Мова детектована! RMS: {rms}")
-            else:
-                # Якщо мова вже була детектована, рахуємо тишу
-                if speech_detected:
-                    silent_chunks += 1
-                    if silent_chunks > chunks_per_silence:
-                        print(f"🔇 Тиша {silence_duration}s після мови detected.")
-                        break
-                else:
-                    # Якщо мова ще не почалася, скидаємо лічильник тиші
-                    silent_chunks = 0
+            if speculative is not None and endpointer.speech_started:
+                if endpointer.silence_seconds == 0:
+                    speculative.on_speech()
+                elif endpointer.silence_seconds >= speculative.pause_seconds and not done:
+                    speculative.on_pause(lambda: self._bytes_to_wav(b''.join(resampled_frames)))
+            
+            # Показуємо RMS кожні 10 chunks для кращої діагностики
+            if chunks % 10 == 0:
+                print(
+                    f"  📊 RMS: {endpointer.last_rms}, Тиша: {endpointer.silence_seconds:.2f}/"
+                    f"{endpointer.required_silence():.2f}s, Поріг: {endpointer.threshold}"
+                )
+            if done:
+                break
                 
         elapsed = time.time() - start_time
+        subscription.close()
         
         # Перевіряємо чи була детектована мова
-        if not speech_detected:
+        if not endpointer.speech_started:
             print(f"⚠️  Мова не детектована за {elapsed:.1f}s (максимум {max_duration}s)")
         else:
-            print(f"✅ Записано {elapsed:.1f}s (мова детектована)")
-        
-        # Отримуємо останній RMS значення
-        last_rms = 0
-        if frames:
-            try:
-                last_rms = audioop.rms(frames[-1], 2)
-            except:
-                last_rms = 0
-        
-        print(f"  📊 Підсумок: {len(frames)} chunks, мова: {speech_detected}, останній RMS: {last_rms}")
+            print(f"✅ Записано {elapsed:.1f}s (мова {endpointer.speech_seconds:.1f}s, причина: {endpointer.reason})")
         
-        stream.stop_stream()
-        stream.close()
+        if endpointer.endpoint_latency is not None:
+            metrics.observe("endpoint_latency", endpointer.endpoint_latency)
+            print(f"  ⏱️ {metrics.format('endpoint_latency')}")
         
-        # Об'єднуємо і конвертуємо
-        raw_audio = b''.join(frames)
+        print(f"  📊 Підсумок: {chunks} chunks, мова: {endpointer.speech_started}, останній RMS: {endpointer.last_rms}")
         
-        # Resample: 44100 → 16000
-        resampled = audioop.ratecv(
-            raw_audio,
-            2,
-            1,
-            self.device_rate,
-            self.sample_rate,
-            None
-        )[0]
-        
-        return self._bytes_to_wav(resampled)
+        # Семпли вже на 16000 Hz — лише збираємо WAV
+        return self._bytes_to_wav(b''.join(resampled_frames))
     
     def _bytes_to_wav(self, audio_bytes: bytes) -> bytes:
         """Конвертує raw audio bytes в WAV"""
-        if self.pa is None:
-            raise RuntimeError("AudioManager не ініціалізований. Викличте __init__ або перезапустіть.")
-        
         buffer = BytesIO()
         
         with wave.open(buffer, 'wb') as wf:
             wf.setnchannels(self.channels)
-            wf.setsampwidth(self.pa.get_sample_size(self.format))
+            wf.setsampwidth(pyaudio.get_sample_size(self.format))
             wf.setframerate(self.sample_rate)  # 16000 Hz
             wf.writeframes(audio_bytes)
             
         return buffer.getvalue()
     
     def play_audio(self, audio_data: bytes) -> None:
-        """Відтворює аудіо через pygame.mixer (найстабільніше на Pi)"""
+        """
+        Відтворює аудіо через постійний вихідний потік (core/playback)
+
+        Пристрій не відкривається на кожну відповідь, декодування йде в процесі
+        (без ffmpeg), а завершення приходить подією з callback-а. Якщо потік
+        відкрити не вдалося — pygame.mixer.
+        """
         print(f"🔊 Відтворення {len(audio_data)} bytes...")
         
+        if not playback.start():
+            self._play_with_pygame(audio_data)
+            return
+        
+        try:
+            job = playback.play_encoded(audio_data)
+            if job.cancelled:
+                print(f"   ⏹️ Відтворення перервано")
+            else:
+                print(f"   ✅ Відтворено: {job.channels}ch, {job.source_rate}Hz → {playback.rate}Hz ({metrics.format('playback_start_latency')})")
+        except Exception as e:
+            print(f"❌ Помилка відтворення: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def play_cached(self, key: str) -> bool:
+        """Гаряча фраза з PCM-кешу (mmap у форматі пристрою); False — якщо її там немає"""
+        if not playback.start():
+            return False
+        view = pcm_cache.get(key, playback.rate, playback.channels)
+        if view is None:
+            return False
+        print(f"⚡ Відтворення з PCM-кешу ({len(view) / 1024:.0f} KB)")
+        playback.play_device_pcm(view)
+        return True
+    
+    def cache_pcm(self, key: str, audio_data: bytes) -> bool:
+        """Конвертує аудіо у формат пристрою і кладе в PCM-кеш (без відтворення)"""
+        if not playback.start():
+            return False
+        if pcm_cache.contains(key, playback.rate, playback.channels):
+            return True
+        return pcm_cache.put(key, playback.rate, playback.channels, playback.render(audio_data)) is not None
+    
+    def play_stream(self, chunks: Iterable[bytes], source_rate: int = TTS_PCM_RATE) -> bool:
+        """
+        Відтворює PCM, що ще завантажується (потоковий TTS)
+        
+        Returns:
+            False, якщо не прийшло жодного звуку (можна повторити не потоково)
+        """
+        requested_at = time.perf_counter()
+        
+        if not playback.start():
+            pcm = b"".join(chunks)
+            if not pcm:
+                return False
+            self._play_with_pygame(wrap_pcm(pcm, source_rate))
+            return True
+        
+        job = playback.play_stream(chunks, source_rate, prebuffer_seconds=self.stream_prebuffer)
+        if job.first_sample_at is None:
+            return False
+        metrics.observe("tts_time_to_first_sample", job.first_sample_at - requested_at)
+        print(f"   ✅ Відтворено потоково ({metrics.format('tts_time_to_first_sample')}, недобори: {job.underruns})")
+        return True
+    
+    def _play_with_pygame(self, audio_data: bytes) -> None:
+        """Відтворення через pygame.mixer (fallback, якщо вихідний потік недоступний)"""
+        self._init_pygame_mixer()
+        
         try:
             from pydub import AudioSegment
             import pygame
@@ -278,26 +346,18 @@ class AudioManager:
             else:
                 audio = AudioSegment.from_mp3(BytesIO(audio_data))
             
-            print(f"   Формат: {'WAV' if audio_data[:4] == b'RIFF' else 'MP3'}")
-            print(f"   Оригінал: {audio.channels}ch, {audio.frame_rate}Hz")
-            
             # Конвертуємо до 44100Hz stereo (що підтримує ReSpeaker)
             if audio.frame_rate != 44100:
-                print(f"   🔄 Resampling {audio.frame_rate}Hz → 44100Hz")
                 audio = audio.set_frame_rate(44100)
-            
             if audio.channels == 1:
-                print(f"   🔄 Конвертую mono → stereo")
                 audio = audio.set_channels(2)
             
-            print(f"   ✅ Параметри: {audio.channels}ch, {audio.frame_rate}Hz")
-            
             # Експортуємо як WAV в пам'ять
             wav_buffer = BytesIO()
             audio.export(wav_buffer, format='wav')
             wav_buffer.seek(0)
             
-            print(f"   ▶️ Відтворюю...")
+            print(f"   ▶️ Відтворюю (pygame)...")
             
             # Завантажуємо і відтворюємо
             sound = pygame.mixer.Sound(wav_buffer)
@@ -331,7 +391,7 @@ class AudioManager:
             print(f"❌ Помилка відтворення через aplay: {e}")
 
     def cleanup(self):
-        """Звільняє ресурси"""
+        """Звільняє ресурси (спільні потоки захоплення і відтворення не закриваємо)"""
         if hasattr(self, 'pa') and self.pa:
             self.pa.terminate()
             self.pa = None
@@ -0,0 +1,308 @@
+"""
+Озвучка часу і дати склеюванням заздалегідь записаних кліпів.
+
+«Зараз 14:05.» чи «Сьогодні п'ятниця, 17 жовтня 2026 року.» — завжди ті самі
+кілька десятків слів. Замість запиту TTS на кожну відповідь тут:
+
+- словник кліпів для мови і голосу: числа 0–59, порядкові числівники в
+  потрібному відмінку (дні, роки), дні тижня, місяці (uk — у родовому),
+  фрази-носії («Зараз», «Сьогодні», «Es ist jetzt», …);
+- кліпи синтезуються один раз (у фоні при старті) і лежать на диску як WAV
+  24 кГц mono з обрізаною тишею;
+- відповідь — послідовність кліпів, склеєна з короткими кросфейдами.
+
+Рендер займає мілісекунди і не потребує мережі.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import wave
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core import dsp
+from core.audio_decode import TTS_PCM_RATE, decode_audio
+from core.metrics import metrics
+
+
+CLIP_RATE = TTS_PCM_RATE
+PAUSE = "_pause"  # службовий токен: коротка пауза (кома)
+
+# ---------------------------------------------------------------------------
+# Числівники
+# ---------------------------------------------------------------------------
+
+_UK_UNITS = ["нуль", "один", "два", "три", "чотири", "п'ять", "шість", "сім", "вісім", "дев'ять"]
+_UK_TEENS = ["десять", "одинадцять", "дванадцять", "тринадцять", "чотирнадцять", "п'ятнадцять",
+             "шістнадцять", "сімнадцять", "вісімнадцять", "дев'ятнадцять"]
+_UK_TENS = {2: "двадцять", 3: "тридцять", 4: "сорок", 5: "п'ятдесят", 6: "шістдесят",
+            7: "сімдесят", 8: "вісімдесят", 9: "дев'яносто"}
+# Порядкові, родовий відмінок («сімнадцятого жовтня», «двадцять шостого року»)
+_UK_ORD_UNITS = ["", "першого", "другого", "третього", "четвертого", "п'ятого", "шостого",
+                 "сьомого", "восьмого", "дев'ятого"]
+_UK_ORD_TEENS = ["десятого", "одинадцятого", "дванадцятого", "тринадцятого", "чотирнадцятого",
+                 "п'ятнадцятого", "шістнадцятого", "сімнадцятого", "вісімнадцятого", "дев'ятнадцятого"]
+_UK_ORD_TENS = {2: "двадцятого", 3: "тридцятого", 4: "сорокового", 5: "п'ятдесятого",
+                6: "шістдесятого", 7: "сімдесятого", 8: "вісімдесятого", 9: "дев'яностого"}
+
+_DE_UNITS = ["null", "eins", "zwei", "drei", "vier", "fünf", "sechs", "sieben", "acht", "neun"]
+_DE_TEENS = ["zehn", "elf", "zwölf", "dreizehn", "vierzehn", "fünfzehn", "sechzehn",
+             "siebzehn", "achtzehn", "neunzehn"]
+_DE_TENS = {2: "zwanzig", 3: "dreißig", 4: "vierzig", 5: "fünfzig", 6: "sechzig",
+            7: "siebzig", 8: "achtzig", 9: "neunzig"}
+_DE_ORD_SPECIAL = {1: "erste", 3: "dritte", 7: "siebte", 8: "achte"}
+
+_EN_UNITS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+_EN_TEENS = ["ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+             "seventeen", "eighteen", "nineteen"]
+_EN_TENS = {2: "twenty", 3: "thirty", 4: "forty", 5: "fifty", 6: "sixty",
+            7: "seventy", 8: "eighty", 9: "ninety"}
+_EN_ORD_UNITS = ["", "first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth"]
+_EN_ORD_TEENS = ["tenth", "eleventh", "twelfth", "thirteenth", "fourteenth", "fifteenth",
+                 "sixteenth", "seventeenth", "eighteenth", "nineteenth"]
+_EN_ORD_TENS = {2: "twentieth", 3: "thirtieth", 4: "fortieth", 5: "fiftieth", 6: "sixtieth",
+                7: "seventieth", 8: "eightieth", 9: "ninetieth"}
+
+
+def cardinal(n: int, language: str) -> str:
+    """Кількісний числівник 0–99"""
+    tens, units = divmod(n, 10)
+    if language == "uk":
+        if n < 10:
+            return _UK_UNITS[n]
+        if n < 20:
+            return _UK_TEENS[units]
+        return _UK_TENS[tens] + (f" {_UK_UNITS[units]}" if units else "")
+    if language == "de":
+        if n < 10:
+            return _DE_UNITS[n]
+        if n < 20:
+            return _DE_TEENS[units]
+        if not units:
+            return _DE_TENS[tens]
+        return ("ein" if units == 1 else _DE_UNITS[units]) + "und" + _DE_TENS[tens]
+    if n < 10:
+        return _EN_UNITS[n]
+    if n < 20:
+        return _EN_TEENS[units]
+    return _EN_TENS[tens] + (f"-{_EN_UNITS[units]}" if units else "")
+
+
+def ordinal(n: int, language: str) -> str:
+    """Порядковий числівник 1–99 (uk — родовий відмінок, de — після «der»)"""
+    tens, units = divmod(n, 10)
+    if language == "uk":
+        if n < 10:
+            return _UK_ORD_UNITS[n]
+        if n < 20:
+            return _UK_ORD_TEENS[units]
+        return f"{_UK_TENS[tens]} {_UK_ORD_UNITS[units]}" if units else _UK_ORD_TENS[tens]
+    if language == "de":
+        if n in _DE_ORD_SPECIAL:
+            return _DE_ORD_SPECIAL[n]
+        return cardinal(n, "de") + ("te" if n < 20 else "ste")
+    if n < 10:
+        return _EN_ORD_UNITS[n]
+    if n < 20:
+        return _EN_ORD_TEENS[units]
+    return f"{_EN_TENS[tens]}-{_EN_ORD_UNITS[units]}" if units else _EN_ORD_TENS[tens]
+
+
+# ---------------------------------------------------------------------------
+# Словник і граматика відповідей
+# ---------------------------------------------------------------------------
+
+_WEEKDAYS = {
+    "uk": ["понеділок", "вівторок", "середа", "четвер", "п'ятниця", "субота", "неділя"],
+    "de": ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"],
+    "en": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"],
+}
+_MONTHS = {
+    "uk": ["січня", "лютого", "березня", "квітня", "травня", "червня", "липня", "серпня",
+           "вересня", "жовтня", "листопада", "грудня"],
+    "de": ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli", "August",
+           "September", "Oktober", "November", "Dezember"],
+    "en": ["January", "February", "March", "April", "May", "June", "July", "August",
+           "September", "October", "November", "December"],
+}
+_CARRIERS = {
+    "uk": {"now": "Зараз", "exact": "рівно", "today": "Сьогодні", "y2000": "дві тисячі", "year": "року"},
+    "de": {"now": "Es ist jetzt", "uhr": "Uhr", "ein": "ein", "today": "Heute ist", "der": "der",
+           "y2000": "zweitausend"},
+    "en": {"now": "It's", "oclock": "o'clock", "oh": "oh", "today": "Today is", "y20": "twenty"},
+}
+
+SUPPORTED_LANGUAGES = tuple(_CARRIERS)
+
+
+def time_tokens(hour: int, minute: int, language: str) -> List[str]:
+    """Токени відповіді «котра година»"""
+    if language == "uk":
+        tokens = ["now", f"n{hour}"]
+        if minute == 0:
+            return tokens + ["exact"]
+        return tokens + (["n0", f"n{minute}"] if minute < 10 else [f"n{minute}"])
+    if language == "de":
+        tokens = ["now", "ein" if hour == 1 else f"n{hour}", "uhr"]
+        return tokens + ([f"n{minute}"] if minute else [])
+    tokens = ["now", f"n{hour}"]
+    if minute == 0:
+        return tokens + ["oclock"]
+    return tokens + (["oh", f"n{minute}"] if minute < 10 else [f"n{minute}"])
+
+
+def date_tokens(day: datetime, language: str) -> Optional[List[str]]:
+    """Токени відповіді «яке сьогодні число»; None — рік поза словником"""
+    rest = day.year - 2000
+    weekday, month = f"w{day.weekday()}", f"m{day.month}"
+    if language == "uk":
+        if not 1 <= rest <= 99:
+            return None
+        return ["today", weekday, PAUSE, f"o{day.day}", month, "y2000", f"o{rest}", "year"]
+    if language == "de":
+        if not 1 <= rest <= 99:
+            return None
+        return ["today", weekday, PAUSE, "der", f"o{day.day}", month, "y2000", f"n{rest}"]
+    if not 10 <= rest <= 99:
+        return None
+    return ["today", weekday, PAUSE, month, f"o{day.day}", PAUSE, "y20", f"n{rest}"]
+
+
+def vocabulary(language: str, years: Tuple[int, ...] = ()) -> Dict[str, str]:
+    """Токен → текст для синтезу кліпу"""
+    words: Dict[str, str] = dict(_CARRIERS[language])
+    words.update({f"n{n}": cardinal(n, language) for n in range(60)})
+    words.update({f"o{n}": ordinal(n, language) for n in range(1, 32)})
+    words.update({f"w{i}": name for i, name in enumerate(_WEEKDAYS[language])})
+    words.update({f"m{i + 1}": name for i, name in enumerate(_MONTHS[language])})
+    for year in years:
+        rest = year - 2000
+        if 0 < rest < 100:
+            key = f"o{rest}" if language == "uk" else f"n{rest}"
+            words[key] = ordinal(rest, language) if language == "uk" else cardinal(rest, language)
+    return words
+
+
+# ---------------------------------------------------------------------------
+# Кліпи
+# ---------------------------------------------------------------------------
+
+def trim_clip(samples: np.ndarray, rate: int = CLIP_RATE, pad: float = 0.02, ratio: float = 0.05) -> np.ndarray:
+    """Обрізає тишу, яку TTS додає на початку і в кінці слова"""
+    block = max(1, int(rate * 0.01))
+    if samples.size < block:
+        return samples
+    levels = dsp.block_rms(dsp.array_to_pcm16(samples), block)
+    voiced = np.flatnonzero(levels > levels.max() * ratio)
+    if voiced.size == 0:
+        return samples
+    padding = int(rate * pad)
+    start = max(0, voiced[0] * block - padding)
+    end = min(samples.size, (voiced[-1] + 1) * block + padding)
+    return samples[start:end]
+
+
+def concatenate(clips: List[np.ndarray], rate: int = CLIP_RATE, crossfade: float = 0.015) -> np.ndarray:
+    """Склеює кліпи з кросфейдом (raised cosine), щоб не було клацань на стиках"""
+    overlap = int(rate * crossfade)
+    out = np.zeros(0, dtype=np.float32)
+    for clip in clips:
+        clip = clip.astype(np.float32)
+        n = min(overlap, out.size, clip.size)
+        if n:
+            fade_in = 0.5 - 0.5 * np.cos(np.linspace(0.0, np.pi, n, dtype=np.float32))
+            out[-n:] = out[-n:] * (1.0 - fade_in) + clip[:n] * fade_in
+            clip = clip[n:]
+        out = np.concatenate((out, clip))
+    return out
+
+
+class ClipLibrary:
+    """Кліпи однієї мови і голосу: диск → пам'ять → склеєна відповідь"""
+
+    def __init__(self, directory: Union[str, Path], language: str, voice: str, pause: float = 0.12):
+        self.language = language if language in SUPPORTED_LANGUAGES else "en"
+        self.voice = voice
+        self.directory = Path(directory) / f"{self.language}_{voice}"
+        self._pause = np.zeros(int(CLIP_RATE * pause), dtype=np.float32)
+        self._clips: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, token: str) -> Path:
+        return self.directory / f"{token}.wav"
+
+    def missing(self, years: Tuple[int, ...] = ()) -> List[str]:
+        return [token for token in vocabulary(self.language, years) if not self._path(token).exists()]
+
+    def build(self, synthesize: Callable[[str], bytes], years: Tuple[int, ...] = ()) -> int:
+        """
+        Синтезує відсутні кліпи; повертає кількість нових
+
+        Args:
+            synthesize: Текст → аудіо (WAV/MP3), наприклад text_to_speech(..., response_format="pcm")
+        """
+        words = vocabulary(self.language, years)
+        built = 0
+        for token in self.missing(years):
+            pcm, rate, channels = decode_audio(synthesize(words[token]))
+            if channels == 2:
+                pcm = dsp.stereo_to_mono(pcm)
+            if rate != CLIP_RATE:
+                pcm = dsp.resample(pcm, rate, CLIP_RATE)
+            clip = dsp.array_to_pcm16(trim_clip(dsp.pcm16_to_array(pcm).astype(np.float32)))
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with wave.open(str(self._path(token)), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(CLIP_RATE)
+                wf.writeframes(clip)
+            built += 1
+        return built
+
+    def _clip(self, token: str) -> Optional[np.ndarray]:
+        if token == PAUSE:
+            return self._pause
+        with self._lock:
+            clip = self._clips.get(token)
+            if clip is None:
+                path = self._path(token)
+                if not path.exists():
+                    return None
+                with wave.open(str(path), "rb") as wf:
+                    clip = dsp.pcm16_to_array(wf.readframes(wf.getnframes())).astype(np.float32)
+                self._clips[token] = clip
+            return clip
+
+    def render(self, tokens: Optional[List[str]]) -> Optional[bytes]:
+        """WAV 24 кГц mono або None, якщо якогось кліпу ще немає"""
+        if not tokens:
+            return None
+        start = time.perf_counter()
+        clips = []
+        for token in tokens:
+            clip = self._clip(token)
+            if clip is None:
+                return None
+            clips.append(clip)
+        pcm = dsp.array_to_pcm16(concatenate(clips))
+        buffer = BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(CLIP_RATE)
+            wf.writeframes(pcm)
+        metrics.observe("clip_render_seconds", time.perf_counter() - start)
+        return buffer.getvalue()
+
+    def render_time(self, now: Optional[datetime] = None) -> Optional[bytes]:
+        now = now or datetime.now()
+        return self.render(time_tokens(now.hour, now.minute, self.language))
+
+    def render_date(self, now: Optional[datetime] = None) -> Optional[bytes]:
+        return self.render(date_tokens(now or datetime.now(), self.language))
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-import re
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, FrozenSet, List, Tuple, Union
 from datetime import datetime
 import random
 
+from core.intent_classifier import IntentClassifier, pattern_examples
+from core.intent_matcher import IntentMatcher
+from core.metrics import metrics
+from core.spoken import Reply, to_speech
+
 
 class CommandType:
     GENERAL_INFO = "general_info"
@@ -141,20 +145,43 @@ PATTERNS: Dict[str, Dict[str, List[str]]] = {
 }
 
 
-def determine_command_type(text: str, language: str = "uk") -> tuple[str, Optional[Dict[str, Any]]]:
-    lang_patterns = PATTERNS.get(language, PATTERNS["en"])
+# Загальні шаблони — нижчий пріоритет: перевіряються після всіх конкретних,
+# щоб «грай (.+)» чи «pause» не перехоплювали точніші команди
+GENERIC_PATTERNS: Dict[str, FrozenSet[str]] = {
+    "uk": frozenset({
+        r"грай (.+)", r"включи (.+)", r"поставити (.+)", r"пусти (.+)", r"пауза",
+        r"погода (.+)", r"жарт", r"факт", r"цікаве", r"історія",
+    }),
+    "en": frozenset({r"play (.+)", r"pause", r"joke", r"funny", r"fact", r"timer", r"history"}),
+    "de": frozenset({r"spiele (.+)", r"pause", r"witz", r"tatsache", r"timer", r"geschichte"}),
+}
+
+# Один скомпільований матчер на мову (core/intent_matcher)
+INTENT_MATCHERS: Dict[str, IntentMatcher] = {
+    language: IntentMatcher(patterns, GENERIC_PATTERNS.get(language, ()))
+    for language, patterns in PATTERNS.items()
+}
+
+
+def determine_command_type(
+    text: str,
+    language: str = "uk",
+    telegram_user_id: Optional[int] = None,
+    use_classifier: bool = True,
+) -> tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Інтент і слоти: шаблони → маркери веб-пошуку → локальний класифікатор → UNKNOWN
+
+    Якщо інтент вгадав класифікатор (core/intent_classifier), слотів немає,
+    а в params лежить "confidence" — такі команди не стають мітками історії.
+    Класифікатор відповідає лише інтентами з CLASSIFIER_INTENTS.
+    use_classifier=False — лише детерміновані шаблони (часткові гіпотези STT).
+    """
+    matcher = INTENT_MATCHERS.get(language, INTENT_MATCHERS["en"])
     text_lower = text.lower()
-    for command_type, patterns in lang_patterns.items():
-        for pattern in patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                params: Dict[str, Any] = {}
-                if match.groups():
-                    if len(match.groups()) >= 1:
-                        params["action"] = match.group(1)
-                    if len(match.groups()) >= 2:
-                        params["value"] = match.group(2)
-                return command_type, params
+    matched = matcher.match(text_lower)
+    if matched is not None:
+        return matched
     if (
         "що таке" in text_lower
         or "розкажи про" in text_lower
@@ -164,16 +191,145 @@ def determine_command_type(text: str, language: str = "uk") -> tuple[str, Option
         or "erzähl mir über" in text_lower
     ):
         return CommandType.WEB_SEARCH, {"query": text}
+    if use_classifier:
+        classifier = get_intent_classifier(language, telegram_user_id)
+        predicted = classifier.predict(text) if classifier is not None else None
+        if predicted is not None and predicted[0] in CLASSIFIER_INTENTS:
+            intent, confidence = predicted
+            metrics.increment("intent_classifier_hits")
+            print(f"🧭 Класифікатор: {intent} ({confidence:.2f})")
+            return intent, {"confidence": confidence}
     return CommandType.UNKNOWN, None
 
 
+# Що класифікатор може повернути: інформаційні інтенти без слотів і побічних дій.
+# Музика, таймер, календар і погода без слота з шаблону — або дія наосліп
+# («stop» → resume), або відповідь не про те місто; такі фрази йдуть у LLM.
+# Решта інтентів у навчанні лишається — як «приманки», що відбирають схожі фрази.
+CLASSIFIER_INTENTS: FrozenSet[str] = frozenset({
+    CommandType.TIME, CommandType.DATE, CommandType.JOKE, CommandType.FACT, CommandType.HISTORY,
+})
+
+# Класифікатор на (мову, користувача): приклади з PATTERNS + його розмічена історія.
+# Будується один раз (старт daemon або перший промах шаблонів); нові мітки
+# історії дописуються в нього на місці (_save_to_history), без перенавчання.
+INTENT_CLASSIFIERS: Dict[Tuple[str, Optional[int]], Optional[IntentClassifier]] = {}
+
+# Скільки останніх розмічених команд історії брати в навчання
+CLASSIFIER_HISTORY_LIMIT = 500
+
+
+def get_intent_classifier(language: str, telegram_user_id: Optional[int] = None) -> Optional[IntentClassifier]:
+    """Класифікатор для мови (None — вимкнено в INTENT_CLASSIFIER)"""
+    key = (language, telegram_user_id)
+    if key in INTENT_CLASSIFIERS:
+        return INTENT_CLASSIFIERS[key]
+    from config import get_settings
+    
+    settings = get_settings()
+    classifier: Optional[IntentClassifier] = None
+    if settings.intent_classifier:
+        classifier = IntentClassifier(
+            classifier_examples(language, telegram_user_id), threshold=settings.intent_classifier_threshold
+        )
+        print(f"🧭 Класифікатор інтентів ({language}): {len(classifier)} прикладів")
+    INTENT_CLASSIFIERS[key] = classifier
+    return classifier
+
+
+def classifier_examples(language: str, telegram_user_id: Optional[int] = None) -> List[Tuple[str, str]]:
+    """(фраза, інтент) для навчання: розгорнуті PATTERNS + розмічена історія користувача"""
+    patterns = PATTERNS.get(language, PATTERNS["en"])
+    examples = [
+        (example, intent)
+        for intent, intent_patterns in patterns.items()
+        for pattern in intent_patterns
+        for example in pattern_examples(pattern)
+    ]
+    if telegram_user_id:
+        examples += _load_labeled_history(telegram_user_id, language, frozenset(patterns))
+    return examples
+
+
+def _learn_intent_example(telegram_user_id: int, language: str, command: str, intent: str) -> None:
+    """Нова мітка в історії — одразу приклад у вже збудованому класифікаторі (без перенавчання)"""
+    classifier = INTENT_CLASSIFIERS.get((language, telegram_user_id))
+    if classifier is not None and classifier.add(command, intent):
+        print(f"🧭 Класифікатор ({language}): новий приклад {intent}")
+
+
+def _load_labeled_history(user_id: int, language: str, intents: FrozenSet[str]) -> List[Tuple[str, str]]:
+    """(команда, інтент) з історії користувача — лише мітки regex-проходу"""
+    try:
+        from storage.database import SessionLocal
+        from storage.models import Conversation
+        
+        db = SessionLocal()
+        try:
+            rows = db.query(Conversation.command, Conversation.intent).filter(
+                Conversation.user_id == user_id,
+                Conversation.language == language,
+                Conversation.intent.in_(intents),
+            ).order_by(Conversation.timestamp.desc()).limit(CLASSIFIER_HISTORY_LIMIT).all()
+            return [(command, intent) for command, intent in rows]
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"⚠️ Історія для класифікатора недоступна: {e}")
+        return []
+
+
 def process_command(text: str, language: str = "uk", telegram_user_id: Optional[int] = None) -> str:
-    command_type, params = determine_command_type(text, language)
+    """Відповідь як текст для Telegram"""
+    return process_command_result(text, language, telegram_user_id).text
+
+
+# Інтенти, що чекають на мережу, які можна змагати з LLM (LLM_RACE_POLICY).
+# content — LLM дає повноцінну заміну (пошук, жарт, факт); all — ще й погода.
+# Музику (Mopidy) не змагаємо: це дія, а не відповідь.
+LLM_RACE_INTENTS: Dict[str, FrozenSet[str]] = {
+    "off": frozenset(),
+    "content": frozenset({CommandType.WEB_SEARCH, CommandType.JOKE, CommandType.FACT}),
+    "all": frozenset({CommandType.WEB_SEARCH, CommandType.JOKE, CommandType.FACT, CommandType.WEATHER}),
+}
+
+
+def process_command_result(
+    text: str,
+    language: str = "uk",
+    telegram_user_id: Optional[int] = None,
+    intent: Optional[tuple[str, Optional[Dict[str, Any]]]] = None,
+) -> Reply:
+    """
+    Відповідь у двох формах: reply.text — для чату, reply.speech — коротко для TTS
+
+    intent — (тип, параметри), якщо викликач уже класифікував команду
+    (daemon робить це раз на хід); інакше визначається тут.
+    """
+    command_type, params = intent if intent is not None else determine_command_type(text, language, telegram_user_id)
     
     # Зберігаємо команду в історію
     if telegram_user_id:
-        _save_to_history(telegram_user_id, text, language)
+        _save_to_history(telegram_user_id, text, language, history_label(command_type, params))
+    
+    reply = run_intent(command_type, params, text, language, telegram_user_id)
+    
+    # Зберігаємо відповідь в історію
+    if telegram_user_id:
+        _update_history_response(telegram_user_id, reply.text)
     
+    return reply
+
+
+def run_intent(
+    command_type: str,
+    params: Optional[Dict[str, Any]],
+    text: str,
+    language: str = "uk",
+    telegram_user_id: Optional[int] = None,
+) -> Reply:
+    """Обробник уже визначеного інтенту (без історії — її пише викликач)"""
+    response: Union[str, Reply]
     if command_type == CommandType.TIME:
         response = _get_time_response(language)
     elif command_type == CommandType.DATE:
@@ -187,9 +343,11 @@ def process_command(text: str, language: str = "uk", telegram_user_id: Optional[
     elif command_type == CommandType.WEB_SEARCH:
         response = _process_web_search(text, language)
     elif command_type == CommandType.JOKE:
-        response = _get_joke(language)
+        joke = _get_joke(language)
+        response = Reply(joke, to_speech(joke, language, budget=0))  # жарт не обрізаємо
     elif command_type == CommandType.FACT:
-        response = _get_fact(language)
+        fact = _get_fact(language)
+        response = Reply(fact, to_speech(fact, language, budget=0))
     elif command_type == CommandType.TIMER:
         response = _set_timer(params, language)
     elif command_type == CommandType.HISTORY:
@@ -197,40 +355,58 @@ def process_command(text: str, language: str = "uk", telegram_user_id: Optional[
     else:
         response = _get_unknown_response(language)
     
-    # Зберігаємо відповідь в історію
-    if telegram_user_id:
-        _update_history_response(telegram_user_id, response)
-    
-    return response
+    reply = response if isinstance(response, Reply) else Reply(response, language=language)
+    reply.intent = command_type
+    return reply
+
+
+def record_history(
+    telegram_user_id: int,
+    command: str,
+    response: str,
+    language: str = "uk",
+    intent: Optional[str] = None,
+) -> None:
+    """Команда і відповідь одним записом (коли відповідь прийшла не з router)"""
+    _save_to_history(telegram_user_id, command, language, intent)
+    _update_history_response(telegram_user_id, response)
+
+
+def history_label(command_type: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Інтент для Conversation.intent: тільки впевнені (regex) — класифікатор не вчиться на своїх здогадках"""
+    if command_type == CommandType.UNKNOWN or (params and "confidence" in params):
+        return None
+    return command_type
+
+
+UNKNOWN_RESPONSES: Dict[str, List[str]] = {
+    "uk": [
+        "Вибачте, я не зрозумів вашу команду.",
+        "Не впевнений, що ви маєте на увазі.",
+        "Можете, будь ласка, сформулювати по-іншому?",
+        "Я не розпізнав цю команду.",
+    ],
+    "de": [
+        "Entschuldigung, ich habe Ihren Befehl nicht verstanden.",
+        "Ich bin nicht sicher, was Sie meinen.",
+        "Könnten Sie es bitte anders formulieren?",
+        "Ich habe diesen Befehl nicht erkannt.",
+    ],
+    "en": [
+        "Sorry, I didn't understand your command.",
+        "I'm not sure what you mean.",
+        "Could you please rephrase that?",
+        "I didn't recognize this command.",
+    ],
+}
 
 
 def _get_unknown_response(language: str) -> str:
     """Відповідь на невідому команду"""
-    if language == "uk":
-        responses = [
-            "Вибачте, я не зрозумів вашу команду.",
-            "Не впевнений, що ви маєте на увазі.",
-            "Можете, будь ласка, сформулювати по-іншому?",
-            "Я не розпізнав цю команду.",
-        ]
-    elif language == "de":
-        responses = [
-            "Entschuldigung, ich habe Ihren Befehl nicht verstanden.",
-            "Ich bin nicht sicher, was Sie meinen.",
-            "Könnten Sie es bitte anders formulieren?",
-            "Ich habe diesen Befehl nicht erkannt.",
-        ]
-    else:
-        responses = [
-            "Sorry, I didn't understand your command.",
-            "I'm not sure what you mean.",
-            "Could you please rephrase that?",
-            "I didn't recognize this command.",
-        ]
-    return random.choice(responses)
+    return random.choice(UNKNOWN_RESPONSES.get(language, UNKNOWN_RESPONSES["en"]))
 
 
-def _save_to_history(user_id: int, command: str, language: str) -> None:
+def _save_to_history(user_id: int, command: str, language: str, intent: Optional[str] = None) -> None:
     """Зберігає команду в історію"""
     try:
         from storage.database import SessionLocal
@@ -242,12 +418,15 @@ def _save_to_history(user_id: int, command: str, language: str) -> None:
                 user_id=user_id,
                 command=command,
                 response="",  # Поки що порожня, оновимо після обробки
-                language=language
+                language=language,
+                intent=intent
             )
             db.add(conv)
             db.commit()
         finally:
             db.close()
+        if intent is not None:
+            _learn_intent_example(user_id, language, command, intent)
     except Exception as e:
         print(f"⚠️ Помилка збереження в історію: {e}")
 
@@ -361,7 +540,7 @@ def _get_date_response(language: str) -> str:
     return f"Today is {weekdays[now.weekday()]}, {months[now.month-1]} {now.day}, {now.year}."
 
 
-def _get_weather_response(params: Optional[Dict[str, Any]], language: str) -> str:
+def _get_weather_response(params: Optional[Dict[str, Any]], language: str) -> Union[str, Reply]:
     """Отримує погоду"""
     try:
         from integrations.weather import weather_manager
@@ -380,8 +559,13 @@ def _get_weather_response(params: Optional[Dict[str, Any]], language: str) -> st
             else:
                 return "🌤️ Tell me which city to check the weather for. For example: 'What's the weather in London?'"
         
-        success, message = weather_manager.get_weather(city, language)
-        return message
+        success, weather = weather_manager.fetch(city, language)
+        if not success:
+            return weather
+        return Reply(
+            weather_manager.format_text(weather, language),
+            weather_manager.format_speech(weather, language),
+        )
         
     except Exception as e:
         print(f"❌ Помилка погоди: {e}")
@@ -451,7 +635,7 @@ def _set_timer(params: Optional[Dict[str, Any]], language: str) -> str:
         return f"✅ Timer for {minutes} min will be set via Telegram bot"
 
 
-def _get_history(user_id: Optional[int], language: str) -> str:
+def _get_history(user_id: Optional[int], language: str) -> Union[str, Reply]:
     """Показує історію розмов"""
     if not user_id:
         if language == "uk":
@@ -481,17 +665,20 @@ def _get_history(user_id: Optional[int], language: str) -> str:
                     return "📜 History is empty"
             
             if language == "uk":
-                history_text = "📜 Останні команди:\n\n"
+                title = "Останні команди"
             elif language == "de":
-                history_text = "📜 Letzte Befehle:\n\n"
+                title = "Letzte Befehle"
             else:
-                history_text = "📜 Recent commands:\n\n"
+                title = "Recent commands"
+            history_text = f"📜 {title}:\n\n"
             
             for i, conv in enumerate(reversed(conversations), 1):
                 time_str = conv.timestamp.strftime("%H:%M")
                 history_text += f"{i}. [{time_str}] {conv.command[:50]}\n"
             
-            return history_text
+            # Вголос — без номерів і часу, лише три останні команди
+            recent = "; ".join(conv.command[:50].strip().rstrip(".?!") for conv in conversations[:3])
+            return Reply(history_text, to_speech(f"{title}: {recent}.", language))
             
         finally:
             db.close()
@@ -553,8 +740,8 @@ def _process_calendar_command(params: Optional[Dict[str, Any]], language: str, u
     return "Sorry, Google Calendar integration is still in development."
 
 
-def _process_web_search(query: str, language: str) -> str:
-    from core.web_search import web_search
-    return web_search(query, language)
+def _process_web_search(query: str, language: str) -> Reply:
+    from core.web_search import search_reply
+    return search_reply(query, language)
 
 
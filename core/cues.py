@@ -0,0 +1,62 @@
+"""
+Короткі звукові сигнали, згенеровані локально.
+
+Рендеряться один раз на процес (numpy → WAV 44.1 кГц stereo, формат виходу
+ReSpeaker), тож відтворення не потребує ні мережі, ні TTS, ні ресемплінгу.
+"""
+
+from __future__ import annotations
+
+import threading
+import wave
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core import dsp
+
+CUE_RATE = 44100
+
+# Назва → послідовність (частота Гц, тривалість с); частота 0 — пауза
+CUES: Dict[str, List[Tuple[float, float]]] = {
+    "not_heard": [(660.0, 0.11), (0.0, 0.04), (440.0, 0.16)],  # «не почув» — низхідні ноти
+    "ack": [(880.0, 0.08)],                                     # короткий «так»
+}
+
+_rendered: Dict[str, bytes] = {}
+_lock = threading.Lock()
+
+
+def _render(notes: List[Tuple[float, float]], amplitude: float = 0.25) -> bytes:
+    parts = []
+    for freq, seconds in notes:
+        t = np.arange(int(CUE_RATE * seconds)) / CUE_RATE
+        if freq <= 0:
+            parts.append(np.zeros_like(t))
+            continue
+        tone = np.sin(2 * np.pi * freq * t) + 0.3 * np.sin(4 * np.pi * freq * t)
+        # Плавні краї (10 мс), щоб не було клацань
+        fade = min(len(t) // 2, int(CUE_RATE * 0.01))
+        envelope = np.ones_like(t)
+        envelope[:fade] = np.linspace(0.0, 1.0, fade)
+        envelope[len(t) - fade:] = np.linspace(1.0, 0.0, fade)
+        parts.append(tone * envelope / 1.3)
+    mono = dsp.array_to_pcm16(np.concatenate(parts) * amplitude * 32767)
+
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(CUE_RATE)
+        wf.writeframes(dsp.mono_to_stereo(mono))
+    return buffer.getvalue()
+
+
+def get_cue(name: str) -> bytes:
+    """WAV-байти сигналу (рендер при першому зверненні, далі з пам'яті)"""
+    with _lock:
+        cue = _rendered.get(name)
+        if cue is None:
+            cue = _rendered[name] = _render(CUES[name])
+        return cue
@@ -0,0 +1,166 @@
+"""
+Векторизована обробка PCM для захоплення та відтворення (заміна audioop).
+
+Усі функції працюють з little-endian int16 PCM у вигляді bytes, як і
+PyAudio/audioop, тож їх можна підставляти без зміни формату даних.
+
+- rms / block_rms — гучність чанка або блоків усередині чанка
+- PolyphaseResampler — потоковий раціональний ресемплер (наприклад 44.1k→16k),
+  що обробляє кожен чанк одразу під час запису
+- mono_to_stereo / stereo_to_mono — конвертація каналів
+"""
+
+from __future__ import annotations
+
+from math import gcd
+from typing import Optional
+
+import numpy as np
+
+
+def pcm16_to_array(data: bytes) -> np.ndarray:
+    """bytes (int16 LE) → np.ndarray[int16] без копіювання"""
+    return np.frombuffer(data, dtype="<i2")
+
+
+def array_to_pcm16(samples: np.ndarray) -> bytes:
+    """Округлює, обрізає до діапазону int16 і повертає bytes"""
+    if samples.dtype != np.int16:
+        samples = np.clip(np.rint(samples), -32768, 32767).astype("<i2")
+    return samples.tobytes()
+
+
+def rms(data: bytes) -> int:
+    """RMS int16-чанка, ціле значення як у audioop.rms(data, 2)"""
+    samples = pcm16_to_array(data)
+    if samples.size == 0:
+        return 0
+    wide = samples.astype(np.int64)
+    return int(np.sqrt(np.dot(wide, wide) / samples.size))
+
+
+def block_rms(data: bytes, block_size: int) -> np.ndarray:
+    """
+    RMS для кожного повного блоку з block_size семплів
+
+    Returns:
+        np.ndarray[float64] довжиною len(samples) // block_size
+    """
+    samples = pcm16_to_array(data)
+    blocks = samples.size // block_size
+    if blocks == 0:
+        return np.zeros(0, dtype=np.float64)
+    framed = samples[: blocks * block_size].astype(np.float64).reshape(blocks, block_size)
+    return np.sqrt(np.mean(framed * framed, axis=1))
+
+
+def mono_to_stereo(data: bytes) -> bytes:
+    """Дублює mono int16 у два канали (L=R)"""
+    samples = pcm16_to_array(data)
+    return np.repeat(samples, 2).tobytes()
+
+
+def stereo_to_mono(data: bytes) -> bytes:
+    """Середнє двох каналів int16 (як audioop.tomono(data, 2, 0.5, 0.5))"""
+    samples = pcm16_to_array(data)
+    frames = samples[: samples.size // 2 * 2].reshape(-1, 2).astype(np.int32)
+    return ((frames[:, 0] + frames[:, 1]) // 2).astype("<i2").tobytes()
+
+
+def _design_polyphase_bank(up: int, down: int, taps_per_phase: int, cutoff: float, beta: float) -> np.ndarray:
+    """
+    Віконний sinc-фільтр (Kaiser), розкладений на `up` фаз
+
+    Returns:
+        np.ndarray[float32] форми (up, taps_per_phase), коефіцієнти кожної фази
+        вже розвернуті для згортки через ковзне вікно
+    """
+    length = up * taps_per_phase
+    # Частота зрізу відносно частоти після інтерполяції (Найквіст = 0.5)
+    fc = 0.5 * cutoff / max(up, down)
+    n = np.arange(length) - (length - 1) / 2.0
+    prototype = 2.0 * fc * np.sinc(2.0 * fc * n) * np.kaiser(length, beta)
+    bank = prototype.reshape(taps_per_phase, up).T.copy()
+    # Кожна фаза має одиничне підсилення на DC — без пульсацій амплітуди
+    bank /= bank.sum(axis=1, keepdims=True)
+    return bank[:, ::-1].astype(np.float32)
+
+
+class PolyphaseResampler:
+    """
+    Потоковий полі-фазний ресемплер int16 mono
+
+    Зберігає хвіст попереднього чанка і фазу, тож результат обробки по
+    чанках збігається з обробкою всього запису одним шматком.
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int,
+        taps_per_phase: int = 48,
+        cutoff: float = 0.9,
+        beta: float = 6.0,
+    ):
+        """
+        Args:
+            in_rate: Частота вхідного сигналу (наприклад 44100)
+            out_rate: Частота вихідного сигналу (наприклад 16000)
+            taps_per_phase: Довжина фільтра на фазу (якість ↔ CPU)
+            cutoff: Зріз як частка Найквіста меншої з частот
+            beta: Параметр вікна Кайзера (6.0 ≈ 60 дБ придушення)
+        """
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError("Частоти дискретизації мають бути додатними")
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        g = gcd(in_rate, out_rate)
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self.taps = taps_per_phase
+        self.passthrough = in_rate == out_rate
+        self._bank: Optional[np.ndarray] = None
+        if not self.passthrough:
+            self._bank = _design_polyphase_bank(self.up, self.down, taps_per_phase, cutoff, beta)
+        self.reset()
+
+    def reset(self) -> None:
+        """Скидає стан (новий незалежний потік)"""
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._consumed = 0  # скільки вхідних семплів вже отримано
+        self._next_out = 0  # абсолютний індекс наступного вихідного семпла
+
+    def process(self, data: bytes) -> bytes:
+        """Ресемплює наступний чанк PCM int16 і повертає готові вихідні семпли"""
+        if self.passthrough or not data:
+            return data
+        assert self._bank is not None
+
+        samples = pcm16_to_array(data).astype(np.float32)
+        buffer = np.concatenate((self._history, samples))
+        base = self._consumed - (self.taps - 1)  # абсолютний індекс buffer[0]
+        self._consumed += samples.size
+
+        # Вихідний семпл k спирається на вхідний n_k = floor(k*down/up)
+        last_out = (self._consumed * self.up - 1) // self.down
+        if last_out < self._next_out:
+            self._history = buffer[-(self.taps - 1):] if self.taps > 1 else self._history
+            return b""
+        k = np.arange(self._next_out, last_out + 1, dtype=np.int64)
+        self._next_out = int(last_out) + 1
+        position = k * self.down
+        n = position // self.up
+        phase = position % self.up
+
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self.taps)
+        start = n - base - (self.taps - 1)
+        out = np.einsum("ij,ij->i", windows[start], self._bank[phase])
+
+        if self.taps > 1:
+            self._history = buffer[-(self.taps - 1):].copy()
+        return array_to_pcm16(out)
+
+
+def resample(data: bytes, in_rate: int, out_rate: int) -> bytes:
+    """Одноразовий ресемплінг цілого буфера int16 mono"""
+    return PolyphaseResampler(in_rate, out_rate).process(data)
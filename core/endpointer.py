@@ -0,0 +1,126 @@
+"""
+Адаптивний детектор кінця репліки (endpointer).
+
+Замість фіксованих «1.5 с нижче RMS 200» поріг мови рахується від живого
+рівня шуму (його вже виміряв wake-детектор), а тиша після мови триває:
+
+- коротко (hangover), якщо сказано достатньо і пауза нічим не виділяється;
+- довше, якщо репліка схожа на незавершену: мови поки мало («Привіт бот… »)
+  або мовець уже робив у цій репліці паузи такої довжини і продовжував.
+
+Час рахується в аудіо-часі (за кількістю семплів), тому рішення детерміновані
+і не залежать від навантаження CPU.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from core import dsp
+
+
+class Endpointer:
+    """Покроковий (по чанках) детектор кінця репліки"""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        chunk_size: int,
+        noise_rms: Optional[float] = None,
+        min_threshold: int = 150,
+        snr_factor: float = 2.5,
+        hangover: float = 0.5,
+        incomplete_hangover: float = 1.2,
+        min_complete_speech: float = 0.6,
+        no_speech_timeout: float = 5.0,
+        max_duration: float = 10.0,
+    ):
+        """
+        Args:
+            sample_rate: Частота вхідного PCM
+            chunk_size: Семплів у чанку (для логування; фактична довжина береться з даних)
+            noise_rms: Рівень шуму від wake-детектора (None — тільки min_threshold)
+            min_threshold: Нижня межа порогу мови (RMS)
+            snr_factor: Поріг мови = шум × snr_factor
+            hangover: Тиша після завершеної репліки (секунди)
+            incomplete_hangover: Тиша, якщо репліка схожа на незавершену
+            min_complete_speech: Скільки секунд мови вважати «достатньо сказаним»
+            no_speech_timeout: Скільки чекати початку мови
+            max_duration: Жорсткий ліміт запису
+        """
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.noise_rms = float(noise_rms or 0.0)
+        self.min_threshold = min_threshold
+        self.snr_factor = snr_factor
+        self.hangover = hangover
+        self.incomplete_hangover = max(hangover, incomplete_hangover)
+        self.min_complete_speech = min_complete_speech
+        self.no_speech_timeout = no_speech_timeout
+        self.max_duration = max_duration
+
+        self.elapsed = 0.0          # аудіо-час від початку запису
+        self.speech_seconds = 0.0   # скільки з нього — мова
+        self.silence_seconds = 0.0  # поточна тиша після мови
+        self.speech_started = False
+        self.gaps: List[float] = []  # паузи всередині репліки, після яких мова продовжилась
+        self.reason: Optional[str] = None  # 'silence' | 'no_speech' | 'max_duration'
+        self.endpoint_latency: Optional[float] = None  # тиша від кінця мови до рішення
+        self.last_rms = 0
+
+    @property
+    def threshold(self) -> int:
+        """Поточний поріг мови"""
+        return max(self.min_threshold, int(self.noise_rms * self.snr_factor))
+
+    def required_silence(self) -> float:
+        """Скільки тиші зараз потрібно, щоб вважати репліку завершеною"""
+        required = self.hangover
+        if self.speech_seconds < self.min_complete_speech:
+            # Мало сказано — найімовірніше, людина ще думає
+            required = self.incomplete_hangover
+        if self.gaps:
+            # Мовець уже робив такі паузи й продовжував — чекаємо трохи довше
+            required = max(required, min(max(self.gaps) * 1.3, self.incomplete_hangover))
+        return required
+
+    def feed(self, data: bytes) -> bool:
+        """
+        Обробляє один чанк PCM16
+
+        Returns:
+            True, коли досягнуто кінця репліки (причина — у self.reason)
+        """
+        if self.reason is not None:
+            return True
+
+        duration = len(data) / 2 / self.sample_rate
+        self.elapsed += duration
+        rms = dsp.rms(data)
+        self.last_rms = rms
+
+        if rms >= self.threshold:
+            if self.speech_started and self.silence_seconds > 0:
+                self.gaps.append(self.silence_seconds)
+            self.speech_started = True
+            self.speech_seconds += duration
+            self.silence_seconds = 0.0
+        else:
+            # Тихі чанки підтягують оцінку шуму (шум міг змінитися після калібрування)
+            if self.noise_rms:
+                self.noise_rms = 0.95 * self.noise_rms + 0.05 * rms
+            if self.speech_started:
+                self.silence_seconds += duration
+                if self.silence_seconds >= self.required_silence():
+                    return self._finish("silence", self.silence_seconds)
+            elif self.elapsed >= self.no_speech_timeout:
+                return self._finish("no_speech", None)
+
+        if self.elapsed >= self.max_duration:
+            return self._finish("max_duration", self.silence_seconds if self.speech_started else None)
+        return False
+
+    def _finish(self, reason: str, latency: Optional[float]) -> bool:
+        self.reason = reason
+        self.endpoint_latency = latency
+        return True
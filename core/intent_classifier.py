@@ -0,0 +1,209 @@
+"""
+Локальний класифікатор інтентів: символьні n-грами + TF-IDF, найближчий приклад.
+
+Стоїть між regex-проходом (core/intent_matcher) і LLM: фрази на кшталт
+«скажи котру годину» шаблони не ловлять, а запит до Groq/OpenAI на них
+коштує 1–3 с. Тут фраза розкладається на n-грами символів усередині слів
+(« ко», «кот», «котр»...) — це стійко до відмінків, закінчень і порядку
+слів — і порівнюється косинусом з прикладами. Косинус сам по собі плутає
+фрази зі спільними словами («скільки тобі років» ≈ «скільки годин»), тож
+приклад зараховується, лише якщо кожне його значуще слово є у фразі
+(з точністю до закінчення: «котра година» ↔ «скажи котру годину») і він
+пояснює більше половини слів фрази.
+Відповідь — інтент найближчого такого прикладу, якщо схожість не нижча
+за поріг і помітно вища, ніж у наступного інтенту; інакше None, і
+команда йде в LLM як раніше.
+
+Приклади — розгорнуті шаблони PATTERNS («(включи|грай) пісню (.+)» →
+«включи пісню», «грай пісню») плюс розмічена історія Conversation.
+Усе на чистому Python: кілька сотень прикладів, пошук через інвертований
+індекс — частки мілісекунди на фразу.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Слоти шаблону — не частина фрази-прикладу
+_SLOT = re.compile(r"\((?:\.\+|\\d\+|\.\*)\)")
+_GROUP = re.compile(r"\(([^()]*)\)\??")
+_REGEX_CHARS = re.compile(r"[\\^$.*+?{}\[\]]")
+_NON_WORD = re.compile(r"[^\w']+")
+
+# Скільки варіантів максимум дає один шаблон з альтернаціями
+MAX_VARIANTS = 8
+
+# Слова однакові, якщо збігаються перші STEM_CHARS літер («годину» = «година»);
+# коротші за MIN_WORD_CHARS («a», «me», «на») при покритті не враховуються
+STEM_CHARS = 4
+MIN_WORD_CHARS = 3
+
+# Більше ніж яку частку значущих слів фрази має пояснювати приклад: «what time
+# does the shop close» містить «what's the time», але питає не про поточний час
+MIN_QUERY_COVERAGE = 0.5
+
+
+def normalize(text: str) -> str:
+    """Нижній регістр, без пунктуації, одинарні пробіли"""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def pattern_examples(pattern: str) -> List[str]:
+    """Фрази-приклади з regex-шаблону: слоти прибрано, альтернації розгорнуто"""
+    template = _SLOT.sub(" ", pattern)
+    choices: List[List[str]] = []
+
+    def hole(match: "re.Match[str]") -> str:
+        choices.append(match.group(1).split("|"))
+        return "\0"
+
+    template = _GROUP.sub(hole, template)
+    examples: List[str] = []
+    for variant in itertools.islice(itertools.product(*choices), MAX_VARIANTS):
+        text = template
+        for choice in variant:
+            text = text.replace("\0", choice, 1)
+        text = normalize(_REGEX_CHARS.sub(" ", text))
+        if text and text not in examples:
+            examples.append(text)
+    return examples
+
+
+def same_word(a: str, b: str) -> bool:
+    """Одне слово з точністю до закінчення (короткі — лише точний збіг)"""
+    if len(a) < STEM_CHARS or len(b) < STEM_CHARS:
+        return a == b
+    return a[:STEM_CHARS] == b[:STEM_CHARS]
+
+
+def covers(query_words: List[str], example_words: List[str]) -> bool:
+    """Чи є кожне значуще слово прикладу у фразі, а приклад — про більшість фрази"""
+    example_content = [word for word in example_words if len(word) >= MIN_WORD_CHARS]
+    if not all(any(same_word(word, query_word) for query_word in query_words) for word in example_content):
+        return False
+    query_content = [word for word in query_words if len(word) >= MIN_WORD_CHARS]
+    explained = sum(1 for word in query_content if any(same_word(word, ex) for ex in example_content))
+    return explained > MIN_QUERY_COVERAGE * len(query_content)
+
+
+def char_ngrams(text: str, sizes: Tuple[int, ...] = (2, 3, 4)) -> Counter:
+    """N-грами символів у межах слів (слово обрамлене пробілами)"""
+    grams: Counter = Counter()
+    for word in normalize(text).split():
+        padded = f" {word} "
+        for n in sizes:
+            for i in range(max(1, len(padded) - n + 1)):
+                grams[padded[i:i + n]] += 1
+    return grams
+
+
+class IntentClassifier:
+    """TF-IDF по символьних n-грамах, відповідь — інтент найближчого прикладу"""
+
+    def __init__(self, examples: Iterable[Tuple[str, str]], threshold: float = 0.35, margin: float = 0.1):
+        """
+        Args:
+            examples: (фраза, інтент)
+            threshold: Мінімальна косинусна схожість, нижче — None (невідомо)
+            margin: На скільки найкращий інтент має випереджати другий
+        """
+        self.threshold = threshold
+        self.margin = margin
+        self.intents: List[str] = []
+        self._words: List[List[str]] = []
+        self._seen: Set[Tuple[str, str]] = set()
+        counts: List[Counter] = []
+        for text, intent in examples:
+            key = (normalize(text), intent)
+            if not key[0] or key in self._seen:
+                continue
+            self._seen.add(key)
+            counts.append(char_ngrams(text))
+            self.intents.append(intent)
+            self._words.append(key[0].split())
+
+        document_frequency: Counter = Counter()
+        for grams in counts:
+            document_frequency.update(grams.keys())
+        total = len(counts)
+        self._idf: Dict[str, float] = {
+            gram: math.log((1 + total) / (1 + df)) + 1.0 for gram, df in document_frequency.items()
+        }
+        # n-грама → [(номер прикладу, вага)]
+        self._index: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for number, grams in enumerate(counts):
+            for gram, weight in self._vector(grams).items():
+                self._index[gram].append((number, weight))
+
+    def __len__(self) -> int:
+        return len(self.intents)
+
+    def add(self, text: str, intent: str) -> bool:
+        """
+        Дописує приклад без перенавчання; False — такий уже є
+
+        IDF решти прикладів не перераховується: одна фраза на сотні його
+        майже не зсуває. Нові n-грами отримують IDF ще не баченої.
+        """
+        key = (normalize(text), intent)
+        if not key[0] or key in self._seen:
+            return False
+        self._seen.add(key)
+        unseen = math.log(1 + len(self)) + 1.0
+        grams = char_ngrams(text)
+        for gram in grams:
+            self._idf.setdefault(gram, unseen)
+        number = len(self.intents)
+        self._words.append(key[0].split())
+        self.intents.append(intent)
+        for gram, weight in self._vector(grams).items():
+            self._index[gram].append((number, weight))
+        return True
+
+    def _vector(self, grams: Counter) -> Dict[str, float]:
+        """Сублінійний TF × IDF, L2-нормований; невідомі n-грами відкидаються"""
+        weights = {
+            gram: (1.0 + math.log(count)) * self._idf[gram]
+            for gram, count in grams.items() if gram in self._idf
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {gram: w / norm for gram, w in weights.items()} if norm else {}
+
+    def scores(self, text: str) -> List[Tuple[str, float]]:
+        """Найкраща схожість для кожного інтенту (серед покритих прикладів), за спаданням"""
+        grams = char_ngrams(text)
+        # Норма запиту — по всіх його n-грамах: незнайомі слова знижують схожість
+        query_norm = math.sqrt(sum(
+            ((1.0 + math.log(count)) * self._idf.get(gram, math.log(1 + len(self)) + 1.0)) ** 2
+            for gram, count in grams.items()
+        ))
+        if not query_norm:
+            return []
+        similarity: Dict[int, float] = defaultdict(float)
+        for gram, count in grams.items():
+            postings = self._index.get(gram)
+            if not postings:
+                continue
+            weight = (1.0 + math.log(count)) * self._idf[gram] / query_norm
+            for number, example_weight in postings:
+                similarity[number] += weight * example_weight
+        query_words = normalize(text).split()
+        best: Dict[str, float] = {}
+        for number, score in similarity.items():
+            intent = self.intents[number]
+            if score > best.get(intent, 0.0) and covers(query_words, self._words[number]):
+                best[intent] = score
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)
+
+    def predict(self, text: str) -> Optional[Tuple[str, float]]:
+        """(інтент, схожість) або None, якщо нічого не дотягує до порогу"""
+        ranked = self.scores(text)
+        if not ranked or ranked[0][1] < self.threshold:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < self.margin:
+            return None  # два інтенти однаково схожі — хай відповідає LLM
+        return ranked[0]
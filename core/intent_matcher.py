@@ -0,0 +1,111 @@
+"""
+Компільований матчер інтентів: усі шаблони мови — один регулярний вираз.
+
+Раніше determine_command_type на кожну фразу проходив циклом по ~60
+некомпільованих шаблонах (re.search + пошук у кеші re на кожен). Тут
+шаблони мови складаються в одну альтернацію з іменованими групами,
+впорядковану за пріоритетом:
+
+    (?P<i0>котра година)|(?P<i1>погода в (.+))|...
+
+re.search знаходить найлівіший збіг (при рівній позиції — альтернативу
+з вищим пріоритетом). Семантика ж — «перший за пріоритетом шаблон, що
+знайшовся будь-де», тож якщо переміг шаблон k, перевіряємо лише шаблони
+0..k-1, чий обов'язковий літерал («таймер на», «котра година») є в тексті.
+Фраза без інтенту відсіюється одним викликом у C, решта — одним пошуком
+і кількома перевірками підрядка.
+Номер альтернативи береться з m.lastgroup, слоти — з її внутрішніх груп.
+
+Пріоритет явний: загальні шаблони («грай (.+)», «pause», «жарт»)
+перевіряються після всіх конкретних, тож не перекривають їх
+(«поставити таймер» — таймер, а не музика).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Пріоритети: менше — раніше
+PRIORITY_SPECIFIC = 0
+PRIORITY_GENERIC = 1
+
+# Групи та метасимволи — усе, що не є обов'язковим літералом шаблону
+_NON_LITERAL = re.compile(r"\([^()]*\)\??|\[[^\]]*\]|\{[^}]*\}|\\.|[.^$*+?]")
+
+# Квантифікатори, що допускають нуль повторів: символ перед ними не обов'язковий
+_OPTIONAL = ("?", "*", "{")
+
+
+def required_literal(pattern: str) -> str:
+    """Найдовший підрядок, без якого шаблон не знайдеться ("" — невідомо)"""
+    pieces: List[str] = []
+    position = 0
+    for token in _NON_LITERAL.finditer(pattern):
+        piece = pattern[position:token.start()]
+        if token.group().startswith(_OPTIONAL):
+            piece = piece[:-1]  # «jokes?» — «s» може не бути: обов'язкове лише «joke»
+        pieces.append(piece)
+        position = token.end()
+    pieces.append(pattern[position:])
+    if any("|" in piece or "(" in piece or ")" in piece for piece in pieces):
+        return ""
+    return max(pieces, key=len)
+
+
+class IntentMatcher:
+    """Інтент і слоти за один прохід"""
+
+    def __init__(self, patterns: Dict[str, List[str]], generic: Iterable[str] = ()):
+        """
+        Args:
+            patterns: інтент → шаблони (порядок словника — порядок пріоритету)
+            generic: Шаблони з нижчим пріоритетом (PRIORITY_GENERIC)
+        """
+        generic_set: FrozenSet[str] = frozenset(generic)
+        entries: List[Tuple[int, int, str, str]] = []
+        for intent, intent_patterns in patterns.items():
+            for pattern in intent_patterns:
+                priority = PRIORITY_GENERIC if pattern in generic_set else PRIORITY_SPECIFIC
+                entries.append((priority, len(entries), intent, pattern))
+        entries.sort()
+
+        self._alternatives: List[str] = []
+        self._compiled: List["re.Pattern[str]"] = []
+        self._literals: List[str] = []
+        # ім'я групи альтернативи → (номер, інтент, індекс першої внутрішньої групи, кількість груп)
+        self._groups: Dict[str, Tuple[int, str, int, int]] = {}
+        self.order: List[Tuple[str, str]] = []
+        group = 0
+        for index, (_, _, intent, pattern) in enumerate(entries):
+            compiled = re.compile(pattern)
+            name = f"i{index}"
+            self._alternatives.append(f"(?P<{name}>{pattern})")
+            self._compiled.append(compiled)
+            self._literals.append(required_literal(pattern))
+            self._groups[name] = (index, intent, group + 2, compiled.groups)
+            self.order.append((intent, pattern))
+            group += 1 + compiled.groups
+        self._regex = re.compile("|".join(self._alternatives))
+
+    def match(self, text: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(інтент, слоти) для тексту в нижньому регістрі або None"""
+        m = self._regex.search(text)
+        if m is None:
+            return None
+        index, intent, first, count = self._groups[m.lastgroup]
+        for better in range(index):
+            if self._literals[better] in text:
+                found = self._compiled[better].search(text)
+                if found is not None:
+                    return self._params(self.order[better][0], found, 1, found.re.groups)
+        return self._params(intent, m, first, count)
+
+    @staticmethod
+    def _params(intent: str, m: "re.Match[str]", first: int, count: int) -> Tuple[str, Dict[str, Any]]:
+        params: Dict[str, Any] = {}
+        if count >= 1:
+            params["action"] = m.group(first)
+        if count >= 2:
+            params["value"] = m.group(first + 1)
+        return intent, params
@@ -0,0 +1,241 @@
+"""
+Локальний спотер ключової фрази (wake word) на MFCC-шаблонах.
+
+Працює як другий етап після енергетичного/спектрального VAD: VAD дешево
+відсіює тишу, а сюди потрапляють лише короткі фрагменти мови. Фрагмент
+порівнюється через DTW з кількома записаними зразками фрази користувача
+(«Привіт бот»), тож у хмарний конвеєр (STT → LLM → TTS) потрапляють лише
+справжні звертання, а не телевізор чи розмова в кімнаті.
+
+MFCC рахуються векторизовано (усі кадри одним FFT), потоково — хвіст
+незавершеного кадру переноситься в наступний виклик.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from core import dsp
+
+
+SAMPLE_RATE = 16000
+
+
+def _mel(freq: np.ndarray) -> np.ndarray:
+    return 2595.0 * np.log10(1.0 + freq / 700.0)
+
+
+def _mel_to_hz(mel: np.ndarray) -> np.ndarray:
+    return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int, fmin: float, fmax: float) -> np.ndarray:
+    """Трикутні мел-фільтри, матриця n_mels × (n_fft/2+1)"""
+    mel_points = np.linspace(_mel(np.array(fmin)), _mel(np.array(fmax)), n_mels + 2)
+    bins = np.floor((n_fft + 1) * _mel_to_hz(mel_points) / sample_rate).astype(int)
+    bank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+def _dct_matrix(n_mfcc: int, n_mels: int) -> np.ndarray:
+    """Ортонормована DCT-II (перші n_mfcc коефіцієнтів)"""
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)[:, None]
+    dct = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    dct[0] /= np.sqrt(2.0)
+    return dct.astype(np.float32)
+
+
+class MFCCExtractor:
+    """Потоковий векторизований MFCC (кадр 25 мс, крок 10 мс)"""
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        n_mfcc: int = 13,
+        n_mels: int = 26,
+        frame_ms: float = 25.0,
+        hop_ms: float = 10.0,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.hop = int(sample_rate * hop_ms / 1000)
+        self.n_fft = 1 << (self.frame_len - 1).bit_length()
+        self._window = np.hamming(self.frame_len).astype(np.float32)
+        self._bank = _mel_filterbank(sample_rate, self.n_fft, n_mels, 60.0, min(7600.0, sample_rate / 2))
+        self._dct = _dct_matrix(n_mfcc, n_mels)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._last_sample = 0.0
+
+    def reset(self) -> None:
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._last_sample = 0.0
+
+    def process(self, pcm: bytes) -> np.ndarray:
+        """PCM16 → MFCC усіх нових повних кадрів, масив F × n_mfcc"""
+        samples = dsp.pcm16_to_array(pcm).astype(np.float32)
+        if samples.size:
+            # Pre-emphasis безперервний між чанками
+            emphasized = np.empty_like(samples)
+            emphasized[0] = samples[0] - 0.97 * self._last_sample
+            emphasized[1:] = samples[1:] - 0.97 * samples[:-1]
+            self._last_sample = float(samples[-1])
+            samples = np.concatenate((self._pending, emphasized))
+        else:
+            samples = self._pending
+
+        if samples.size < self.frame_len:
+            self._pending = samples
+            return np.zeros((0, self._dct.shape[0]), dtype=np.float32)
+
+        count = 1 + (samples.size - self.frame_len) // self.hop
+        idx = np.arange(self.frame_len)[None, :] + self.hop * np.arange(count)[:, None]
+        frames = samples[idx] * self._window
+        self._pending = samples[count * self.hop:]
+
+        power = np.abs(np.fft.rfft(frames, n=self.n_fft, axis=1)) ** 2 / self.n_fft
+        mel_energy = np.log(power @ self._bank.T + 1e-6)
+        return mel_energy @ self._dct.T
+
+    def compute(self, pcm: bytes) -> np.ndarray:
+        """Одноразовий розрахунок для цілого фрагмента"""
+        self.reset()
+        features = self.process(pcm)
+        self.reset()
+        return features
+
+
+def normalize(features: np.ndarray) -> np.ndarray:
+    """Cepstral mean/variance normalization — прибирає вплив мікрофона і гучності"""
+    if features.shape[0] == 0:
+        return features
+    return (features - features.mean(axis=0)) / (features.std(axis=0) + 1e-6)
+
+
+def dtw_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    DTW між двома послідовностями ознак, нормована на довжину шляху
+
+    Рекурсія рахується по антидіагоналях: усі клітинки діагоналі залежать
+    лише від двох попередніх, тож кожна діагональ — одна векторна операція.
+    """
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        return float("inf")
+    cost = np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0.0
+    for s in range(2, n + m + 1):
+        i = np.arange(max(1, s - m), min(n, s - 1) + 1)
+        j = s - i
+        best = np.minimum(np.minimum(acc[i - 1, j - 1], acc[i - 1, j]), acc[i, j - 1])
+        acc[i, j] = cost[i - 1, j - 1] + best
+    return float(acc[n, m] / (n + m))
+
+
+def trim_to_speech(pcm: bytes, sample_rate: int = SAMPLE_RATE, ratio: float = 0.1) -> bytes:
+    """Обрізає тишу навколо фрази: блоки 10 мс тихіші за ratio × пік відкидаються"""
+    block = sample_rate // 100
+    levels = dsp.block_rms(pcm, block)
+    if levels.size == 0 or levels.max() <= 0:
+        return pcm
+    voiced = np.flatnonzero(levels >= levels.max() * ratio)
+    return pcm[voiced[0] * block * 2:(voiced[-1] + 1) * block * 2]
+
+
+def templates_to_json(templates: Sequence[np.ndarray]) -> str:
+    """Шаблони → компактний JSON (float16 у base64) для users.wake_word_templates"""
+    return json.dumps([
+        {
+            "shape": list(t.shape),
+            "data": base64.b64encode(t.astype("<f2").tobytes()).decode("ascii"),
+        }
+        for t in templates
+    ])
+
+
+def templates_from_json(raw: Optional[str]) -> List[np.ndarray]:
+    if not raw:
+        return []
+    try:
+        return [
+            np.frombuffer(base64.b64decode(item["data"]), dtype="<f2").astype(np.float32).reshape(item["shape"])
+            for item in json.loads(raw)
+        ]
+    except Exception as e:
+        print(f"⚠️  Шаблони ключової фрази пошкоджені: {e}")
+        return []
+
+
+class KeywordSpotter:
+    """Порівнює фрагмент мови з записаними зразками ключової фрази"""
+
+    def __init__(self, templates: Optional[List[np.ndarray]] = None, threshold: Optional[float] = None):
+        """
+        Args:
+            templates: MFCC-шаблони (нормовані), зазвичай 3–5 зразків
+            threshold: Максимальна DTW-відстань для збігу (None — з розкиду зразків)
+        """
+        self.extractor = MFCCExtractor()
+        self.templates: List[np.ndarray] = list(templates or [])
+        self._threshold = threshold
+        # Поріг з розкиду зразків — кеш (DTW по всіх парах дорогий); enroll() скидає
+        self._derived_threshold: Optional[float] = None
+        self.last_score = float("inf")
+
+    def features(self, pcm: bytes) -> np.ndarray:
+        """PCM 16 кГц → нормовані MFCC фрази без тиші навколо"""
+        return normalize(self.extractor.compute(trim_to_speech(pcm)))
+
+    def enroll(self, pcm: bytes) -> np.ndarray:
+        """Додає зразок ключової фрази"""
+        template = self.features(pcm)
+        self.templates.append(template)
+        self._derived_threshold = None
+        return template
+
+    @property
+    def threshold(self) -> float:
+        """
+        Поріг збігу: явний або з розкиду між зразками
+
+        Зразки однієї фрази одного мовця відрізняються між собою — чужа фраза
+        має бути помітно далі, ніж найвіддаленіша пара зразків.
+        """
+        if self._threshold is not None:
+            return self._threshold
+        if len(self.templates) < 2:
+            return 1.0
+        if self._derived_threshold is None:
+            pairwise = [
+                dtw_distance(a, b)
+                for i, a in enumerate(self.templates)
+                for b in self.templates[i + 1:]
+            ]
+            self._derived_threshold = max(pairwise) * 1.3
+        return self._derived_threshold
+
+    def score(self, pcm: bytes) -> float:
+        """Найменша DTW-відстань до зразків (менше — схожіше)"""
+        candidate = self.features(pcm)
+        distances = [
+            dtw_distance(candidate, template)
+            for template in self.templates
+            # Фрагмент удвічі коротший/довший за зразок — точно не та фраза
+            if 0.5 <= candidate.shape[0] / max(1, template.shape[0]) <= 2.0
+        ]
+        self.last_score = min(distances) if distances else float("inf")
+        return self.last_score
+
+    def matches(self, pcm: bytes) -> bool:
+        return self.score(pcm) <= self.threshold
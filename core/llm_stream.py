@@ -0,0 +1,103 @@
+"""
+Потокова відповідь LLM для озвучки.
+
+Замість очікування повної відповіді (chat.completions з max_tokens=80 —
+1–3 с) токени читаються по мірі генерації і збираються в клаузи. Перша
+клауза (до коми чи крапки) одразу йде в TTS і на динамік, поки модель
+дописує решту.
+
+Метрики: llm_time_to_first_audio — від запиту до першого звуку,
+llm_completion_time — до останнього токена.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Any, Iterable, Iterator, List, Optional
+
+from core.metrics import metrics
+from core.spoken import to_speech
+
+
+# Кінець речення / частини речення — лише з пробілом після (3.5 не ріжемо)
+_SENTENCE_END_RE = re.compile(r"[.!?…][\"»)\]]?(?=\s)")
+_CLAUSE_END_RE = re.compile(r"[.!?…,;:—][\"»)\]]?(?=\s)")
+
+
+def iter_tokens(stream: Any) -> Iterator[str]:
+    """Текст із потоку chat.completions(stream=True); закриття обриває з'єднання"""
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+
+def clauses(tokens: Iterable[str], min_chars: int = 24, max_chars: int = 200) -> Iterator[str]:
+    """
+    Збирає токени в шматки для TTS
+
+    Перший шматок ріжеться вже на комі (після min_chars) — щоб швидше
+    зазвучати; решта — по реченнях, для природної інтонації.
+    """
+    buffer = ""
+    first = True
+    for token in tokens:
+        buffer += token
+        while True:
+            pattern = _CLAUSE_END_RE if first else _SENTENCE_END_RE
+            cut = None
+            for match in pattern.finditer(buffer):
+                if match.end() >= min_chars or match.group()[0] in ".!?…":
+                    cut = match.end()
+                    break
+            if cut is None and len(buffer) > max_chars:
+                cut = buffer.rfind(" ", 0, max_chars) + 1 or max_chars
+            if cut is None:
+                break
+            clause, buffer = buffer[:cut].strip(), buffer[cut:]
+            if clause:
+                first = False
+                yield clause
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class StreamedReply:
+    """Відповідь LLM, яка ще генерується: ітерація дає клаузи для озвучки"""
+
+    def __init__(self, tokens: Iterable[str], language: str = "uk", started: Optional[float] = None):
+        """
+        Args:
+            tokens: Токени (iter_tokens від потокового запиту)
+            started: time.perf_counter() на момент запиту до LLM
+        """
+        self._tokens = tokens
+        self.language = language
+        self.started = started if started is not None else time.perf_counter()
+        self.parts: List[str] = []
+        self.first_audio_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def __iter__(self) -> Iterator[str]:
+        for clause in clauses(self._tokens):
+            spoken = to_speech(clause, self.language, budget=0)
+            if spoken:
+                self.parts.append(spoken)
+                yield spoken
+        self.finished_at = time.perf_counter()
+        metrics.observe("llm_completion_time", self.finished_at - self.started)
+
+    def mark_first_audio(self) -> None:
+        """Викликається перед відтворенням першої клаузи"""
+        if self.first_audio_at is None:
+            self.first_audio_at = time.perf_counter()
+            metrics.observe("llm_time_to_first_audio", self.first_audio_at - self.started)
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.parts)
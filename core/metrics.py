@@ -0,0 +1,100 @@
+"""
+Легкі метрики затримок голосового циклу.
+
+Зберігає останні N значень для кожної метрики і рахує перцентилі на вимогу —
+без зовнішніх залежностей, щоб можна було тюнити пороги прямо на Pi.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+
+class LatencyMetrics:
+    """Потокобезпечний реєстр вибірок (секунди) з ковзним вікном"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counters: Dict[str, int] = {}
+
+    def observe(self, name: str, value: float) -> None:
+        """Додає одне значення метрики"""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(float(value))
+
+    def increment(self, name: str, by: int = 1) -> int:
+        """Лічильник подій (пропущені ходи тощо); повертає нове значення"""
+        with self._lock:
+            value = self._counters.get(name, 0) + by
+            self._counters[name] = value
+            return value
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """with metrics.timer("stt_seconds"): ... — записує тривалість блоку"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def summary(self, name: str) -> Optional[Dict[str, float]]:
+        """count / last / mean / p50 / p95 для метрики або None, якщо вибірок немає"""
+        with self._lock:
+            samples = list(self._samples.get(name, ()))
+        if not samples:
+            return None
+        ordered = sorted(samples)
+
+        def percentile(q: float) -> float:
+            return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+        return {
+            "count": float(len(samples)),
+            "last": samples[-1],
+            "mean": sum(samples) / len(samples),
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+        }
+
+    def format(self, name: str) -> str:
+        """Рядок для логу: 'endpoint_latency: 0.52s (p50 0.50s, p95 0.91s, n=12)'"""
+        stats = self.summary(name)
+        if stats is None:
+            return f"{name}: —"
+        return (
+            f"{name}: {stats['last']:.2f}s "
+            f"(p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s, n={int(stats['count'])})"
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Підсумки всіх метрик (для діагностики / API)"""
+        with self._lock:
+            names = list(self._samples)
+        return {name: stats for name in names if (stats := self.summary(name)) is not None}
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counters.clear()
+
+
+# Глобальний реєстр метрик
+metrics = LatencyMetrics()
@@ -0,0 +1,165 @@
+"""
+Другий рівень кешу відповідей: PCM, готовий для пристрою.
+
+Навіть з MP3/PCM із TTS-кешу (core/tts_cache) кожне відтворення платить за
+декодування, ресемплінг і mono→stereo. Гарячі фрази тут зберігаються вже у
+форматі виходу (int16, рідна частота і кількість каналів пристрою) у файлах,
+які відображаються в пам'ять (mmap). Повтор такої фрази — запис memoryview
+прямо в чергу core/playback, без копій і конвертацій.
+
+Має власний бюджет пам'яті (сума відображених файлів) з LRU-витісненням і
+статистику hit/miss/evictions.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from config import get_settings
+
+
+class PCMCache:
+    """LRU-кеш відображених у пам'ять PCM-файлів"""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            directory: Тека файлів .pcm
+            max_bytes: Бюджет (сума розмірів файлів = відображеної пам'яті); 0 — вимкнено
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # ім'я файлу → розмір, від найстарішого
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._size = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def _filename(key: str, rate: int, channels: int) -> str:
+        return f"{key}_{rate}_{channels}.pcm"
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.directory.is_dir():
+            return
+        files = []
+        for path in self.directory.glob("*.pcm"):
+            stat = path.stat()
+            files.append((stat.st_mtime, path.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        self._evict()
+
+    def _map(self, name: str) -> mmap.mmap:
+        mapping = self._maps.get(name)
+        if mapping is None:
+            with open(self.directory / name, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[name] = mapping
+        return mapping
+
+    def contains(self, key: str, rate: int, channels: int) -> bool:
+        if not self.enabled:
+            return False
+        with self._lock:
+            self._load()
+            return self._filename(key, rate, channels) in self._entries
+
+    def get(self, key: str, rate: int, channels: int) -> Optional[memoryview]:
+        """memoryview на відображений файл або None"""
+        if not self.enabled:
+            return None
+        name = self._filename(key, rate, channels)
+        with self._lock:
+            self._load()
+            if name not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                view = memoryview(self._map(name))
+                os.utime(self.directory / name)
+            except (OSError, ValueError):
+                self._drop(name)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return view
+
+    def put(self, key: str, rate: int, channels: int, pcm: bytes) -> Optional[memoryview]:
+        """Зберігає PCM у форматі пристрою і повертає його відображення"""
+        if not self.enabled or not pcm or len(pcm) > self.max_bytes:
+            return None
+        name = self._filename(key, rate, channels)
+        with self._lock:
+            self._load()
+            if name in self._entries:
+                self._drop(name)
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = self.directory / f"{name}.tmp"
+                tmp.write_bytes(pcm)
+                os.replace(tmp, self.directory / name)
+            except OSError as e:
+                print(f"⚠️  Не вдалося записати PCM-кеш: {e}")
+                return None
+            self._entries[name] = len(pcm)
+            self._size += len(pcm)
+            self._evict()
+            return memoryview(self._map(name)) if name in self._entries else None
+
+    def _drop(self, name: str) -> None:
+        """Прибирає запис: закриває відображення і видаляє файл (під _lock)"""
+        self._size -= self._entries.pop(name, 0)
+        mapping = self._maps.pop(name, None)
+        if mapping is not None:
+            try:
+                mapping.close()
+            except BufferError:
+                pass  # ще відтворюється — пам'ять звільниться разом з останнім memoryview
+        try:
+            (self.directory / name).unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            self._load()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "mapped": len(self._maps),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Глобальний PCM-кеш (тека і бюджет — з налаштувань)
+pcm_cache = PCMCache(
+    get_settings().pcm_cache_dir,
+    max_bytes=int(get_settings().pcm_cache_max_mb * 1024 * 1024),
+)
@@ -0,0 +1,78 @@
+"""
+Статичні фрази, які бот озвучує слово в слово.
+
+Зібрані в одному місці, щоб при старті daemon їх можна було заздалегідь
+відрендерити в TTS-кеш (core/tts_cache) — такі відповіді звучать без мережі.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from core.command_router import UNKNOWN_RESPONSES
+from core.spoken import to_speech
+
+
+# Порожня команда (daemon.process_command)
+EMPTY_COMMAND: Dict[str, str] = {
+    "uk": "Вибачте, я не почув жодної команди. Спробуйте ще раз.",
+    "de": "Entschuldigung, ich habe keinen Befehl gehört. Bitte versuchen Sie es erneut.",
+    "en": "Sorry, I didn't hear any command. Please try again.",
+}
+
+# Остаточний fallback daemon, якщо ні router, ні LLM не відповіли
+FALLBACK: Dict[str, List[str]] = {
+    "uk": [
+        "Вибачте, я не зрозумів вашу команду.",
+        "Не впевнений, що ви маєте на увазі.",
+        "Можете сформулювати по-іншому?",
+    ],
+    "de": [
+        "Entschuldigung, ich habe Ihren Befehl nicht verstanden.",
+        "Ich bin nicht sicher, was Sie meinen.",
+        "Könnten Sie es anders formulieren?",
+    ],
+    "en": [
+        "Sorry, I didn't understand your command.",
+        "I'm not sure what you mean.",
+        "Could you rephrase that?",
+    ],
+}
+
+# Відповіді Mopidy (integrations/mopidy.py), які доходять до динаміка
+MUSIC_STATUS: List[str] = ["⏸️ Пауза", "▶️ Продовжую", "⏹️ Зупинено", "⏭️ Наступний трек"]
+
+# Голосові повідомлення в Telegram (bot/handlers.py)
+MUSIC_STOPPED: Dict[str, str] = {
+    "uk": "Музику зупинено. Я слухаю!",
+    "de": "Musik gestoppt. Ich höre!",
+    "en": "Music stopped. I'm listening!",
+}
+
+TIMER_DONE: Dict[str, str] = {
+    "uk": "Таймер на {minutes} хвилин спрацював!",
+    "de": "Timer für {minutes} Minuten ist abgelaufen!",
+    "en": "Timer for {minutes} minutes is up!",
+}
+
+# Найчастіші таймери — їх озвучуємо наперед
+COMMON_TIMER_MINUTES = (1, 2, 3, 5, 10, 15, 20, 30, 45, 60)
+
+
+def speaker_phrases(language: str) -> List[str]:
+    """Фрази, які daemon говорить у динамік (у формі core/spoken — так їх і кешуємо)"""
+    return [
+        EMPTY_COMMAND.get(language, EMPTY_COMMAND["en"]),
+        *FALLBACK.get(language, FALLBACK["en"]),
+        *(to_speech(phrase, language) for phrase in UNKNOWN_RESPONSES.get(language, UNKNOWN_RESPONSES["en"])),
+        *(to_speech(status, language) for status in MUSIC_STATUS),
+    ]
+
+
+def telegram_phrases(language: str) -> List[str]:
+    """Голосові повідомлення, які бот надсилає в чат"""
+    timer = TIMER_DONE.get(language, TIMER_DONE["en"])
+    return [
+        MUSIC_STOPPED.get(language, MUSIC_STOPPED["en"]),
+        *(timer.format(minutes=minutes) for minutes in COMMON_TIMER_MINUTES),
+    ]
@@ -0,0 +1,363 @@
+"""
+Довгоживучий рушій відтворення.
+
+Один вихідний PyAudio-потік до ReSpeaker відкривається раз і працює в
+callback-режимі на рідній частоті пристрою. Відповіді не збираються цілком
+у pygame.mixer.Sound: PCM пишеться блоками в чергу завдання (PlaybackJob), як
+тільки він з'являється, а завершення повідомляється через threading.Event
+замість опитування кожні 100 мс. Поки черга порожня, callback віддає тишу,
+тож старт нового звуку не чекає відкриття пристрою.
+
+Вимірюється затримка «аудіо готове → перший семпл у динаміку».
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Iterable, Optional, Union
+
+from core import dsp
+from core.audio_decode import open_decoder
+from core.audio_devices import device_registry
+from core.metrics import metrics
+
+
+PA_INT16 = 8      # pyaudio.paInt16
+PA_CONTINUE = 0   # pyaudio.paContinue
+OUTPUT_HINT = "hw:3,0"  # ReSpeaker
+
+
+class PlaybackJob:
+    """Один звук (відповідь, сигнал): блоки PCM + подія завершення"""
+
+    def __init__(self, engine: "PlaybackEngine", source_rate: int, channels: int = 1, prebuffer_seconds: float = 0.0):
+        self._engine = engine
+        self.source_rate = source_rate
+        self.channels = channels
+        self._resampler = dsp.PolyphaseResampler(source_rate, engine.rate)
+        self._blocks: Deque[bytes] = deque()
+        self._offset = 0           # позиція в першому блоці
+        self._queued = 0           # байтів у черзі (без вже відтвореного)
+        # Jitter-буфер: потік з мережі стартує, лише коли накопичилось стільки звуку
+        self._prebuffer_bytes = int(prebuffer_seconds * engine.rate) * engine.frame_bytes
+        self._carry = b""          # неповний кадр з попереднього мережевого чанка
+        self._finished = False     # більше блоків не буде
+        self.cancelled = False
+        self.done = threading.Event()
+        self.ready_at: Optional[float] = None         # перший write() — «аудіо готове»
+        self.first_sample_at: Optional[float] = None  # перший байт пішов у пристрій
+        self.frames_played = 0
+        self.underruns = 0         # callback не дочекався даних посеред звуку
+        self.error: Optional[Exception] = None  # помилка джерела (play_stream)
+
+    # --- продюсер ---
+
+    def write(self, pcm: bytes) -> None:
+        """Додає PCM16 на source_rate (mono або stereo за self.channels)"""
+        if self.cancelled or not pcm:
+            return
+        if self._carry or len(pcm) % (2 * self.channels):
+            # Чанки з мережі не вирівняні по кадрах
+            pcm = self._carry + pcm
+            cut = len(pcm) - len(pcm) % (2 * self.channels)
+            pcm, self._carry = pcm[:cut], pcm[cut:]
+            if not pcm:
+                return
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+        if self._resampler.passthrough and self.channels == self._engine.channels:
+            block = pcm  # вже у форматі пристрою — без копій
+        else:
+            if self.channels == 2:
+                pcm = dsp.stereo_to_mono(pcm)
+            block = self._engine._to_device(self._resampler.process(pcm))
+        if block:
+            with self._engine._lock:
+                self._blocks.append(block)
+                self._queued += len(block)
+
+    def finish(self) -> None:
+        """Більше даних не буде — job завершиться, коли черга доіграє"""
+        with self._engine._lock:
+            self._finished = True
+            if not self._blocks:
+                self._complete()
+
+    def cancel(self) -> None:
+        """Зупиняє відтворення (наприклад, barge-in)"""
+        with self._engine._lock:
+            self.cancelled = True
+            self._blocks.clear()
+            self._queued = 0
+            self._complete()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+
+    # --- споживач (callback, під engine._lock) ---
+
+    def _read(self, nbytes: int) -> bytes:
+        if self.first_sample_at is None and not self._finished and self._queued < self._prebuffer_bytes:
+            return b""  # jitter-буфер ще не наповнився
+        out = bytearray()
+        while self._blocks and len(out) < nbytes:
+            block = self._blocks[0]
+            take = block[self._offset:self._offset + nbytes - len(out)]
+            out += take
+            self._offset += len(take)
+            if self._offset >= len(block):
+                self._blocks.popleft()
+                self._offset = 0
+        self._queued -= len(out)
+        if len(out) < nbytes and self.first_sample_at is not None and not self._finished:
+            self.underruns += 1
+            metrics.increment("playback_underruns")
+        if out and self.first_sample_at is None:
+            self.first_sample_at = time.perf_counter()
+            self._engine._report_start(self)
+        self.frames_played += len(out) // self._engine.frame_bytes
+        if self._finished and not self._blocks:
+            self._complete()
+        return bytes(out)
+
+    def _complete(self) -> None:
+        if not self.done.is_set():
+            self.done.set()
+
+
+class PlaybackEngine:
+    """Постійно відкритий вихідний callback-потік з чергою завдань"""
+
+    def __init__(self, frames_per_buffer: int = 512):
+        self.frames_per_buffer = frames_per_buffer
+        self.rate = 48000      # уточнюється при відкритті пристрою
+        self.channels = 2
+        self.device_index: Optional[int] = None
+        self.output_latency = 0.0  # затримка буфера пристрою (з PortAudio)
+
+        self.audio: Any = None
+        self.stream: Any = None
+        self._lock = threading.RLock()
+        self._jobs: Deque[PlaybackJob] = deque()
+
+    @property
+    def frame_bytes(self) -> int:
+        return 2 * self.channels
+
+    # ------------------------------------------------------------------
+    # Життєвий цикл
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """Відкриває вихідний потік, якщо ще не відкритий"""
+        with self._lock:
+            if self.is_running():
+                return True
+            try:
+                import pyaudio
+
+                self.audio = pyaudio.PyAudio()
+                device_registry.refresh(self.audio)
+                device = device_registry.find_output(OUTPUT_HINT)
+                if device is not None:
+                    self.device_index = device.index
+                    self.channels = min(2, device.max_output_channels)
+                    self.rate = next(
+                        (r for r in (device.default_rate, 48000, 44100) if r in device.output_rates),
+                        device.output_rates[0] if device.output_rates else 48000,
+                    )
+                self.stream = self.audio.open(
+                    format=PA_INT16,
+                    channels=self.channels,
+                    rate=self.rate,
+                    output=True,
+                    output_device_index=self.device_index,
+                    frames_per_buffer=self.frames_per_buffer,
+                    stream_callback=self._callback,
+                )
+                self.stream.start_stream()
+                try:
+                    self.output_latency = float(self.stream.get_output_latency())
+                except Exception:
+                    self.output_latency = 0.0
+                print(
+                    f"✅ Вихідний потік відкрито"
+                    + (f" (device {self.device_index})" if self.device_index is not None else " (default device)")
+                    + f" @ {self.rate} Hz, {self.channels}ch, латентність {self.output_latency * 1000:.0f} мс"
+                )
+                return True
+            except Exception as e:
+                print(f"⚠️  Не вдалося відкрити вихідний потік: {e}")
+                self._close()
+                return False
+
+    def is_running(self) -> bool:
+        if self.stream is None:
+            return False
+        try:
+            return bool(self.stream.is_active())
+        except Exception:
+            return False
+
+    def stop(self) -> None:
+        with self._lock:
+            for job in self._jobs:
+                job.cancel()
+            self._jobs.clear()
+            self._close()
+
+    def _close(self) -> None:
+        if self.stream is not None:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+        if self.audio is not None:
+            try:
+                self.audio.terminate()
+            except Exception:
+                pass
+            self.audio = None
+
+    # ------------------------------------------------------------------
+    # Відтворення
+    # ------------------------------------------------------------------
+
+    def begin(self, source_rate: int, channels: int = 1, prebuffer_seconds: float = 0.0) -> PlaybackJob:
+        """Нове завдання; PCM можна писати в нього по мірі надходження"""
+        job = PlaybackJob(self, source_rate, channels, prebuffer_seconds)
+        with self._lock:
+            self._jobs.append(job)
+        return job
+
+    def play_pcm(self, pcm: bytes, source_rate: int, channels: int = 1, wait: bool = True) -> PlaybackJob:
+        """Готовий PCM одним шматком"""
+        job = self.begin(source_rate, channels)
+        job.write(pcm)
+        job.finish()
+        if wait:
+            self.wait(job)
+        return job
+
+    def play_encoded(self, audio_data: bytes, wait: bool = True) -> PlaybackJob:
+        """
+        WAV/MP3/… → пристрій: декодування по блоках у процесі (core/audio_decode)
+
+        «Аудіо готове» — момент виклику, тож playback_start_latency включає
+        декодування першого блоку.
+        """
+        ready_at = time.perf_counter()
+        rate, channels, blocks = open_decoder(audio_data)
+        job = self.begin(rate, channels)
+        job.ready_at = ready_at
+        try:
+            for block in blocks:
+                if job.cancelled:
+                    break
+                job.write(block)
+        finally:
+            job.finish()
+        if wait:
+            self.wait(job)
+        return job
+
+    def play_device_pcm(self, pcm: Union[bytes, memoryview], wait: bool = True) -> PlaybackJob:
+        """
+        PCM вже у форматі пристрою (core/pcm_cache) — без конвертації і копій
+
+        memoryview на mmap іде в чергу як є; callback читає з нього зрізами.
+        """
+        job = self.begin(self.rate, self.channels)
+        job.write(pcm)
+        job.finish()
+        if wait:
+            self.wait(job)
+        return job
+
+    def render(self, audio_data: bytes) -> bytes:
+        """WAV/MP3/… → PCM у форматі пристрою (для PCM-кешу), без відтворення"""
+        rate, channels, blocks = open_decoder(audio_data)
+        job = PlaybackJob(self, rate, channels)
+        for block in blocks:
+            job.write(block)
+        return b"".join(job._blocks)
+
+    def play_stream(
+        self,
+        chunks: Iterable[bytes],
+        source_rate: int,
+        channels: int = 1,
+        prebuffer_seconds: float = 0.15,
+        wait: bool = True,
+    ) -> PlaybackJob:
+        """
+        Відтворює PCM, що ще надходить (потоковий TTS)
+
+        Звук стартує, щойно в jitter-буфері набралось prebuffer_seconds, а не
+        після завантаження всієї відповіді. Скасування job закриває ітератор
+        (і з ним HTTP-з'єднання). Помилка джерела не піднімається, а
+        зберігається в job.error — вже отримане доіграє.
+        """
+        job = self.begin(source_rate, channels, prebuffer_seconds)
+        try:
+            for chunk in chunks:
+                if job.cancelled:
+                    break
+                job.write(chunk)
+        except Exception as e:
+            print(f"⚠️  Потік аудіо обірвався: {e}")
+            job.error = e
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            job.finish()
+        if wait:
+            self.wait(job)
+        return job
+
+    def wait(self, job: PlaybackJob, timeout: Optional[float] = None) -> bool:
+        """Чекає завершення job (подія, без опитування); тайм-аут — з тривалості звуку"""
+        if timeout is None:
+            with self._lock:
+                queued = job._queued / self.frame_bytes / self.rate
+            timeout = queued + 5.0
+        finished = job.wait(timeout)
+        if not finished:
+            print("⚠️  Відтворення не завершилось вчасно — скасовую")
+            job.cancel()
+        return finished
+
+    def _to_device(self, mono_pcm: bytes) -> bytes:
+        """Mono PCM на частоті пристрою → формат виходу"""
+        return dsp.mono_to_stereo(mono_pcm) if self.channels == 2 else mono_pcm
+
+    def _report_start(self, job: PlaybackJob) -> None:
+        if job.ready_at is None or job.first_sample_at is None:
+            return
+        latency = job.first_sample_at - job.ready_at + self.output_latency
+        metrics.observe("playback_start_latency", latency)
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback: віддає frame_count кадрів з черги (або тишу)"""
+        nbytes = frame_count * self.frame_bytes
+        out = bytearray()
+        with self._lock:
+            while self._jobs and len(out) < nbytes:
+                job = self._jobs[0]
+                out += job._read(nbytes - len(out))
+                if job.done.is_set():
+                    self._jobs.popleft()
+                elif len(out) < nbytes:
+                    break  # продюсер ще не встиг — доповнюємо тишею
+        if len(out) < nbytes:
+            out += b"\x00" * (nbytes - len(out))
+        return (bytes(out), PA_CONTINUE)
+
+
+# Глобальний рушій відтворення (пристрій відкривається при першому звуці)
+playback = PlaybackEngine()
@@ -0,0 +1,89 @@
+"""
+Змагання кількох джерел відповіді: перша валідна перемагає.
+
+Повільний обробник router (DuckDuckGo, OpenWeatherMap, API жартів — 5–30 с)
+і LLM стартують одночасно. Щойно одне з них повертає валідну відповідь,
+решту скасовуємо: у кого є cancel — той обриває запит (LLM закриває потік),
+інших просто не чекаємо (їхній результат відкидається).
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from core.metrics import metrics
+
+
+class RaceTask:
+    """Учасник змагання"""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Any],
+        valid: Callable[[Any], bool] = bool,
+        cancel: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+            run: Блокуючий виклик, що повертає відповідь
+            valid: Чи годиться відповідь (помилка/порожньо — ні, чекаємо інших)
+            cancel: Як обірвати запит, якщо переміг інший
+        """
+        self.name = name
+        self.run = run
+        self.valid = valid
+        self.cancel = cancel
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.elapsed: Optional[float] = None
+
+
+def race(tasks: List[RaceTask], timeout: float = 20.0) -> Optional[RaceTask]:
+    """
+    Запускає задачі паралельно; повертає першу з валідною відповіддю або None
+
+    None — усі завершились невалідно (результати лишаються в task.result/error)
+    або вийшов timeout.
+    """
+    finished: "queue.Queue[RaceTask]" = queue.Queue()
+    started = time.perf_counter()
+
+    def run(task: RaceTask) -> None:
+        try:
+            task.result = task.run()
+        except Exception as e:
+            task.error = e
+        task.elapsed = time.perf_counter() - started
+        task.done = True
+        finished.put(task)
+
+    for task in tasks:
+        threading.Thread(target=run, args=(task,), name=f"race-{task.name}", daemon=True).start()
+
+    winner: Optional[RaceTask] = None
+    deadline = started + timeout
+    for _ in tasks:
+        try:
+            task = finished.get(timeout=max(0.0, deadline - time.perf_counter()))
+        except queue.Empty:
+            break
+        if task.error is None and task.valid(task.result):
+            winner = task
+            break
+
+    for task in tasks:
+        if task is not winner and not task.done and task.cancel is not None:
+            try:
+                task.cancel()
+            except Exception as e:
+                print(f"⚠️  Не вдалося скасувати {task.name}: {e}")
+
+    if winner is not None:
+        metrics.increment(f"race_won_{winner.name}")
+        print(f"🏁 Перемогла відповідь {winner.name} за {winner.elapsed:.2f}s")
+    return winner
@@ -0,0 +1,175 @@
+"""
+Конвеєр озвучки по реченнях.
+
+Довгу відповідь (LLM, пошук у мережі) не синтезуємо одним запитом TTS:
+текст ріжеться на речення (задовгі — ще й по комах), синтез іде паралельно
+з обмеженою кількістю потоків, а відтворення — строго по черзі. Перше
+речення звучить, поки решта ще синтезуються, тож відчутна затримка ≈ синтез
+першого речення.
+"""
+
+from __future__ import annotations
+
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from core.metrics import metrics
+
+
+# Кінець речення: . ! ? … (можливо, з лапкою/дужкою після), далі пробіл
+_SENTENCE_RE = re.compile(r"(?<=[.!?…][\"»)\]])\s+|(?<=[.!?…])\s+")
+# Межа частини речення для задовгих фраз
+_CLAUSE_RE = re.compile(r"(?<=[,;:—])\s+")
+
+
+def _pack(parts: List[str], max_chars: int, joiner: str = " ") -> List[str]:
+    """Склеює сусідні шматки, поки вміщуються в max_chars"""
+    packed: List[str] = []
+    for part in parts:
+        if packed and len(packed[-1]) + len(joiner) + len(part) <= max_chars:
+            packed[-1] = packed[-1] + joiner + part
+        else:
+            packed.append(part)
+    return packed
+
+
+def split_sentences(text: str, min_chars: int = 20, max_chars: int = 200) -> List[str]:
+    """
+    Ділить відповідь на шматки для TTS
+
+    Args:
+        min_chars: Коротші речення приклеюються до наступного
+            («Так. Зараз 15:30.» — один запит, а не два)
+        max_chars: Довші речення ріжуться по комах/крапках з комою
+    """
+    text = " ".join(text.split())
+    if not text:
+        return []
+
+    segments: List[str] = []
+    for sentence in _SENTENCE_RE.split(text):
+        if len(sentence) > max_chars:
+            segments.extend(_pack(_CLAUSE_RE.split(sentence), max_chars))
+        else:
+            segments.append(sentence)
+
+    merged: List[str] = []
+    for segment in segments:
+        if merged and len(merged[-1]) < min_chars:
+            merged[-1] = f"{merged[-1]} {segment}"
+        else:
+            merged.append(segment)
+    if len(merged) > 1 and len(merged[-1]) < min_chars:
+        tail = merged.pop()
+        merged[-1] = f"{merged[-1]} {tail}"
+    return merged
+
+
+class SpeechPipeline:
+    """Паралельний синтез речень + відтворення по порядку"""
+
+    def __init__(
+        self,
+        synthesize: Callable[[str], bytes],
+        play: Callable[[bytes], None],
+        max_workers: int = 3,
+    ):
+        """
+        Args:
+            synthesize: Текст → аудіо (наприклад, обгортка text_to_speech)
+            play: Відтворення аудіо з очікуванням кінця (AudioManager.play_audio)
+            max_workers: Скільки речень синтезується одночасно
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="tts-pipeline")
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Перериває озвучку (решта речень не відтворюється)"""
+        self._cancelled.set()
+
+    def speak(self, text: str, segments: Optional[List[str]] = None) -> int:
+        """
+        Озвучує текст; повертає кількість відтворених шматків
+
+        Помилка синтезу одного речення не зупиняє решту.
+        """
+        self._cancelled.clear()
+        segments = segments if segments is not None else split_sentences(text)
+        if not segments:
+            return 0
+
+        started = time.perf_counter()
+        futures: List[Future] = [self._executor.submit(self.synthesize, segment) for segment in segments]
+        print(f"🧩 Озвучка по реченнях: {len(segments)} шматків")
+
+        played = 0
+        try:
+            for index, future in enumerate(futures):
+                if self._cancelled.is_set():
+                    break
+                try:
+                    audio = future.result()
+                except Exception as e:
+                    print(f"⚠️  TTS речення {index + 1} не вдався: {e}")
+                    continue
+                if index == 0:
+                    metrics.observe("tts_first_sentence_latency", time.perf_counter() - started)
+                self.play(audio)
+                played += 1
+        finally:
+            for future in futures:
+                future.cancel()
+        return played
+
+    def speak_stream(self, segments: Iterable[str], on_first_audio: Optional[Callable[[], None]] = None) -> int:
+        """
+        Озвучує шматки, які ще надходять (потокова відповідь LLM)
+
+        Ітерація segments іде в окремому потоці: кожен шматок одразу йде в
+        синтез, а відтворення — по порядку тут. Повертає кількість відтворених.
+        """
+        self._cancelled.clear()
+        futures: "queue.Queue[Optional[Future]]" = queue.Queue()
+
+        def produce() -> None:
+            try:
+                for segment in segments:
+                    if self._cancelled.is_set():
+                        break
+                    futures.put(self._executor.submit(self.synthesize, segment))
+            except Exception as e:
+                print(f"⚠️  Потік тексту перервано: {e}")
+            finally:
+                futures.put(None)
+
+        threading.Thread(target=produce, name="tts-stream-text", daemon=True).start()
+
+        played = 0
+        index = 0
+        while True:
+            future = futures.get()
+            if future is None:
+                break
+            index += 1
+            if self._cancelled.is_set():
+                future.cancel()
+                continue
+            try:
+                audio = future.result()
+            except Exception as e:
+                print(f"⚠️  TTS шматка {index} не вдався: {e}")
+                continue
+            if played == 0 and on_first_audio is not None:
+                on_first_audio()
+            self.play(audio)
+            played += 1
+        return played
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
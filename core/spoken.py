@@ -0,0 +1,83 @@
+"""
+Відповідь у двох формах: текст для Telegram і коротка фраза для динаміка.
+
+Погода, пошук, історія в Telegram виглядають як багаторядкові блоки з емодзі.
+Озвучувати їх дослівно — зайві символи TTS і секунди відтворення. Router
+повертає Reply: text — як раніше, speech — без емодзі й переносів, у межах
+бюджету символів для мови (обрізається по межі речення).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Optional
+
+
+# Бюджет озвучки в символах (≈ 10–12 с мовлення tts-1)
+SPEECH_BUDGET: Dict[str, int] = {"uk": 200, "de": 220, "en": 180}
+
+# Емодзі, піктограми, варіаційні селектори і ZWJ
+_EMOJI_RE = re.compile(
+    "[\U0001F000-\U0001FAFF\u2300-\u23FF\u2460-\u24FF\u25A0-\u25FF\u2600-\u27BF\u2B00-\u2BFF\uFE0E\uFE0F\u200D\u20E3]"
+)
+# Нумерація списків «1. », маркери «- », «• »
+_BULLET_RE = re.compile(r"(?m)^\s*(?:\d+[.)]|[-•*])\s+")
+_SENTENCE_END_RE = re.compile(r"[.!?…](?=\s|$)")
+
+
+def strip_emoji(text: str) -> str:
+    return _EMOJI_RE.sub("", text)
+
+
+def to_speech(text: str, language: str = "uk", budget: Optional[int] = None) -> str:
+    """
+    Текст Telegram → фраза для TTS
+
+    Args:
+        budget: Ліміт символів (None — SPEECH_BUDGET мови, 0 — без ліміту)
+    """
+    text = _BULLET_RE.sub("", strip_emoji(text))
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    # Рядок без розділового знаку в кінці — окреме речення
+    text = " ".join(line if line[-1] in ".!?…:;," else f"{line}." for line in lines)
+    text = re.sub(r"\s+([.,!?;:])", r"\1", " ".join(text.split()))
+
+    limit = SPEECH_BUDGET.get(language, SPEECH_BUDGET["en"]) if budget is None else budget
+    if not limit or len(text) <= limit:
+        return text
+    cut = 0
+    for match in _SENTENCE_END_RE.finditer(text, 0, limit + 1):
+        cut = match.end()
+    if cut:
+        return text[:cut]
+    # Одне задовге речення — до останнього цілого слова
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",;:—-") + "."
+
+
+class Reply:
+    """Результат router: rich-текст для чату і коротка озвучка"""
+
+    def __init__(
+        self,
+        text: str,
+        speech: Optional[str] = None,
+        language: str = "uk",
+        ok: Optional[bool] = None,
+        intent: Optional[str] = None,
+    ):
+        """
+        Args:
+            ok: Чи це справжня відповідь, а не помилка/«нічого не знайшов»
+                (None — помилкою вважається текст, що починається з ❌)
+            intent: Інтент, що дав відповідь (CommandType; router.run_intent ставить завжди)
+        """
+        self.text = text
+        self.speech = speech if speech is not None else to_speech(text, language)
+        self.ok = ok if ok is not None else not text.startswith("❌")
+        self.intent = intent
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"Reply(text={self.text!r}, speech={self.speech!r}, intent={self.intent!r})"
@@ -1,17 +1,36 @@
 """
-Text-to-Speech через OpenAI
+Text-to-Speech: кеш + рушії core/tts_engine (OpenAI, локальний, fake)
 """
 
-from typing import Optional, Literal
-from openai import OpenAI
-from core.api_manager import api_manager
+from typing import Iterable, Iterator, Literal
+from core.audio_decode import TTS_PCM_RATE, open_decoder, wrap_pcm
+from core.tts_cache import cache_key, tts_cache
+from core.tts_engine import get_tts_router
+
+SpeechKind = Literal["reply", "system"]
+
+
+def speech_key(
+    telegram_user_id: int,
+    text: str,
+    language: str = "uk",
+    voice: str = "alloy",
+    response_format: str = "mp3",
+    kind: SpeechKind = "reply"
+) -> str:
+    """Ключ TTS-кешу для рушія, який обере маршрутизатор"""
+    engine = get_tts_router(telegram_user_id).engine_for(kind, response_format)
+    return cache_key(text, voice, language, engine.model, response_format)
 
 
 def text_to_speech(
     telegram_user_id: int,
     text: str, 
     language: str = "uk",
-    voice: Literal["alloy", "echo", "fable", "onyx", "nova", "shimmer"] = "alloy"
+    voice: Literal["alloy", "echo", "fable", "onyx", "nova", "shimmer"] = "alloy",
+    response_format: Literal["mp3", "pcm"] = "mp3",
+    use_cache: bool = True,
+    kind: SpeechKind = "reply"
 ) -> bytes:
     """
     Генерує аудіо з тексту
@@ -21,18 +40,92 @@ def text_to_speech(
         text: Текст для озвучки
         language: uk або en
         voice: alloy, echo, fable, onyx, nova, shimmer
+        response_format: mp3 — для Telegram; pcm — для динаміка (без декодування)
+        use_cache: False — повз TTS-кеш (кліпи core/clip_speech мають власне сховище)
+        kind: reply — відповідь LLM/пошуку; system — коротка системна фраза (TTS_SYSTEM_ENGINE)
     
     Returns:
-        bytes: MP3 аудіо
+        bytes: MP3 аудіо або WAV із сирим PCM
+    """
+    router = get_tts_router(telegram_user_id)
+    engine = router.engine_for(kind, response_format)
+    key = cache_key(text, voice, language, engine.model, response_format)
+    
+    # Повторювані фрази (fallback-и, музика, таймери) — з дискового кешу
+    if use_cache:
+        cached = tts_cache.get(key, response_format)
+        if cached is not None:
+            return cached
+    
+    audio, used = router.synthesize(text, language, voice, response_format, kind=kind)
+    # Аварійний локальний синтез не кешуємо під ключем хмарного голосу
+    if use_cache and used is engine:
+        tts_cache.put(key, response_format, audio)
+    return audio
+
+
+def stream_speech(
+    telegram_user_id: int,
+    text: str,
+    language: str = "uk",
+    voice: Literal["alloy", "echo", "fable", "onyx", "nova", "shimmer"] = "alloy",
+    chunk_size: int = 4096,
+    kind: SpeechKind = "reply"
+) -> Iterator[bytes]:
+    """
+    Потоковий TTS: віддає сирий PCM (24 кГц, 16 біт, mono) по мірі завантаження
+    
+    На відміну від text_to_speech, не чекає всієї відповіді — перші чанки
+    приходять за кількасот мілісекунд і одразу йдуть у core/playback.
+    Формат — pcm, бо його не треба декодувати (MP3 по шматках не розібрати).
+    Закриття генератора обриває з'єднання (barge-in). Фраза з кешу
+    віддається без мережі; повністю отримана — кладеться в кеш.
     """
-    api_key = api_manager.get_openai_key(telegram_user_id)
-    client = OpenAI(api_key=api_key)
+    router = get_tts_router(telegram_user_id)
+    engine = router.engine_for(kind, "pcm")
+    key = cache_key(text, voice, language, engine.model, "pcm")
+    cached = tts_cache.get(key, "pcm")
+    if cached is not None:
+        _, _, blocks = open_decoder(cached)
+        yield from blocks
+        return
     
-    response = client.audio.speech.create(
-        model="tts-1",
-        voice=voice,
-        input=text,
-        response_format="mp3"  # ← MP3 формат (підтримується OpenAI)
-    )
+    used, chunks = router.open_stream(text, language, voice, chunk_size, kind=kind)
+    received = []
+    for chunk in chunks:
+        received.append(chunk)
+        yield chunk
     
-    return response.content
\ No newline at end of file
+    # Сюди доходимо лише якщо відповідь отримана повністю (не barge-in)
+    if used is engine:
+        tts_cache.put(key, "pcm", wrap_pcm(b"".join(received), TTS_PCM_RATE))
+
+
+def warm_up(
+    telegram_user_id: int,
+    phrases: Iterable[str],
+    language: str = "uk",
+    voice: Literal["alloy", "echo", "fable", "onyx", "nova", "shimmer"] = "alloy",
+    response_format: Literal["mp3", "pcm"] = "mp3",
+    kind: SpeechKind = "system"
+) -> int:
+    """
+    Заздалегідь озвучує статичні фрази в кеш; повертає кількість нових
+    
+    Викликається у фоні при старті daemon — ці відповіді потім звучать без мережі.
+    """
+    if not tts_cache.enabled:
+        return 0
+    rendered = 0
+    for phrase in dict.fromkeys(phrases):
+        key = speech_key(telegram_user_id, phrase, language, voice, response_format, kind)
+        if tts_cache.contains(key, response_format):
+            continue
+        try:
+            text_to_speech(telegram_user_id, phrase, language, voice=voice, response_format=response_format, kind=kind)
+            rendered += 1
+        except Exception as e:
+            print(f"⚠️  Прогрів TTS-кешу перервано: {e}")
+            break
+    return rendered
+
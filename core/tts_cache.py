@@ -0,0 +1,177 @@
+"""
+Дисковий кеш озвучених фраз.
+
+Багато відповідей повторюються слово в слово (fallback-и, «⏸️ Пауза»,
+«Музику зупинено. Я слухаю!», таймери), і кожну щоразу синтезувати через
+OpenAI — зайва мережева затримка. Тут аудіо зберігається на диску за ключем
+(текст, голос, мова, модель, формат):
+
+- ключ — sha256 від нормалізованого тексту і параметрів (content-addressed);
+- розмір обмежений, витісняються найдавніше використані файли (LRU,
+  порядок відновлюється з mtime після перезапуску);
+- лічильники hit/miss/evictions для діагностики.
+
+Статичні фрази рендеряться заздалегідь при старті daemon (core/tts.warm_up).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+from config import get_settings
+
+
+def cache_key(text: str, voice: str, language: str, model: str, audio_format: str) -> str:
+    """Ключ кешу: пробіли нормалізуються, регістр і пунктуація — ні (впливають на інтонацію)"""
+    normalized = " ".join(text.split())
+    raw = "\x1f".join((normalized, voice, language, model, audio_format))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Потокобезпечний дисковий LRU-кеш аудіо"""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            directory: Тека кешу (створюється при першому записі)
+            max_bytes: Максимальний сумарний розмір; 0 — кеш вимкнено
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # ім'я файлу → розмір, від найстарішого
+        self._size = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _load(self) -> None:
+        """Індекс з диска (ліниво, один раз); порядок LRU — за mtime"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.directory.is_dir():
+            return
+        files = []
+        for path in self.directory.iterdir():
+            if path.is_file() and not path.name.endswith(".tmp"):
+                stat = path.stat()
+                files.append((stat.st_mtime, path.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        self._evict()
+
+    @staticmethod
+    def _filename(key: str, audio_format: str) -> str:
+        return f"{key}.{audio_format}"
+
+    def contains(self, key: str, audio_format: str) -> bool:
+        """Чи є запис (без впливу на статистику і LRU)"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            self._load()
+            return self._filename(key, audio_format) in self._entries
+
+    def get(self, key: str, audio_format: str) -> Optional[bytes]:
+        """Аудіо з кешу або None; влучання оновлює позицію в LRU"""
+        if not self.enabled:
+            return None
+        name = self._filename(key, audio_format)
+        with self._lock:
+            self._load()
+            if name not in self._entries:
+                self.misses += 1
+                return None
+            path = self.directory / name
+            try:
+                data = path.read_bytes()
+                os.utime(path)  # LRU переживає перезапуск
+            except OSError:
+                self._size -= self._entries.pop(name)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, audio_format: str, data: bytes) -> None:
+        """Зберігає аудіо (атомарно: запис у .tmp + rename)"""
+        if not self.enabled or not data or len(data) > self.max_bytes:
+            return
+        name = self._filename(key, audio_format)
+        with self._lock:
+            self._load()
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = self.directory / f"{name}.tmp"
+                tmp.write_bytes(data)
+                os.replace(tmp, self.directory / name)
+            except OSError as e:
+                print(f"⚠️  Не вдалося записати TTS-кеш: {e}")
+                return
+            self._size += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict()
+
+    def get_or_create(self, key: str, audio_format: str, synthesize: Callable[[], bytes]) -> bytes:
+        """З кешу, а при промаху — синтез і збереження"""
+        data = self.get(key, audio_format)
+        if data is None:
+            data = synthesize()
+            self.put(key, audio_format, data)
+        return data
+
+    def _evict(self) -> None:
+        """Видаляє найдавніше використані файли, поки розмір > ліміту (під _lock)"""
+        while self._size > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            try:
+                (self.directory / name).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            self._load()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._load()
+            for name in list(self._entries):
+                try:
+                    (self.directory / name).unlink()
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._size = 0
+
+
+# Глобальний кеш (тека і ліміт — з налаштувань)
+tts_cache = TTSCache(
+    get_settings().tts_cache_dir,
+    max_bytes=int(get_settings().tts_cache_max_mb * 1024 * 1024),
+)
@@ -0,0 +1,426 @@
+"""
+Рушії синтезу мови (TTS).
+
+- OpenAITTSEngine — tts-1 через API; клієнт (і пул з'єднань) спільний на ключ;
+- LocalTTSEngine — на CPU без мережі: Piper (модель вантажиться один раз на
+  процес) або espeak-ng, якщо моделі немає;
+- FakeTTSEngine — детермінований двійник для тестів.
+
+TTSRouter обирає рушій на кожен запит: короткі системні фрази можуть іти
+локально, відповіді LLM — у хмару. Якщо хмара не почала відповідати
+(перший байт) за TTS_CLOUD_TIMEOUT або впала, запит доозвучує локальний
+рушій, а хмара пропускається ще кілька десятків секунд. Довгий, але живий
+синтез не обривається: таймаут стоїть на з'єднанні, а не на всьому запиті.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from config import get_settings
+from core import dsp
+from core.audio_decode import TTS_PCM_RATE, decode_audio, wrap_pcm
+from core.metrics import metrics
+
+try:
+    from piper import PiperVoice
+    PIPER_AVAILABLE = True
+except ImportError:
+    PIPER_AVAILABLE = False
+
+
+OPENAI_SPEECH_URL = "https://api.openai.com/v1/audio/speech"
+TTS_MODEL = "tts-1"
+
+
+class TTSEngine(ABC):
+    """Базовий рушій: текст → аудіо bytes (pcm — WAV, mp3 — MP3)"""
+
+    name = "base"
+    model = "base"  # частина ключа TTS-кешу
+    remote = False  # True — запит іде мережею (може бути повільним)
+    formats: Tuple[str, ...] = ("pcm",)
+
+    def is_available(self) -> bool:
+        return True
+
+    def warm_up(self) -> None:
+        """Підготовка наперед (завантаження моделі, з'єднання)"""
+
+    @abstractmethod
+    def synthesize(
+        self,
+        text: str,
+        language: str = "uk",
+        voice: str = "alloy",
+        response_format: str = "pcm",
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        """
+        Аудіо фрази у форматі response_format
+
+        Args:
+            timeout: Скільки чекати початку відповіді (з'єднання, перший байт), с;
+                None — без обмеження. Локальні рушії його ігнорують
+        """
+
+    def stream(
+        self, text: str, language: str = "uk", voice: str = "alloy", chunk_size: int = 4096, timeout: float = 30.0
+    ) -> Iterator[bytes]:
+        """Сирий PCM 24 кГц mono шматками (за замовчуванням — синтез цілим і нарізка)"""
+        pcm, rate, channels = decode_audio(self.synthesize(text, language, voice, "pcm", timeout=timeout))
+        if channels == 2:
+            pcm = dsp.stereo_to_mono(pcm)
+        if rate != TTS_PCM_RATE:
+            pcm = dsp.resample(pcm, rate, TTS_PCM_RATE)
+        for offset in range(0, len(pcm), chunk_size):
+            yield pcm[offset:offset + chunk_size]
+
+
+# ----------------------------------------------------------------------
+# OpenAI tts-1
+# ----------------------------------------------------------------------
+
+class OpenAITTSEngine(TTSEngine):
+    """OpenAI Speech API"""
+
+    name = "openai"
+    remote = True
+    formats = ("mp3", "pcm")
+
+    def __init__(self, telegram_user_id: int, model: str = TTS_MODEL):
+        self.telegram_user_id = telegram_user_id
+        self.model = model
+
+    def _api_key(self) -> Optional[str]:
+        from core.api_manager import api_manager
+        return api_manager.get_openai_key(self.telegram_user_id)
+
+    def _client(self) -> Any:
+        from core.api_manager import openai_client
+        return openai_client(self._api_key())
+
+    def warm_up(self) -> None:
+        try:
+            self._client()
+        except Exception as e:
+            print(f"⚠️  OpenAI TTS: клієнт не створено: {e}")
+
+    def synthesize(
+        self,
+        text: str,
+        language: str = "uk",
+        voice: str = "alloy",
+        response_format: str = "pcm",
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        client = self._client()
+        if timeout is not None:
+            # Число в SDK — таймаути з'єднання і читання (пауза між байтами), а не всього
+            # запиту; без повторів: після таймауту одразу fallback, а запит обривається
+            client = client.with_options(timeout=timeout, max_retries=0)
+        response = client.audio.speech.create(
+            model=self.model,
+            voice=voice,
+            input=text,
+            response_format=response_format,
+        )
+        if response_format == "pcm":
+            # Сирий PCM без заголовка — додаємо WAV-заголовок, щоб відтворення знало формат
+            return wrap_pcm(response.content, TTS_PCM_RATE)
+        return response.content
+
+    def stream(
+        self, text: str, language: str = "uk", voice: str = "alloy", chunk_size: int = 4096, timeout: float = 30.0
+    ) -> Iterator[bytes]:
+        """PCM по мірі завантаження (httpx; закриття генератора обриває з'єднання)"""
+        import httpx
+
+        payload = {
+            "model": self.model,
+            "voice": voice,
+            "input": text,
+            "response_format": "pcm",
+        }
+        headers = {"Authorization": f"Bearer {self._api_key()}"}
+
+        with httpx.Client(timeout=httpx.Timeout(timeout, connect=5.0)) as client:
+            with client.stream("POST", OPENAI_SPEECH_URL, json=payload, headers=headers) as response:
+                if response.status_code != 200:
+                    response.read()
+                    raise RuntimeError(f"TTS HTTP {response.status_code}: {response.text[:200]}")
+                yield from response.iter_bytes(chunk_size)
+
+
+# ----------------------------------------------------------------------
+# Локальний синтез (Piper / espeak-ng)
+# ----------------------------------------------------------------------
+
+_piper_voices: Dict[str, Any] = {}
+_piper_lock = threading.Lock()
+
+# Голоси espeak-ng для мов бота
+ESPEAK_VOICES = {"uk": "uk", "de": "de", "en": "en-us"}
+
+
+class LocalTTSEngine(TTSEngine):
+    """
+    Синтез на CPU без мережі
+
+    TTS_LOCAL_MODEL — шлях до моделі Piper (.onnx), може містити {language}:
+    storage/piper/{language}.onnx. Без моделі для мови — espeak-ng.
+    """
+
+    name = "local"
+    formats = ("pcm",)
+
+    def __init__(self, model_path: Optional[str] = None):
+        self.model_path = get_settings().tts_local_model if model_path is None else model_path
+        self.model = f"piper:{Path(self.model_path).stem}" if self.model_path else "espeak-ng"
+
+    def _piper_path(self, language: str) -> Optional[Path]:
+        if not (PIPER_AVAILABLE and self.model_path):
+            return None
+        path = Path(self.model_path.format(language=language))
+        return path if path.exists() else None
+
+    def is_available(self) -> bool:
+        return bool(self.model_path and PIPER_AVAILABLE) or shutil.which("espeak-ng") is not None
+
+    def _voice(self, path: Path) -> Any:
+        with _piper_lock:
+            voice = _piper_voices.get(str(path))
+            if voice is None:
+                print(f"🔄 Завантажую локальну TTS модель ({path.name})...")
+                voice = _piper_voices[str(path)] = PiperVoice.load(str(path))
+                print("✅ Локальна TTS модель готова")
+            return voice
+
+    def warm_up(self, language: str = "uk") -> None:
+        path = self._piper_path(language)
+        if path is not None:
+            self._voice(path)
+
+    def synthesize(
+        self,
+        text: str,
+        language: str = "uk",
+        voice: str = "alloy",
+        response_format: str = "pcm",
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        path = self._piper_path(language)
+        if path is not None:
+            buffer = BytesIO()
+            with wave.open(buffer, "wb") as wf:
+                piper_voice = self._voice(path)
+                # piper-tts >= 1.3: synthesize_wav; раніше — synthesize(text, wav_file)
+                if hasattr(piper_voice, "synthesize_wav"):
+                    piper_voice.synthesize_wav(text, wf)
+                else:
+                    piper_voice.synthesize(text, wf)
+            return buffer.getvalue()
+
+        result = subprocess.run(
+            ["espeak-ng", "-v", ESPEAK_VOICES.get(language, "en-us"), "--stdout", text],
+            capture_output=True,
+            timeout=10,
+            check=True,
+        )
+        return result.stdout
+
+
+# ----------------------------------------------------------------------
+# Двійник для тестів
+# ----------------------------------------------------------------------
+
+class FakeTTSEngine(TTSEngine):
+    """Тон, тривалість якого залежить від довжини тексту; WAV для будь-якого формату"""
+
+    name = "fake"
+    model = "fake"
+    formats = ("mp3", "pcm")
+
+    def __init__(
+        self, delay: float = 0.0, error: Optional[Exception] = None, remote: bool = False, transfer: float = 0.0
+    ):
+        """
+        Args:
+            delay: Затримка до першого байта (на неї діє timeout)
+            transfer: Час «завантаження» після першого байта (на нього timeout не діє)
+        """
+        self.delay = delay
+        self.transfer = transfer
+        self.error = error
+        self.remote = remote
+        self.calls: List[Tuple[str, str, str, str]] = []
+
+    def synthesize(
+        self,
+        text: str,
+        language: str = "uk",
+        voice: str = "alloy",
+        response_format: str = "pcm",
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        self.calls.append((text, language, voice, response_format))
+        if self.delay:
+            if timeout is not None and self.delay > timeout:
+                time.sleep(timeout)
+                raise TimeoutError("перший байт не прийшов")
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        if self.transfer:
+            time.sleep(self.transfer)
+        t = np.arange(int(TTS_PCM_RATE * 0.02 * max(1, len(text)))) / TTS_PCM_RATE
+        return wrap_pcm(dsp.array_to_pcm16(4000 * np.sin(2 * np.pi * 220 * t)))
+
+
+TTS_ENGINES = ("openai", "local", "fake")
+
+
+def get_tts_engine(name: Optional[str], telegram_user_id: int) -> TTSEngine:
+    """
+    Рушій за назвою (None — з налаштувань TTS_ENGINE)
+
+    Локальний рушій без Piper і espeak-ng тихо замінюється на OpenAI.
+    """
+    name = (name or get_settings().tts_engine).lower()
+    if name == "local":
+        engine = LocalTTSEngine()
+        if engine.is_available():
+            return engine
+        print("⚠️  Ні Piper, ні espeak-ng не встановлено — TTS через OpenAI")
+    elif name == "fake":
+        return FakeTTSEngine()
+    elif name != "openai":
+        print(f"⚠️  Невідомий TTS рушій '{name}', використовую OpenAI")
+    return OpenAITTSEngine(telegram_user_id)
+
+
+# ----------------------------------------------------------------------
+# Маршрутизація і fallback
+# ----------------------------------------------------------------------
+
+class TTSRouter:
+    """Вибір рушія на запит + локальний fallback, коли хмара повільна"""
+
+    def __init__(
+        self,
+        primary: TTSEngine,
+        system: Optional[TTSEngine] = None,
+        fallback: Optional[TTSEngine] = None,
+        timeout: float = 4.0,
+        backoff: float = 60.0,
+    ):
+        """
+        Args:
+            primary: Рушій відповідей (LLM, пошук)
+            system: Рушій коротких системних фраз (None — primary)
+            fallback: Локальний рушій на випадок повільної/недоступної хмари
+            timeout: Скільки чекати початку відповіді хмари, с (0 — без fallback)
+            backoff: Скільки після збою хмари одразу йти на fallback, с
+        """
+        self.primary = primary
+        self.system = system or primary
+        self.fallback = fallback
+        self.timeout = timeout
+        self.backoff = backoff
+        self._cloud_down_until = 0.0
+
+    def engine_for(self, kind: str = "reply", response_format: str = "pcm") -> TTSEngine:
+        """Рушій для запиту: kind — reply або system"""
+        engine = self.system if kind == "system" else self.primary
+        return engine if response_format in engine.formats else self.primary
+
+    def _can_fall_back(self, engine: TTSEngine, response_format: str) -> bool:
+        return (
+            engine.remote
+            and self.timeout > 0
+            and self.fallback is not None
+            and self.fallback is not engine
+            and response_format in self.fallback.formats
+        )
+
+    def _cloud_failed(self, engine: TTSEngine, error: Exception) -> None:
+        self._cloud_down_until = time.monotonic() + self.backoff
+        metrics.increment("tts_fallbacks")
+        print(f"⚠️  {engine.name} TTS не встиг ({error or 'timeout'}) — озвучую локально")
+
+    def synthesize(
+        self, text: str, language: str = "uk", voice: str = "alloy", response_format: str = "pcm", kind: str = "reply"
+    ) -> Tuple[bytes, TTSEngine]:
+        """Аудіо і рушій, який його насправді синтезував"""
+        engine = self.engine_for(kind, response_format)
+        if not self._can_fall_back(engine, response_format):
+            return engine.synthesize(text, language, voice, response_format), engine
+        if time.monotonic() >= self._cloud_down_until:
+            try:
+                return engine.synthesize(text, language, voice, response_format, timeout=self.timeout), engine
+            except Exception as e:
+                self._cloud_failed(engine, e)
+        return self.fallback.synthesize(text, language, voice, response_format), self.fallback
+
+    def open_stream(
+        self, text: str, language: str = "uk", voice: str = "alloy", chunk_size: int = 4096, kind: str = "reply"
+    ) -> Tuple[TTSEngine, Iterator[bytes]]:
+        """
+        Потік PCM 24 кГц; блокує до першого шматка
+
+        Хмара, яка не віддала перший шматок за timeout, замінюється fallback-ом.
+        Збій посеред потоку вже не перехоплюється (частину відповіді чути).
+        """
+        engine = self.engine_for(kind, "pcm")
+        if not self._can_fall_back(engine, "pcm"):
+            return engine, engine.stream(text, language, voice, chunk_size)
+        if time.monotonic() >= self._cloud_down_until:
+            chunks = engine.stream(text, language, voice, chunk_size, timeout=self.timeout)
+            try:
+                first = next(chunks)
+            except StopIteration:
+                return engine, iter(())
+            except Exception as e:
+                chunks.close()
+                self._cloud_failed(engine, e)
+            else:
+                return engine, _prepend(first, chunks)
+        return self.fallback, self.fallback.stream(text, language, voice, chunk_size)
+
+
+def _prepend(first: bytes, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    try:
+        yield first
+        yield from chunks
+    finally:
+        chunks.close()
+
+
+_routers: Dict[int, TTSRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def get_tts_router(telegram_user_id: int) -> TTSRouter:
+    """Маршрутизатор користувача з налаштувань (створюється один раз)"""
+    with _routers_lock:
+        router = _routers.get(telegram_user_id)
+        if router is None:
+            settings = get_settings()
+            primary = get_tts_engine(settings.tts_engine, telegram_user_id)
+            system = get_tts_engine(settings.tts_system_engine, telegram_user_id) if settings.tts_system_engine else None
+            local = LocalTTSEngine()
+            fallback = local if local.is_available() else None
+            router = _routers[telegram_user_id] = TTSRouter(
+                primary, system=system, fallback=fallback, timeout=settings.tts_cloud_timeout
+            )
+        return router
@@ -0,0 +1,200 @@
+"""
+Спектральний детектор голосової активності (VAD) з адаптивним рівнем шуму.
+
+Рішення приймається для кожного кадру (~16 мс), але всі кадри чанка
+обробляються одним векторизованим FFT, тож CPU-вартість на Pi не росте з
+кількістю ознак. Ознаки:
+
+- енергія в під-смугах мовного діапазону відносно рівня шуму (SNR)
+- спектральна площинність (мова — гармонічна, удари/шум — пласкі)
+- частота переходів через нуль (відсікає гул і шипіння)
+
+Рівень шуму відстежується безперервно: швидко на паузах і повільно під час
+мови, тож телевізор чи вентилятор стають «фоном» замість тригера.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from core import dsp
+
+
+# Під-смуги мовного діапазону (Гц)
+SPEECH_BANDS: List[Tuple[int, int]] = [(300, 800), (800, 1600), (1600, 2600), (2600, 3800)]
+
+
+class SpectralVAD:
+    """Покадровий VAD: під-смуговий SNR + площинність спектра + ZCR"""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        sensitivity: float = 0.6,
+        frame_size: Optional[int] = None,
+        min_rms: float = 60.0,
+    ):
+        """
+        Args:
+            sample_rate: Частота вхідного PCM
+            sensitivity: 0..1, вища — нижчий поріг SNR
+            frame_size: Розмір кадру (за замовчуванням ~16 мс, степінь двійки)
+            min_rms: Абсолютний мінімум гучності кадру для мови
+        """
+        self.sample_rate = sample_rate
+        self.sensitivity = max(0.0, min(1.0, sensitivity))
+        if frame_size is None:
+            frame_size = int(2 ** round(np.log2(sample_rate * 0.016)))
+        self.frame_size = frame_size
+        self.min_rms = min_rms
+
+        # Пороги ознак
+        self.snr_threshold_db = 3.0 + (1.0 - self.sensitivity) * 9.0  # 0.8 → 4.8 дБ, 0.5 → 7.5 дБ
+        self.flatness_threshold = 0.45
+        self.zcr_range = (0.01, 0.35)
+
+        # Коефіцієнти адаптації рівня шуму (на чанк)
+        self.noise_alpha_silence = 0.2   # пауза: швидко підлаштовуємось
+        self.noise_alpha_speech = 0.001  # мова: повільно повзе вгору (стійкий фон, ~20 с)
+        self.hangover_chunks = 10        # паузи між складами ще вважаємо мовою
+        self._hangover = 0
+
+        self._window = np.hanning(frame_size).astype(np.float32)
+        freqs = np.fft.rfftfreq(frame_size, d=1.0 / sample_rate)
+        self._band_masks = np.stack([(freqs >= lo) & (freqs < hi) for lo, hi in SPEECH_BANDS])
+        self._speech_mask = (freqs >= SPEECH_BANDS[0][0]) & (freqs < SPEECH_BANDS[-1][1])
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.noise_bands: Optional[np.ndarray] = None  # середня потужність шуму по смугах
+        self.noise_rms: float = 0.0                   # RMS шуму в часовій області
+        self.last_snr_db: float = 0.0
+
+    def reset(self) -> None:
+        """Забуває рівень шуму і незавершений кадр"""
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.noise_bands = None
+        self.noise_rms = 0.0
+        self._hangover = 0
+
+    def prime(self, data: bytes) -> None:
+        """Ініціалізує рівень шуму з фонового аудіо (калібрування)"""
+        frames = self._frames(data)
+        if frames.size == 0:
+            return
+        bands, _, _, rms = self._features(frames)
+        self._update_noise(bands, rms, np.zeros(len(frames), dtype=bool))
+
+    def prime_from_quietest(self, data: bytes, fraction: float = 0.2) -> None:
+        """
+        Оцінка шуму з найтихіших кадрів цілого запису
+
+        Для аналізу готового кліпу, коли окремого фрагмента тиші немає.
+        """
+        self.reset()
+        frames = self._frames(data)
+        self._pending = np.zeros(0, dtype=np.float32)
+        if frames.size == 0:
+            return
+        bands, _, _, rms = self._features(frames)
+        count = max(1, int(len(frames) * fraction))
+        quiet = np.argsort(rms)[:count]
+        self.noise_bands = bands[quiet].mean(axis=0)
+        self.noise_rms = float(rms[quiet].mean())
+
+    def process(self, data: bytes) -> np.ndarray:
+        """
+        Класифікує всі повні кадри в чанку
+
+        Returns:
+            np.ndarray[bool] — рішення «мова» для кожного кадру
+        """
+        frames = self._frames(data)
+        if frames.size == 0:
+            return np.zeros(0, dtype=bool)
+
+        bands, flatness, zcr, rms = self._features(frames)
+        if self.noise_bands is None:
+            # Немає оцінки шуму — вважаємо перший чанк фоном
+            self._update_noise(bands, rms, np.zeros(len(frames), dtype=bool))
+            return np.zeros(len(frames), dtype=bool)
+
+        assert self.noise_bands is not None
+        snr_db = 10.0 * np.log10((bands + 1e-9) / (self.noise_bands + 1e-9))
+        # Мова займає не всі смуги одночасно — беремо дві найсильніші
+        top_snr = np.sort(snr_db, axis=1)[:, -2:].mean(axis=1)
+        self.last_snr_db = float(top_snr.max())
+
+        speech = (
+            (top_snr > self.snr_threshold_db)
+            & (flatness < self.flatness_threshold)
+            & (zcr > self.zcr_range[0])
+            & (zcr < self.zcr_range[1])
+            & (rms > self.min_rms)
+        )
+        self._update_noise(bands, rms, speech)
+        return speech
+
+    def is_speech(self, data: bytes, min_ratio: float = 0.5) -> bool:
+        """Чанк вважається мовою, якщо мовних кадрів не менше min_ratio"""
+        decisions = self.process(data)
+        return bool(decisions.size) and float(decisions.mean()) >= min_ratio
+
+    # ------------------------------------------------------------------
+
+    def _frames(self, data: bytes) -> np.ndarray:
+        """Нарізає PCM (з хвостом попереднього чанка) на кадри F×N"""
+        samples = dsp.pcm16_to_array(data).astype(np.float32)
+        if self._pending.size:
+            samples = np.concatenate((self._pending, samples))
+        count = samples.size // self.frame_size
+        self._pending = samples[count * self.frame_size:]
+        return samples[: count * self.frame_size].reshape(count, self.frame_size)
+
+    def _features(self, frames: np.ndarray):
+        """Векторизовані ознаки для F кадрів"""
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_size - 1)
+
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2
+        bands = (power @ self._band_masks.T) / self._band_masks.sum(axis=1)
+
+        speech_power = power[:, self._speech_mask] + 1e-9
+        flatness = np.exp(np.mean(np.log(speech_power), axis=1)) / np.mean(speech_power, axis=1)
+        return bands, flatness, zcr, rms
+
+    def _update_noise(self, bands: np.ndarray, rms: np.ndarray, speech: np.ndarray) -> None:
+        """Один крок адаптації рівня шуму на чанк"""
+        quiet = ~speech
+        if speech.any():
+            self._hangover = self.hangover_chunks
+        elif self._hangover > 0:
+            self._hangover -= 1
+        if quiet.any() and self._hangover == 0:
+            target_bands = bands[quiet].mean(axis=0)
+            target_rms = float(rms[quiet].mean())
+            alpha = self.noise_alpha_silence
+        else:
+            target_bands = bands.mean(axis=0)
+            target_rms = float(rms.mean())
+            alpha = self.noise_alpha_speech
+
+        if self.noise_bands is None:
+            self.noise_bands = target_bands
+            self.noise_rms = target_rms
+            return
+
+        # Тихіший фон приймаємо одразу — інакше після гучної події поріг «залипає»
+        falling = target_bands < self.noise_bands
+        self.noise_bands = np.where(
+            falling,
+            0.5 * self.noise_bands + 0.5 * target_bands,
+            (1 - alpha) * self.noise_bands + alpha * target_bands,
+        )
+        if target_rms < self.noise_rms:
+            self.noise_rms = 0.5 * self.noise_rms + 0.5 * target_rms
+        else:
+            self.noise_rms = (1 - alpha) * self.noise_rms + alpha * target_rms
@@ -3,25 +3,27 @@
 Використовує Voice Activity Detection замість Porcupine
 """
 
-import pyaudio
-import struct
 import time
-import wave
 import numpy as np
 import threading
 from typing import Optional, Any, List, Callable
 import os
 import subprocess
-import audioop
 from enum import Enum
 
 from config import get_settings
+from core.audio_capture import audio_capture, CaptureSubscription
+from core import dsp
+from core.vad import SpectralVAD
+from core.keyword_spotter import KeywordSpotter
 
 
 class WakeWordMode(Enum):
     """Режими роботи детектора wake word"""
     FALLBACK = "fallback"  # Режим натискання Enter в консолі
     VAD = "vad"  # Режим детекції голосової активності
+    SPECTRAL = "spectral"  # Спектральний VAD з адаптивним рівнем шуму (core/vad.py)
+    KEYWORD = "keyword"  # Спектральний VAD + локальна перевірка фрази (core/keyword_spotter.py)
     ALWAYS_ON = "always_on"  # Завжди активний режим (для тестування)
 
 
@@ -49,9 +51,11 @@ class WakeWordDetector:
         self.chunk_size = 1024
         
         # Ініціалізуємо аудіо-поля ДО будь-яких операцій із мікрофоном
-        self.audio = None
-        self.stream = None
+        # Пристроєм володіє спільний сервіс захоплення, детектор лише підписується
+        self.capture = audio_capture
+        self.subscription: Optional[CaptureSubscription] = None
         self.is_running = True
+        self.noise_level: Optional[float] = None  # RMS фону (калібрування + адаптація у VAD)
 
         # Вибір режиму (для Pi 5 рекомендовано VAD)
         if mode == WakeWordMode.ALWAYS_ON:
@@ -60,6 +64,12 @@ class WakeWordDetector:
         elif mode == WakeWordMode.VAD:
             self.mode = mode
             self._init_vad()
+        elif mode == WakeWordMode.SPECTRAL:
+            self.mode = mode
+            self._init_spectral_vad()
+        elif mode == WakeWordMode.KEYWORD:
+            self.mode = mode
+            self._init_keyword()
         else:
             # Fallback режим
             self.mode = WakeWordMode.FALLBACK
@@ -72,101 +82,80 @@ class WakeWordDetector:
         # VAD параметри
         self.vad_threshold = 400  # Початковий поріг (буде перезаписаний після калібрування)
         self.vad_min_duration = 0.3  # Мінімальна тривалість звуку (секунди) - зменшено для чутливості
-        
-        # Розрахунок кількості чанків для мінімальної тривалості звуку
-        self.vad_chunks_count = max(3, int(self.vad_min_duration * self.sample_rate / self.chunk_size))
 
-        # Відкриваємо мікрофон
+        # Відкриваємо мікрофон (sample rate визначає сервіс захоплення)
         self._open_microphone()
 
+        # Розрахунок кількості чанків для мінімальної тривалості звуку
+        self.vad_chunks_count = max(3, int(self.vad_min_duration * self.sample_rate / self.chunk_size))
+
         # Автокалібрування порогу від реального фонового шуму
         self._auto_calibrate_threshold()
         
         # Фінальний вивід після калібрування
         print(f"✅ VAD готовий: поріг={self.vad_threshold}, min_chunks={self.vad_chunks_count}, sr={self.sample_rate}")
     
+    def _init_spectral_vad(self):
+        """Ініціалізація спектрального VAD (під-смуговий SNR + площинність + ZCR)"""
+        print(f"🔄 Wake word в режимі SPECTRAL (спектральний VAD)")
+
+        self.vad_min_duration = 0.3  # Мінімальна тривалість мови (секунди)
+        self._open_microphone()
+        self.vad_chunks_count = max(3, int(self.vad_min_duration * self.sample_rate / self.chunk_size))
+        self.spectral_vad = SpectralVAD(self.sample_rate, sensitivity=self.sensitivity)
+
+        # Початкова оцінка шуму; далі рівень шуму адаптується безперервно
+        if self.subscription is not None:
+            for _ in range(self.capture.seconds_to_chunks(0.5)):
+                data = self.subscription.read(timeout=1.0)
+                if data is None:
+                    break
+                self.spectral_vad.prime(data)
+
+        print(
+            f"✅ SPECTRAL VAD готовий: шум RMS={int(self.spectral_vad.noise_rms)}, "
+            f"SNR поріг={self.spectral_vad.snr_threshold_db:.1f} дБ, min_chunks={self.vad_chunks_count}, sr={self.sample_rate}"
+        )
+
+    @property
+    def noise_rms(self) -> Optional[float]:
+        """Живий рівень фонового шуму (RMS) — для адаптивного endpointer"""
+        # KEYWORD теж слухає через спектральний VAD (_init_keyword → _init_spectral_vad)
+        if self.mode in (WakeWordMode.SPECTRAL, WakeWordMode.KEYWORD):
+            return self.spectral_vad.noise_rms
+        return self.noise_level
+
+    def _init_keyword(self):
+        """Ініціалізація спотера ключової фрази (другий етап після спектрального VAD)"""
+        self._init_spectral_vad()
+        # Шаблони користувача підставляються пізніше (set_keyword_templates)
+        self.keyword_spotter = KeywordSpotter()
+        self.keyword_max_seconds = 2.0  # ключова фраза — коротка
+        self.keyword_end_silence = 0.3  # тиша після фрази
+        print(f"🔄 Wake word в режимі KEYWORD ('{self.wake_word}')")
+
+    def set_keyword_templates(self, templates: List[np.ndarray]) -> None:
+        """Зразки ключової фрази користувача (MFCC, з users.wake_word_templates)"""
+        if self.mode != WakeWordMode.KEYWORD:
+            return
+        self.keyword_spotter = KeywordSpotter(templates)
+        if templates:
+            print(f"✅ Ключова фраза: {len(templates)} зразк(ів), поріг DTW={self.keyword_spotter.threshold:.2f}")
+
     def _open_microphone(self):
-        """Відкриває мікрофон для запису з підбором sample rate та ретраями."""
-        import time as _t
-        attempts = 3
-        backoff = 0.4
-        last_error: Optional[Exception] = None
-
-        for attempt in range(1, attempts + 1):
-            try:
-                # Завжди створюємо свіжий контекст PyAudio на спробу
-                self._cleanup_audio()
-                self.audio = pyaudio.PyAudio()
-
-                # Визначаємо індекс пристрою захоплення (USB мікрофон пріоритетно)
-                device_index = self._resolve_preferred_input_device()
-
-                # Кандидати пристрою: спочатку знайдений, потім дефолтний (None)
-                device_candidates: List[Optional[int]] = [device_index, None]
-
-                # Підбираємо sample rate, якщо поточний не підтримується
-                candidate_rates: List[int] = []
-                try:
-                    if device_index is not None:
-                        info = self.audio.get_device_info_by_index(device_index)
-                        default_rate = int(float(info.get("defaultSampleRate", self.sample_rate)))
-                        candidate_rates.append(default_rate)
-                except Exception:
-                    pass
-                # Випробовуємо частоти у порядку пріоритету (16k для STT, далі типові)
-                candidate_rates.extend([16000, 44100, 48000, 22050, self.sample_rate])
-                # Унікальні, зберігаючи порядок
-                seen = set()
-                candidate_rates = [r for r in candidate_rates if (r not in seen and not seen.add(r))]
-
-                opened = False
-                for dev in device_candidates:
-                    for rate in candidate_rates:
-                        try:
-                            stream = self.audio.open(
-                                format=pyaudio.paInt16,
-                                channels=1,
-                                rate=rate,
-                                input=True,
-                                input_device_index=dev,
-                                frames_per_buffer=self.chunk_size,
-                            )
-                            self.sample_rate = rate
-                            self.stream = stream
-                            print(
-                                "✅ Мікрофон відкрито"
-                                + (f" (device {dev})" if dev is not None else " (default device)")
-                                + f" @ {rate} Hz"
-                            )
-                            opened = True
-                            break
-                        except Exception as e:
-                            last_error = e
-                            continue
-                    if opened:
-                        break
-
-                if opened:
-                    return
-
-                # Якщо не відкрився — кидати помилку для цього раунду
-                raise last_error or OSError("Не вдалося відкрити мікрофон")
-
-            except Exception as e:
-                print(f"⚠️ Помилка при відкритті мікрофона (спроба {attempt}/{attempts}): {e}")
-                last_error = e
-                # Невеликий бекоф перед повтором
-                _t.sleep(backoff)
-                continue
-
-        # Після всіх спроб — віддати останню помилку та прибрати ресурси
-        self._cleanup_audio()
-        if last_error:
-            print(f"⚠️ Помилка при відкритті мікрофона (остаточно): {last_error}")
+        """Підписується на спільний потік захоплення (пристрій відкриває сервіс)."""
+        if self.subscription is not None and not self.subscription.closed:
+            return
+        if not self.capture.start():
+            self.subscription = None
+            return
+        self.sample_rate = self.capture.sample_rate
+        self.chunk_size = self.capture.chunk_size
+        self.subscription = self.capture.subscribe()
 
     def _auto_calibrate_threshold(self) -> None:
         """Вимірює фоновий шум і уточнює поріг VAD."""
-        if not self.stream:
+        if self.subscription is None:
             return
         try:
             # Беремо ~0.5 секунди для оцінки шуму
@@ -174,11 +163,14 @@ class WakeWordDetector:
             chunks_to_measure = max(1, int(self.sample_rate * measure_seconds / self.chunk_size))
             values = []
             for _ in range(chunks_to_measure):
-                data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-                rms = audioop.rms(data, 2)
+                data = self.subscription.read(timeout=1.0)
+                if data is None:
+                    break
+                rms = dsp.rms(data)
                 values.append(rms)
             if values:
                 noise = sum(values) / len(values)
+                self.noise_level = noise
                 # Спрощена формула: шум * коефіцієнт залежно від чутливості
                 # При sensitivity=0.8 → множник ~1.5, при sensitivity=0.5 → множник ~2.0
                 multiplier = 3.0 - (self.sensitivity * 2.0)  # 0.8→1.4, 0.5→2.0, 0.3→2.4
@@ -190,80 +182,6 @@ class WakeWordDetector:
             # Безпечний фолбек — залишаємо попередній поріг
             pass
             
-    def _find_usb_microphone(self) -> Optional[int]:
-        """Знаходить індекс USB мікрофона"""
-        if self.audio is None:
-            return None
-            
-        try:
-            # Перебираємо всі пристрої
-            for i in range(self.audio.get_device_count()):
-                try:
-                    info = self.audio.get_device_info_by_index(i)
-                    name = str(info.get('name', '')).lower()
-                    
-                    # Шукаємо USB мікрофон
-                    max_input_channels = int(info.get('maxInputChannels', 0))
-                    if 'usb' in name and max_input_channels > 0:
-                        print(f"✅ Знайдено USB мікрофон: {name}")
-                        return i
-                except Exception:
-                    continue
-                    
-            # Якщо USB не знайдено - будь-який вхідний пристрій
-            for i in range(self.audio.get_device_count()):
-                try:
-                    info = self.audio.get_device_info_by_index(i)
-                    max_input_channels = int(info.get('maxInputChannels', 0))
-                    
-                    if max_input_channels > 0:
-                        name = str(info.get('name', ''))
-                        print(f"✅ Знайдено вхідний пристрій: {name}")
-                        return i
-                except Exception:
-                    continue
-                    
-        except Exception as e:
-            print(f"⚠️ Помилка при пошуку мікрофона: {e}")
-            
-        return None
-
-    def _resolve_preferred_input_device(self) -> Optional[int]:
-        """Повертає індекс бажаного вхідного пристрою.
-
-        Логіка:
-        1) Якщо задано змінну оточення MIC_ALSA_HW (наприклад, "2,0" або "hw:2,0") —
-           шукаємо PyAudio-пристрій, у якого назва містить відповідний (hw:X,Y).
-        2) Інакше — шукаємо USB мікрофон.
-        3) Якщо не знайдено — None (дефолтний).
-        """
-        if self.audio is None:
-            return None
-        try:
-            hw_hint = os.environ.get("MIC_ALSA_HW")
-            if hw_hint:
-                normalized = hw_hint
-                if "," in normalized and not normalized.startswith("hw:"):
-                    normalized = f"hw:{normalized}"
-                # Пошук збігу у назві PyAudio пристрою
-                for i in range(self.audio.get_device_count()):
-                    try:
-                        info = self.audio.get_device_info_by_index(i)
-                        name = str(info.get('name', '')).lower()
-                        max_in = int(info.get('maxInputChannels', 0))
-                        if max_in > 0 and normalized.lower() in name:
-                            print(f"✅ Обрано пристрій за MIC_ALSA_HW={normalized}: {name}")
-                            return i
-                    except Exception:
-                        continue
-                print(f"⚠️ MIC_ALSA_HW задано ({normalized}), але відповідний пристрій не знайдено")
-
-            # За замовчуванням — USB мікрофон
-            return self._find_usb_microphone()
-        except Exception as e:
-            print(f"⚠️ Помилка визначення пріоритетного пристрою: {e}")
-            return None
-
     def debug_audio_system(self) -> None:
         """Виводить базову діагностику аудіосистеми (за наявності утиліт)."""
         try:
@@ -284,27 +202,6 @@ class WakeWordDetector:
         except Exception as e:
             print(f"⚠️ arecord/aplay тест не вдався: {e}")
     
-    def _find_respeaker_device(self) -> Optional[int]:
-        """Знаходить ReSpeaker серед аудіо пристроїв (Seeed/ReSpeaker), з фолбеком на USB."""
-        if self.audio is None:
-            return None
-        try:
-            for i in range(self.audio.get_device_count()):
-                try:
-                    info = self.audio.get_device_info_by_index(i)
-                    name = str(info.get('name', '')).lower()
-                    max_in = int(info.get('maxInputChannels', 0))
-                    if max_in > 0 and ('seeed' in name or 'respeaker' in name):
-                        print(f"✅ ReSpeaker знайдено: {name}")
-                        return i
-                except Exception:
-                    continue
-            # Фолбек
-            return self._find_usb_microphone()
-        except Exception as e:
-            print(f"⚠️ Помилка пошуку ReSpeaker: {e}")
-            return None
-
     def listen(self) -> bool:
         """
         Слухає wake word
@@ -316,6 +213,10 @@ class WakeWordDetector:
             return self._listen_fallback()
         elif self.mode == WakeWordMode.VAD:
             return self._listen_vad()
+        elif self.mode == WakeWordMode.SPECTRAL:
+            return self._listen_spectral()
+        elif self.mode == WakeWordMode.KEYWORD:
+            return self._listen_keyword()
         elif self.mode == WakeWordMode.ALWAYS_ON:
             return self._listen_always_on()
         
@@ -333,13 +234,19 @@ class WakeWordDetector:
     
     def _listen_vad(self) -> bool:
         """Voice Activity Detection - виявлення звуку"""
-        if self.stream is None:
+        if self.subscription is None:
             # Спроба відкрити знову
             self._open_microphone()
             
             # Якщо не вдалося
-            if self.stream is None:
+            if self.subscription is None:
                 return False
+
+        # USB-мікрофон могли під'єднати/від'єднати між ходами (дешева перевірка)
+        self.capture.check_hotplug()
+
+        # Відкидаємо все, що накопичилось поки ми не слухали (запис, відповідь бота)
+        self.subscription.skip_to_live()
         
         try:
             active_chunks = 0
@@ -354,10 +261,17 @@ class WakeWordDetector:
             while True:
                 try:
                     # Читаємо аудіо
-                    data = self.stream.read(self.chunk_size, exception_on_overflow=False)
+                    data = self.subscription.read(timeout=1.0)
+                    if data is None:
+                        # Немає даних — перевіряємо, чи живий потік захоплення
+                        if not self.is_running:
+                            return False
+                        if not self.capture.is_running() and not self.capture.restart():
+                            return False
+                        continue
                     
                     # Аналізуємо гучність
-                    rms = audioop.rms(data, 2)  # 2 bytes per sample (16 bit)
+                    rms = dsp.rms(data)  # int16 PCM
                     
                     # Періодично виводимо RMS для діагностики (кожні 50 чанків = ~1сек)
                     rms_log_counter += 1
@@ -374,6 +288,9 @@ class WakeWordDetector:
                             print("🎤 Голосову активність виявлено!")
                             return True
                     else:
+                        # Тихий чанк — повільно уточнюємо рівень фону для endpointer
+                        if self.noise_level is not None:
+                            self.noise_level = 0.98 * self.noise_level + 0.02 * rms
                         # Дозволяємо 2 тихих чанки перед скиданням
                         silence_chunks += 1
                         if silence_chunks > 2:
@@ -382,9 +299,7 @@ class WakeWordDetector:
                         
                 except IOError:
                     # Помилка читання - перевідкриваємо потік
-                    self._cleanup_audio()
-                    self._open_microphone()
-                    if self.stream is None:
+                    if not self.capture.restart():
                         return False
                 
                 # Перевірка на переривання
@@ -395,6 +310,109 @@ class WakeWordDetector:
             print(f"⚠️ Помилка в режимі VAD: {e}")
             return False
     
+    def _listen_spectral(self) -> bool:
+        """Спектральний VAD: тригер лише на мовоподібний звук, а не на будь-який гучний"""
+        if self.subscription is None:
+            self._open_microphone()
+            if self.subscription is None:
+                return False
+
+        self.capture.check_hotplug()
+        self.subscription.skip_to_live()
+        print(f"🎤 Очікування мови (шум RMS: {int(self.spectral_vad.noise_rms)})...")
+
+        active_chunks = 0
+        silence_chunks = 0
+        log_counter = 0
+        try:
+            while self.is_running:
+                data = self.subscription.read(timeout=1.0)
+                if data is None:
+                    if not self.capture.is_running() and not self.capture.restart():
+                        return False
+                    continue
+
+                is_speech = self.spectral_vad.is_speech(data)
+
+                # Періодична діагностика (~1 сек)
+                log_counter += 1
+                if log_counter >= 50:
+                    print(f"🔊 SNR: {self.spectral_vad.last_snr_db:.1f} дБ, шум RMS: {int(self.spectral_vad.noise_rms)}")
+                    log_counter = 0
+
+                if is_speech:
+                    active_chunks += 1
+                    silence_chunks = 0
+                    if active_chunks >= self.vad_chunks_count:
+                        print("🎤 Мову виявлено!")
+                        return True
+                else:
+                    # Дозволяємо 2 тихих чанки перед скиданням
+                    silence_chunks += 1
+                    if silence_chunks > 2:
+                        active_chunks = 0
+                        silence_chunks = 0
+            return False
+        except Exception as e:
+            print(f"⚠️ Помилка в режимі SPECTRAL: {e}")
+            return False
+
+    def capture_phrase(self) -> Optional[bytes]:
+        """
+        Чекає мову (спектральний VAD) і повертає всю фразу як PCM 16 кГц
+
+        Початок фрази вже прочитаний VAD-ом, тому він добирається з кільцевого
+        буфера (pre-roll), а кінець — до короткої тиші або keyword_max_seconds.
+        """
+        if not self._listen_spectral():
+            return None
+
+        onset_chunks = self.vad_chunks_count + 3
+        subscription = self.capture.subscribe(preroll_seconds=onset_chunks * self.chunk_size / self.sample_rate)
+        max_chunks = self.capture.seconds_to_chunks(self.keyword_max_seconds)
+        end_chunks = max(1, self.capture.seconds_to_chunks(self.keyword_end_silence))
+        frames: List[bytes] = []
+        silent = 0
+        try:
+            while self.is_running and len(frames) < max_chunks:
+                data = subscription.read(timeout=1.0)
+                if data is None:
+                    break
+                frames.append(data)
+                # Початок фрази VAD уже бачив — рахуємо тишу лише для нових чанків
+                if len(frames) <= onset_chunks:
+                    continue
+                silent = 0 if self.spectral_vad.is_speech(data) else silent + 1
+                if silent >= end_chunks:
+                    break
+        finally:
+            subscription.close()
+
+        pcm = b"".join(frames)
+        if self.sample_rate != 16000:
+            pcm = dsp.resample(pcm, self.sample_rate, 16000)
+        return pcm
+
+    def _listen_keyword(self) -> bool:
+        """VAD → фраза → порівняння з зразками; чужі фрази ігноруються"""
+        if not self.keyword_spotter.templates:
+            # Зразків ще немає — працюємо як спектральний VAD
+            return self._listen_spectral()
+
+        while self.is_running:
+            phrase = self.capture_phrase()
+            if phrase is None:
+                return False
+            started = time.perf_counter()
+            matched = self.keyword_spotter.matches(phrase)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            score = self.keyword_spotter.last_score
+            if matched:
+                print(f"🎤 Ключову фразу розпізнано (DTW={score:.2f}, {elapsed_ms:.0f} мс)")
+                return True
+            print(f"🙉 Не ключова фраза (DTW={score:.2f} > {self.keyword_spotter.threshold:.2f})")
+        return False
+
     def _listen_always_on(self) -> bool:
         """Режим без wake word - відразу повертає True"""
         # Маленька затримка для імітації детекції
@@ -402,35 +420,27 @@ class WakeWordDetector:
         return True
     
     def _cleanup_audio(self):
-        """Звільнення аудіо ресурсів"""
-        if self.stream:
-            try:
-                self.stream.stop_stream()
-                self.stream.close()
-            except Exception:
-                pass
-            self.stream = None
-            
-        if self.audio:
-            try:
-                self.audio.terminate()
-            except Exception:
-                pass
-            self.audio = None
+        """Відписка від потоку захоплення (сам пристрій лишається відкритим)"""
+        if self.subscription is not None:
+            self.subscription.close()
+            self.subscription = None
 
     def stop(self):
         """Зупиняє детектор і звільняє ресурси"""
         self.is_running = False
         self._cleanup_audio()
+        # Закриваємо пристрій, лише якщо ним більше ніхто не користується
+        if self.capture.subscriber_count == 0:
+            self.capture.stop()
         print("🛑 Wake word detector зупинено")
 
     def pause_listen(self) -> None:
-        """Тимчасово зупиняє прослуховування (звільняє пристрій захоплення)."""
+        """Тимчасово зупиняє прослуховування (пристрій лишається відкритим для інших споживачів)."""
         self._cleanup_audio()
 
     def resume_listen(self) -> None:
         """Відновлює прослуховування після паузи (лише для VAD/ALWAYS_ON)."""
-        if self.mode == WakeWordMode.VAD and self.is_running:
+        if self.mode in (WakeWordMode.VAD, WakeWordMode.SPECTRAL, WakeWordMode.KEYWORD) and self.is_running:
             self._open_microphone()
 
 
@@ -6,6 +6,8 @@ from typing import Dict, Any, List, Optional
 import httpx
 from bs4 import BeautifulSoup  # type: ignore[import-not-found]
 
+from core.spoken import Reply, to_speech
+
 
 def web_search(query: str, language: str = "uk", max_results: int = 3) -> str:
     """
@@ -19,30 +21,35 @@ def web_search(query: str, language: str = "uk", max_results: int = 3) -> str:
     Returns:
         Короткий саммарі результатів пошуку
     """
+    return search_reply(query, language, max_results).text
+
+
+def search_reply(query: str, language: str = "uk", max_results: int = 3) -> Reply:
+    """Як web_search, але з окремою озвучкою (лише суть першого результату)"""
     try:
         # DuckDuckGo HTML пошук (не потребує API ключа)
         results = _search_duckduckgo(query, max_results)
         
         if not results:
             if language == "uk":
-                return f"На жаль, не вдалося знайти результати для '{query}'."
+                return Reply(f"На жаль, не вдалося знайти результати для '{query}'.", language=language, ok=False)
             elif language == "de":
-                return f"Leider konnten keine Ergebnisse für '{query}' gefunden werden."
+                return Reply(f"Leider konnten keine Ergebnisse für '{query}' gefunden werden.", language=language, ok=False)
             else:
-                return f"Sorry, couldn't find results for '{query}'."
+                return Reply(f"Sorry, couldn't find results for '{query}'.", language=language, ok=False)
         
         # Формуємо короткий саммарі
         summary = _format_search_results(results, query, language)
-        return summary
+        return Reply(summary, _speak_search_results(results, language), language)
         
     except Exception as e:
         print(f"❌ Помилка веб-пошуку: {e}")
         if language == "uk":
-            return f"Вибачте, виникла помилка при пошуку інформації про '{query}'."
+            return Reply(f"Вибачте, виникла помилка при пошуку інформації про '{query}'.", language=language, ok=False)
         elif language == "de":
-            return f"Entschuldigung, es gab einen Fehler bei der Suche nach Informationen über '{query}'."
+            return Reply(f"Entschuldigung, es gab einen Fehler bei der Suche nach Informationen über '{query}'.", language=language, ok=False)
         else:
-            return f"Sorry, there was an error searching for information about '{query}'."
+            return Reply(f"Sorry, there was an error searching for information about '{query}'.", language=language, ok=False)
 
 
 def _search_duckduckgo(query: str, max_results: int = 3) -> List[Dict[str, str]]:
@@ -127,6 +134,14 @@ def _format_search_results(results: List[Dict[str, str]], query: str, language:
         return response.strip()
 
 
+def _speak_search_results(results: List[Dict[str, str]], language: str) -> str:
+    """
+    Озвучка: лише сніпет першого результату (без заголовків і нумерації)
+    """
+    intro = {"uk": "Ось що я знайшов.", "de": "Das habe ich gefunden."}.get(language, "Here's what I found.")
+    return to_speech(f"{intro} {results[0]['snippet']}", language)
+
+
 def extract_relevant_info(query: str, results: List[Dict[str, Any]]) -> str:
     """Витягує релевантну інформацію з результатів (legacy функція)"""
     if not results:
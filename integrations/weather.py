@@ -2,7 +2,7 @@
 Інтеграція з OpenWeatherMap для отримання погоди
 """
 
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple, Union
 import requests
 
 
@@ -30,6 +30,19 @@ class WeatherManager:
         Returns:
             (success, message)
         """
+        success, weather = self.fetch(city, language)
+        if not success:
+            return False, weather
+        return True, self.format_text(weather, language)
+    
+    def fetch(self, city: str, language: str = "uk") -> Tuple[bool, Union[Dict[str, Any], str]]:
+        """
+        Погода як дані (для тексту в Telegram і окремо — для озвучки)
+        
+        Returns:
+            (True, {city, temp, feels_like, humidity, description, wind_speed})
+            або (False, повідомлення про помилку)
+        """
         # Перевірка API ключа
         if not self.api_key:
             if language == "uk":
@@ -74,39 +87,14 @@ class WeatherManager:
             data = response.json()
             
             # Парсимо дані
-            temp = round(data['main']['temp'])
-            feels_like = round(data['main']['feels_like'])
-            humidity = data['main']['humidity']
-            description = data['weather'][0]['description']
-            wind_speed = round(data['wind']['speed'])
-            
-            # Форматуємо відповідь
-            if language == "uk":
-                message = (
-                    f"🌤️ Погода в {city}:\n"
-                    f"🌡️ Температура: {temp}°C (відчувається як {feels_like}°C)\n"
-                    f"☁️ {description.capitalize()}\n"
-                    f"💧 Вологість: {humidity}%\n"
-                    f"💨 Вітер: {wind_speed} м/с"
-                )
-            elif language == "de":
-                message = (
-                    f"🌤️ Wetter in {city}:\n"
-                    f"🌡️ Temperatur: {temp}°C (fühlt sich an wie {feels_like}°C)\n"
-                    f"☁️ {description.capitalize()}\n"
-                    f"💧 Luftfeuchtigkeit: {humidity}%\n"
-                    f"💨 Wind: {wind_speed} m/s"
-                )
-            else:  # en
-                message = (
-                    f"🌤️ Weather in {city}:\n"
-                    f"🌡️ Temperature: {temp}°C (feels like {feels_like}°C)\n"
-                    f"☁️ {description.capitalize()}\n"
-                    f"💧 Humidity: {humidity}%\n"
-                    f"💨 Wind: {wind_speed} m/s"
-                )
-            
-            return True, message
+            return True, {
+                "city": city,
+                "temp": round(data['main']['temp']),
+                "feels_like": round(data['main']['feels_like']),
+                "humidity": data['main']['humidity'],
+                "description": data['weather'][0]['description'],
+                "wind_speed": round(data['wind']['speed']),
+            }
             
         except requests.exceptions.Timeout:
             if language == "uk":
@@ -131,6 +119,53 @@ class WeatherManager:
                 return False, "❌ Fehler bei der Verarbeitung von Wetterdaten"
             else:
                 return False, "❌ Error parsing weather data"
+    
+    @staticmethod
+    def format_text(weather: Dict[str, Any], language: str = "uk") -> str:
+        """Повний опис для Telegram"""
+        city, temp, feels_like = weather["city"], weather["temp"], weather["feels_like"]
+        humidity, description, wind_speed = weather["humidity"], weather["description"], weather["wind_speed"]
+        if language == "uk":
+            return (
+                f"🌤️ Погода в {city}:\n"
+                f"🌡️ Температура: {temp}°C (відчувається як {feels_like}°C)\n"
+                f"☁️ {description.capitalize()}\n"
+                f"💧 Вологість: {humidity}%\n"
+                f"💨 Вітер: {wind_speed} м/с"
+            )
+        elif language == "de":
+            return (
+                f"🌤️ Wetter in {city}:\n"
+                f"🌡️ Temperatur: {temp}°C (fühlt sich an wie {feels_like}°C)\n"
+                f"☁️ {description.capitalize()}\n"
+                f"💧 Luftfeuchtigkeit: {humidity}%\n"
+                f"💨 Wind: {wind_speed} m/s"
+            )
+        else:  # en
+            return (
+                f"🌤️ Weather in {city}:\n"
+                f"🌡️ Temperature: {temp}°C (feels like {feels_like}°C)\n"
+                f"☁️ {description.capitalize()}\n"
+                f"💧 Humidity: {humidity}%\n"
+                f"💨 Wind: {wind_speed} m/s"
+            )
+    
+    @staticmethod
+    def format_speech(weather: Dict[str, Any], language: str = "uk") -> str:
+        """Одне речення для динаміка: температура і опис (без вологості й емодзі)"""
+        city, temp, description = weather["city"], weather["temp"], weather["description"]
+        if language == "uk":
+            units = abs(temp) % 10
+            if units == 1 and abs(temp) % 100 != 11:
+                degrees = "градус"
+            elif 2 <= units <= 4 and not 12 <= abs(temp) % 100 <= 14:
+                degrees = "градуси"
+            else:
+                degrees = "градусів"
+            return f"В {city} {temp} {degrees}, {description}."
+        if language == "de":
+            return f"In {city} {temp} Grad, {description}."
+        return f"In {city} it's {temp} degrees, {description}."
 
 
 # Глобальний екземпляр
@@ -1,18 +1,43 @@
 """
 Міграція БД: додає таблицю conversations (історія розмов)
+і нові колонки в існуючі таблиці (create_all їх не додає)
 Запуск: python migrate_db.py
 """
 
+from sqlalchemy import inspect, text
+
 from storage.database import Base, engine
 from storage.models import Conversation
 
+# (таблиця, колонка, DDL-тип) — нові nullable колонки
+NEW_COLUMNS = [
+    ("users", "stt_engine", "VARCHAR(20)"),
+    ("users", "wake_word_templates", "TEXT"),
+    ("conversations", "intent", "VARCHAR(20)"),
+]
+
+
+def _add_missing_columns():
+    """ALTER TABLE ... ADD COLUMN для колонок, яких ще немає в БД"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table, column, ddl in NEW_COLUMNS:
+            if table not in existing_tables:
+                continue
+            columns = {c["name"] for c in inspector.get_columns(table)}
+            if column not in columns:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                print(f"➕ Додано колонку {table}.{column}")
+
+
 def migrate():
     """Створює нові таблиці в БД"""
     print("🔄 Створюю нові таблиці...")
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
     print("✅ Міграцію завершено!")
     print("📊 Таблиця 'conversations' створена")
 
 if __name__ == "__main__":
     migrate()
-
@@ -0,0 +1,126 @@
+"""
+Порівняння шляхів «відповідь TTS → PCM пристрою».
+
+- pydub: AudioSegment.from_mp3 (ffmpeg) → 44.1 кГц stereo → export WAV → розбір WAV
+  (старий ланцюжок перед pygame.mixer.Sound);
+- mp3:   core.audio_decode + PlaybackJob (libsndfile у процесі, без ffmpeg);
+- pcm:   сирий PCM 24 кГц від TTS (response_format="pcm") + PlaybackJob.
+
+Для кожного: час до першого блоку, готового для пристрою, і CPU (разом з
+дочірніми процесами — ffmpeg теж рахується).
+
+Запуск на Pi: python -m scripts.benchmark_decode --file reply.mp3
+"""
+
+import argparse
+import os
+import resource
+import time
+import wave
+from io import BytesIO
+from typing import Callable, Tuple
+
+import numpy as np
+
+from core import dsp
+from core.audio_decode import SOUNDFILE_AVAILABLE, TTS_PCM_RATE, open_decoder, wrap_pcm
+from core.playback import PlaybackEngine
+
+
+def _cpu_seconds() -> float:
+    """CPU процесу + завершених дочірніх процесів"""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _synthetic_pcm(seconds: float) -> bytes:
+    """Голосоподібний сигнал 24 кГц (гармоніки з плаваючим тоном)"""
+    t = np.arange(int(TTS_PCM_RATE * seconds)) / TTS_PCM_RATE
+    f0 = 130 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / TTS_PCM_RATE
+    signal = sum(np.sin(k * phase) / k for k in range(1, 12))
+    return dsp.array_to_pcm16(6000 * signal / np.abs(signal).max())
+
+
+def _to_mp3(pcm: bytes) -> bytes:
+    import soundfile as sf
+
+    buffer = BytesIO()
+    sf.write(buffer, dsp.pcm16_to_array(pcm), TTS_PCM_RATE, format="MP3")
+    return buffer.getvalue()
+
+
+def _pydub_chain(audio_data: bytes, rate: int, channels: int) -> float:
+    """Старий ланцюжок; перший семпл можливий лише після повного розбору WAV"""
+    from pydub import AudioSegment
+
+    start = time.perf_counter()
+    audio = AudioSegment.from_mp3(BytesIO(audio_data))
+    audio = audio.set_frame_rate(rate).set_channels(channels)
+    wav_buffer = BytesIO()
+    audio.export(wav_buffer, format="wav")
+    wav_buffer.seek(0)
+    with wave.open(wav_buffer, "rb") as wf:
+        wf.readframes(wf.getnframes())
+    return time.perf_counter() - start
+
+
+def _in_process(audio_data: bytes, rate: int, channels: int) -> float:
+    engine = PlaybackEngine()
+    engine.rate, engine.channels = rate, channels
+    start = time.perf_counter()
+    first_block = None
+    source_rate, source_channels, blocks = open_decoder(audio_data)
+    job = engine.begin(source_rate, source_channels)
+    for block in blocks:
+        job.write(block)
+        if first_block is None and job._blocks:
+            first_block = time.perf_counter() - start
+    job.finish()
+    return first_block if first_block is not None else time.perf_counter() - start
+
+
+def _measure(label: str, fn: Callable[[], float], repeats: int) -> Tuple[float, float]:
+    first, cpu = [], []
+    for _ in range(repeats):
+        cpu_start = _cpu_seconds()
+        first.append(fn())
+        cpu.append(_cpu_seconds() - cpu_start)
+    print(f"  {label:<34} перший семпл {np.median(first) * 1000:7.1f} мс   CPU {np.median(cpu) * 1000:7.1f} мс")
+    return float(np.median(first)), float(np.median(cpu))
+
+
+def run(path: str, seconds: float, rate: int, channels: int, repeats: int) -> None:
+    if path:
+        with open(path, "rb") as f:
+            mp3 = f.read()
+        pcm_wav = None
+    else:
+        if not SOUNDFILE_AVAILABLE:
+            print("❌ Для синтетичного MP3 потрібен soundfile — передайте --file")
+            return
+        pcm = _synthetic_pcm(seconds)
+        mp3 = _to_mp3(pcm)
+        pcm_wav = wrap_pcm(pcm)
+    print(f"📊 MP3 {len(mp3) / 1024:.0f} KB → {rate} Hz, {channels}ch, {repeats} повторів")
+
+    try:
+        _measure("pydub + ffmpeg + export WAV", lambda: _pydub_chain(mp3, rate, channels), repeats)
+    except Exception as e:
+        print(f"  pydub недоступний ({e}) — порівняння пропущено")
+    _measure("core.audio_decode (MP3)", lambda: _in_process(mp3, rate, channels), repeats)
+    if pcm_wav is not None:
+        _measure('core.audio_decode (TTS "pcm")', lambda: _in_process(pcm_wav, rate, channels), repeats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark TTS decode paths")
+    parser.add_argument("--file", default="", help="MP3 відповіді TTS (за замовчуванням — синтетичний)")
+    parser.add_argument("--seconds", type=float, default=6.0)
+    parser.add_argument("--rate", type=int, default=48000, help="Частота пристрою")
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    if args.file and not os.path.exists(args.file):
+        parser.error(f"файл не знайдено: {args.file}")
+    run(args.file, args.seconds, args.rate, args.channels, args.repeats)
@@ -0,0 +1,77 @@
+"""
+Порівняння швидкодії core.dsp з audioop на типових чанках захоплення.
+
+Запуск на Pi: python -m scripts.benchmark_dsp --seconds 30
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from core import dsp
+
+try:
+    import audioop  # прибрано в Python 3.13, на Pi — через audioop-lts
+    AUDIOOP_AVAILABLE = True
+except ImportError:
+    AUDIOOP_AVAILABLE = False
+
+
+def _make_chunks(seconds: float, rate: int, chunk: int):
+    """Синус + шум, порізаний на чанки як у потоці захоплення"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate)) / rate
+    signal = 6000 * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 500, t.size)
+    pcm = np.clip(signal, -32768, 32767).astype("<i2").tobytes()
+    step = chunk * 2
+    return [pcm[i:i + step] for i in range(0, len(pcm) - step + 1, step)]
+
+
+def _timed(label: str, fn, chunks, audio_seconds: float) -> float:
+    start = time.perf_counter()
+    for data in chunks:
+        fn(data)
+    elapsed = time.perf_counter() - start
+    per_chunk_us = elapsed / len(chunks) * 1e6
+    print(f"  {label:<28} {per_chunk_us:8.1f} µs/чанк   RTF={elapsed / audio_seconds:.4f}")
+    return elapsed
+
+
+def run(seconds: float, rate: int, out_rate: int, chunk: int) -> None:
+    chunks = _make_chunks(seconds, rate, chunk)
+    print(f"📊 {len(chunks)} чанків по {chunk} семплів @ {rate} Hz ({seconds:.0f}s аудіо)")
+
+    print("RMS:")
+    _timed("core.dsp.rms", dsp.rms, chunks, seconds)
+    if AUDIOOP_AVAILABLE:
+        _timed("audioop.rms", lambda d: audioop.rms(d, 2), chunks, seconds)
+
+    print(f"Ресемплінг {rate}→{out_rate}:")
+    resampler = dsp.PolyphaseResampler(rate, out_rate)
+    _timed("core.dsp.PolyphaseResampler", resampler.process, chunks, seconds)
+    if AUDIOOP_AVAILABLE:
+        state = [None]
+
+        def ratecv(data: bytes) -> None:
+            _, state[0] = audioop.ratecv(data, 2, 1, rate, out_rate, state[0])
+
+        _timed("audioop.ratecv (лінійний)", ratecv, chunks, seconds)
+
+    print("Mono → stereo:")
+    _timed("core.dsp.mono_to_stereo", dsp.mono_to_stereo, chunks, seconds)
+    if AUDIOOP_AVAILABLE:
+        _timed("audioop.tostereo", lambda d: audioop.tostereo(d, 2, 1, 1), chunks, seconds)
+
+    if not AUDIOOP_AVAILABLE:
+        print("ℹ️  audioop недоступний — порівняння пропущено")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark core.dsp vs audioop")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--out-rate", type=int, default=16000)
+    parser.add_argument("--chunk", type=int, default=1024)
+    args = parser.parse_args()
+    run(args.seconds, args.rate, args.out_rate, args.chunk)
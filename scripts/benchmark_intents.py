@@ -0,0 +1,86 @@
+"""
+Класифікація інтентів: старий цикл re.search по шаблонах vs один компільований регекс.
+
+Фрази — золотий корпус scripts/intent_corpus.py; перевіряється і збіг
+відповідей (крім навмисно виправлених SHADOWED), і час на виклик.
+
+Запуск на Pi: python -m scripts.benchmark_intents --rounds 200
+
+--calibrate: поріг класифікатора на відкладених фразах NEAR_MISS — скільки
+переформулювань він ловить і скільки разів відповідає не тим інтентом.
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from core.command_router import CLASSIFIER_INTENTS, classifier_examples, determine_command_type, get_intent_classifier
+from core.intent_classifier import IntentClassifier
+from scripts.intent_corpus import GOLDEN, NEAR_MISS, SHADOWED, legacy_determine_command_type
+
+
+def _per_call_us(classify: Callable[[str, str], Any], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for language, text, _, _ in GOLDEN:
+            classify(text, language)
+    return (time.perf_counter() - start) / (rounds * len(GOLDEN)) * 1e6
+
+
+def calibrate() -> None:
+    """Влучання і хибні спрацювання класифікатора для ряду порогів"""
+    examples = {language: classifier_examples(language) for language, _, _ in NEAR_MISS}
+    positives = sum(1 for _, _, intent in NEAR_MISS if intent != "unknown")
+    print(f"Відкладених фраз: {len(NEAR_MISS)} (з інтентом: {positives})")
+    print("  поріг  влучань  хибних")
+    for step in range(4, 15):
+        threshold = step * 0.05
+        classifiers = {language: IntentClassifier(items, threshold=threshold) for language, items in examples.items()}
+        hits = wrong = 0
+        for language, text, expected in NEAR_MISS:
+            predicted = classifiers[language].predict(text)
+            if predicted is None or predicted[0] not in CLASSIFIER_INTENTS:
+                continue
+            if predicted[0] == expected:
+                hits += 1
+            else:
+                wrong += 1
+        print(f"  {threshold:5.2f}  {hits:3d}/{positives:<3d}  {wrong:5d}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark intent matching")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--calibrate", action="store_true", help="Підбір порогу класифікатора")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        calibrate()
+        return
+
+    mismatches = [
+        (language, text) for language, text, _, _ in GOLDEN
+        if text not in SHADOWED and legacy_determine_command_type(text, language) != determine_command_type(text, language)
+    ]
+    print(f"Фраз: {len(GOLDEN)}, розбіжностей зі старою реалізацією: {len(mismatches)} (навмисних: {len(SHADOWED)})")
+    for language, text in mismatches:
+        print(f"  ❌ [{language}] {text}")
+
+    legacy = _per_call_us(legacy_determine_command_type, args.rounds)
+    compiled = _per_call_us(lambda text, language: determine_command_type(text, language, use_classifier=False), args.rounds)
+    print(f"  цикл re.search       {legacy:8.2f} µs/виклик")
+    print(f"  один регекс          {compiled:8.2f} µs/виклик   (x{legacy / compiled:.1f})")
+    if compiled >= legacy:
+        print("  ❌ Компільований матчер не швидший за старий цикл")
+
+    # Класифікатор працює лише на промахах шаблонів — міряємо окремо
+    classifier = get_intent_classifier("uk")
+    if classifier is not None:
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            classifier.predict("скажи котру годину")
+        print(f"  класифікатор (промах) {(time.perf_counter() - start) / args.rounds * 1e6:7.2f} µs/виклик")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Синтез кліпів для озвучки часу і дати (core/clip_speech).
+
+Daemon добудовує відсутні кліпи у фоні при старті; скрипт робить те саме
+наперед — наприклад, для всіх мов одразу.
+
+Запуск на Pi: python -m scripts.build_clip_library --user <telegram_id> --languages uk de en
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Додаємо батьківську папку до path щоб імпортувати модулі
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import get_settings
+from core.clip_speech import SUPPORTED_LANGUAGES, ClipLibrary
+from core.tts import text_to_speech
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build time/date clip library")
+    parser.add_argument("--user", type=int, required=True, help="Telegram ID користувача (ключ OpenAI)")
+    parser.add_argument("--languages", nargs="+", default=list(SUPPORTED_LANGUAGES), choices=SUPPORTED_LANGUAGES)
+    parser.add_argument("--voice", default="onyx")
+    args = parser.parse_args()
+
+    year = time.localtime().tm_year
+    for language in args.languages:
+        library = ClipLibrary(get_settings().clip_library_dir, language, args.voice)
+        built = library.build(
+            lambda text: text_to_speech(args.user, text, language, voice=args.voice, response_format="pcm", use_cache=False),
+            years=(year, year + 1),
+        )
+        print(f"🧱 {language}: +{built} кліпів ({library.directory})")
+
+
+if __name__ == "__main__":
+    main()
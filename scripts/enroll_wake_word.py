@@ -0,0 +1,57 @@
+"""
+Запис зразків ключової фрази для режиму WAKE_WORD_MODE=keyword.
+
+Запуск на Pi: python -m scripts.enroll_wake_word --user <telegram_id> --samples 3
+"""
+
+import argparse
+import os
+import sys
+
+# Додаємо батьківську папку до path щоб імпортувати модулі
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.keyword_spotter import KeywordSpotter, templates_to_json
+from core.wake_word import WakeWordDetector, WakeWordMode
+from storage.database import SessionLocal, init_db
+from storage.models import User
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Enroll wake word samples")
+    parser.add_argument("--user", type=int, required=True, help="Telegram ID користувача")
+    parser.add_argument("--samples", type=int, default=3, help="Скільки разів сказати фразу")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.telegram_user_id == args.user).first()
+        if not user:
+            print("❌ Користувач не знайдений")
+            return
+
+        detector = WakeWordDetector(mode=WakeWordMode.KEYWORD)
+        spotter = KeywordSpotter()
+        try:
+            for i in range(args.samples):
+                print(f"\n🎙️  [{i + 1}/{args.samples}] Скажи: «{user.wake_word}»")
+                phrase = detector.capture_phrase()
+                if not phrase:
+                    print("❌ Мікрофон не віддає даних")
+                    return
+                template = spotter.enroll(phrase)
+                print(f"✅ Записано ({template.shape[0]} кадрів)")
+        finally:
+            detector.stop()
+
+        user.wake_word_templates = templates_to_json(spotter.templates)
+        db.commit()
+        print(f"\n💾 Збережено {len(spotter.templates)} зразків, поріг DTW={spotter.threshold:.2f}")
+        print("ℹ️  Увімкни WAKE_WORD_MODE=keyword у .env і перезапусти голосовий режим")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Золотий корпус команд для command_router (benchmark_intents.py і тести).
+
+GOLDEN: (мова, фраза, інтент, слоти) — очікувана класифікація.
+legacy_determine_command_type: попередня реалізація (еталон для порівняння).
+SHADOWED: фрази, де старий цикл по шаблонах помилявся через загальний шаблон
+(«поставити (.+)» перехоплював таймер) — тут нова відповідь навмисно інша.
+NEAR_MISS: (мова, фраза, інтент) — фрази повз шаблони, відкладені для калібрування
+порогу класифікатора (у навчання не йдуть); "unknown" — має піти в LLM.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.command_router import PATTERNS, CommandType
+
+
+GOLDEN: List[Tuple[str, str, str, Dict[str, Any]]] = [
+    ("uk", "Котра година?", "time", {}),
+    ("uk", "скільки зараз часу", "time", {}),
+    ("uk", "який час зараз", "time", {}),
+    ("uk", "яке сьогодні число", "date", {}),
+    ("uk", "Яка сьогодні дата?", "date", {}),
+    ("uk", "яка погода", "weather", {}),
+    ("uk", "погода в Києві", "weather", {"action": "києві"}),
+    ("uk", "яка погода в Львові", "weather", {}),
+    ("uk", "погода завтра", "weather", {"action": "завтра"}),
+    ("uk", "включи музику", "spotify", {}),
+    ("uk", "включи пісню океан ельзи", "spotify", {"action": "включи", "value": "океан ельзи"}),
+    ("uk", "грай пісню Шум", "spotify", {"action": "грай", "value": "шум"}),
+    ("uk", "грай джаз", "spotify", {"action": "джаз"}),
+    ("uk", "зупини музику", "spotify", {}),
+    ("uk", "пауза", "spotify", {}),
+    ("uk", "пусти радіо", "spotify", {"action": "радіо"}),
+    ("uk", "поставити таймер", "timer", {}),
+    ("uk", "встанов таймер на 5", "timer", {"action": "5"}),
+    ("uk", "таймер на 10 хвилин", "timer", {"action": "10"}),
+    ("uk", "нагадай через 15", "timer", {"action": "15"}),
+    ("uk", "розкажи жарт", "joke", {}),
+    ("uk", "анекдот", "joke", {}),
+    ("uk", "цікавий факт", "fact", {}),
+    ("uk", "розкажи щось цікаве", "fact", {}),
+    ("uk", "історія", "history", {}),
+    ("uk", "покажи історію", "history", {}),
+    ("uk", "мої команди", "history", {}),
+    ("uk", "що в календарі", "calendar", {}),
+    ("uk", "додай подію зустріч з мамою", "calendar", {"action": "подію", "value": "зустріч з мамою"}),
+    ("uk", "що таке квантовий комп'ютер", "web_search", {"query": "що таке квантовий комп'ютер"}),
+    ("uk", "розкажи про Шевченка", "web_search", {"query": "розкажи про Шевченка"}),
+    ("uk", "привіт як справи", "unknown", {}),
+    ("uk", "включи таймер на 5", "timer", {"action": "5"}),
+    ("uk", "поставити будильник", "spotify", {"action": "будильник"}),
+    ("uk", "хочу послухати Бумбокс", "spotify", {}),
+    ("uk", "пусти жарт", "spotify", {"action": "жарт"}),
+    ("uk", "історія України", "history", {}),
+    ("uk", "грай, будь ласка, пауза", "spotify", {}),
+    ("en", "What time is it?", "time", {}),
+    ("en", "tell me the time", "time", {}),
+    ("en", "what's the date", "date", {}),
+    ("en", "what day is it", "date", {}),
+    ("en", "what's the weather", "weather", {}),
+    ("en", "weather in London", "weather", {"action": "london"}),
+    ("en", "is it rain today", "weather", {"action": "rain"}),
+    ("en", "play music", "spotify", {}),
+    ("en", "play song yesterday", "spotify", {"action": "song", "value": "yesterday"}),
+    ("en", "play jazz", "spotify", {"action": "jazz"}),
+    ("en", "pause", "spotify", {}),
+    ("en", "stop music", "spotify", {}),
+    ("en", "set a timer for 5", "timer", {"action": "a ", "value": "5"}),
+    ("en", "set timer", "timer", {}),
+    ("en", "timer for 10 minutes", "timer", {"action": "10"}),
+    ("en", "remind me in 20", "timer", {"action": "me ", "value": "20"}),
+    ("en", "tell me a joke", "joke", {"action": "me ", "value": "a "}),
+    ("en", "something funny", "joke", {}),
+    ("en", "tell me a fact", "fact", {"action": "me ", "value": "a "}),
+    ("en", "interesting fact", "fact", {}),
+    ("en", "show history", "history", {}),
+    ("en", "history", "history", {}),
+    ("en", "any meetings", "calendar", {}),
+    ("en", "what is python", "web_search", {"query": "what is python"}),
+    ("en", "tell me about mars", "web_search", {"query": "tell me about mars"}),
+    ("en", "hello there", "unknown", {}),
+    ("en", "play a joke", "spotify", {"action": "a joke"}),
+    ("en", "pause the timer", "spotify", {}),
+    ("en", "history of rome", "history", {}),
+    ("de", "Wie spät ist es?", "time", {}),
+    ("de", "uhrzeit bitte", "time", {}),
+    ("de", "welches datum ist heute", "date", {}),
+    ("de", "wie ist das wetter", "weather", {}),
+    ("de", "wetter in Berlin", "weather", {"action": "berlin"}),
+    ("de", "musik abspielen", "spotify", {}),
+    ("de", "spiele lied Hallo", "spotify", {"action": "lied", "value": "hallo"}),
+    ("de", "spiele Jazz", "spotify", {"action": "jazz"}),
+    ("de", "pause", "spotify", {}),
+    ("de", "stelle timer für 5", "timer", {"action": "5"}),
+    ("de", "timer stellen", "timer", {}),
+    ("de", "erzähl mir einen witz", "joke", {"action": "mir ", "value": "einen "}),
+    ("de", "witz", "joke", {}),
+    ("de", "interessante tatsache", "fact", {}),
+    ("de", "zeige geschichte", "history", {}),
+    ("de", "was ist geplant", "calendar", {}),
+    ("de", "was ist Photosynthese", "web_search", {"query": "was ist Photosynthese"}),
+    ("de", "hallo", "unknown", {}),
+    ("de", "spiele einen witz", "spotify", {"action": "einen witz"}),
+    ("de", "timer für pause", "spotify", {}),
+]
+
+SHADOWED = {"включи таймер на 5", "поставити таймер"}
+
+
+NEAR_MISS: List[Tuple[str, str, str]] = [
+    # Переформулювання, на які варто відповісти без LLM
+    ("uk", "скажи котру годину", "time"),
+    ("uk", "підкажи котру годину", "time"),
+    ("uk", "котра вже година", "time"),
+    ("uk", "котра там година", "time"),
+    ("uk", "скільки на годиннику", "time"),
+    ("uk", "скільки там годин", "time"),
+    ("uk", "яке в нас сьогодні число", "date"),
+    ("uk", "а яке сьогодні у нас число", "date"),
+    ("uk", "покажи мою історію", "history"),
+    ("uk", "покажи всю історію", "history"),
+    ("uk", "покажи останні команди", "history"),
+    ("en", "what day is today", "date"),
+    ("en", "got the time", "time"),
+    ("de", "wie viel uhr", "time"),
+    ("de", "welches datum haben wir heute", "date"),
+    # Схожі слова, інше питання
+    ("uk", "скільки тобі років", "unknown"),
+    ("uk", "котрий зараз рік", "unknown"),
+    ("uk", "скільки коштує хліб", "unknown"),
+    ("uk", "котра з них краща", "unknown"),
+    ("uk", "скільки днів до літа", "unknown"),
+    ("en", "what year is it", "unknown"),
+    ("en", "how old are you", "unknown"),
+    ("en", "what time does the shop close", "unknown"),
+    ("en", "what time do you wake up", "unknown"),
+    ("de", "wie alt bist du", "unknown"),
+    # Дії без слотів — не вгадувати
+    ("uk", "стоп", "unknown"),
+    ("uk", "зупинись", "unknown"),
+    ("uk", "музику вимкни", "unknown"),
+    ("uk", "зроби тихіше", "unknown"),
+    ("uk", "яка там погода", "unknown"),
+    ("en", "stop", "unknown"),
+    ("en", "stop it", "unknown"),
+    ("de", "stopp", "unknown"),
+    # Балачки
+    ("uk", "привіт як справи", "unknown"),
+    ("uk", "як тебе звати", "unknown"),
+    ("uk", "що ти вмієш", "unknown"),
+    ("uk", "напиши вірш про кота", "unknown"),
+    ("uk", "хто президент україни", "unknown"),
+    ("uk", "поясни теорію відносності", "unknown"),
+    ("en", "hello there", "unknown"),
+    ("en", "who are you", "unknown"),
+    ("en", "how are you", "unknown"),
+    ("en", "write a poem", "unknown"),
+    ("de", "hallo", "unknown"),
+    ("de", "wer bist du", "unknown"),
+    ("de", "wie geht es dir", "unknown"),
+]
+
+
+def legacy_determine_command_type(text: str, language: str = "uk") -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Попередня реалізація: некомпільовані шаблони в порядку словника"""
+    lang_patterns = PATTERNS.get(language, PATTERNS["en"])
+    text_lower = text.lower()
+    for command_type, patterns in lang_patterns.items():
+        for pattern in patterns:
+            match = re.search(pattern, text_lower)
+            if match:
+                params: Dict[str, Any] = {}
+                if match.groups():
+                    if len(match.groups()) >= 1:
+                        params["action"] = match.group(1)
+                    if len(match.groups()) >= 2:
+                        params["value"] = match.group(2)
+                return command_type, params
+    if any(marker in text_lower for marker in ("що таке", "розкажи про", "what is", "tell me about", "was ist", "erzähl mir über")):
+        return CommandType.WEB_SEARCH, {"query": text}
+    return CommandType.UNKNOWN, None
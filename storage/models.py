@@ -32,7 +32,9 @@ class User(Base):
     # Налаштування користувача
     language: Mapped[str] = mapped_column(String(5), default="uk", nullable=False)
     wake_word: Mapped[str] = mapped_column(String(100), default="Привіт Бот", nullable=False)
+    wake_word_templates: Mapped[str | None] = mapped_column(Text, nullable=True)  # MFCC-зразки фрази (JSON)
     personality_prompt: Mapped[str | None] = mapped_column(Text, nullable=True)
+    stt_engine: Mapped[str | None] = mapped_column(String(20), nullable=True)  # NULL → STT_ENGINE з конфігу
 
     # Статус
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -76,5 +78,7 @@ class Conversation(Base):
     command: Mapped[str] = mapped_column(Text, nullable=False)
     response: Mapped[str] = mapped_column(Text, nullable=False)
     language: Mapped[str] = mapped_column(String(5), default="uk", nullable=False)
+    # Інтент з шаблонів router (мітка для класифікатора); NULL — невідомо або вгадано
+    intent: Mapped[str | None] = mapped_column(String(20), nullable=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
 
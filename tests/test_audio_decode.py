@@ -0,0 +1,47 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+from core import dsp
+from core.audio_decode import SOUNDFILE_AVAILABLE, TTS_PCM_RATE, decode_audio, open_decoder, wrap_pcm
+from core.playback import PlaybackEngine
+
+
+def _tone(rate: int, seconds: float) -> bytes:
+    t = np.arange(int(rate * seconds)) / rate
+    return dsp.array_to_pcm16(8000 * np.sin(2 * np.pi * 440 * t))
+
+
+def test_raw_tts_pcm_is_wrapped_and_decoded_in_blocks():
+    pcm = _tone(TTS_PCM_RATE, 1.0)
+    rate, channels, blocks = open_decoder(wrap_pcm(pcm), block_frames=4096)
+    blocks = list(blocks)
+    assert (rate, channels) == (TTS_PCM_RATE, 1)
+    assert len(blocks) == 6 and b"".join(blocks) == pcm
+
+
+@pytest.mark.skipif(not SOUNDFILE_AVAILABLE, reason="soundfile не встановлено")
+def test_mp3_is_decoded_in_process():
+    import soundfile as sf
+
+    if "MP3" not in sf.available_formats():
+        pytest.skip("libsndfile без MP3")
+    buffer = BytesIO()
+    sf.write(buffer, dsp.pcm16_to_array(_tone(TTS_PCM_RATE, 1.0)), TTS_PCM_RATE, format="MP3")
+    pcm, rate, channels = decode_audio(buffer.getvalue())
+    assert (rate, channels) == (TTS_PCM_RATE, 1)
+    assert abs(len(pcm) // 2 - TTS_PCM_RATE) < 2000
+    assert dsp.rms(pcm) > 3000
+
+
+def test_play_encoded_converts_to_device_format():
+    engine = PlaybackEngine()
+    engine.rate, engine.channels = 48000, 2
+    job = engine.play_encoded(wrap_pcm(_tone(TTS_PCM_RATE, 0.5)), wait=False)
+    assert job.ready_at is not None
+    queued = b"".join(job._blocks)
+    assert abs(len(queued) // 4 - 24000) < 64
+
+    native = engine.play_encoded(wrap_pcm(b"\x01\x00\x02\x00" * 100, rate=48000, channels=2), wait=False)
+    assert b"".join(native._blocks) == b"\x01\x00\x02\x00" * 100
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from voice import audio_encoding
+from voice.audio_encoding import encode_pcm, pcm_to_wav, prepare_for_upload, trim_silence, wav_to_pcm
+
+RATE = 16000
+
+
+def _clip(lead: float, speech: float, tail: float) -> bytes:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(RATE * speech)) / RATE
+    parts = [
+        rng.normal(0, 50, int(RATE * lead)),
+        4000 * np.sin(2 * np.pi * 220 * t),
+        rng.normal(0, 50, int(RATE * tail)),
+    ]
+    return np.concatenate(parts).astype("<i2").tobytes()
+
+
+def test_trim_silence_keeps_speech_with_padding():
+    pcm = _clip(1.0, 1.0, 1.5)
+    trimmed = trim_silence(pcm, RATE, threshold=300)
+    seconds = len(trimmed) / 2 / RATE
+    # 1 с мови + 0.15 с спереду + 0.25 с ззаду (з точністю до блоку)
+    assert 1.35 <= seconds <= 1.45
+
+
+def test_trim_silence_without_speech_returns_original():
+    pcm = _clip(1.0, 0.0, 0.0)
+    assert trim_silence(pcm, RATE, threshold=300) == pcm
+
+
+def test_wav_fallback_roundtrip():
+    pcm = _clip(0.1, 0.2, 0.1)
+    data, filename = encode_pcm(pcm, RATE, "wav")
+    assert filename == "audio.wav"
+    assert wav_to_pcm(data) == (pcm, RATE)
+
+
+@pytest.mark.skipif(not audio_encoding.SOUNDFILE_AVAILABLE, reason="soundfile не встановлено")
+def test_flac_is_lossless_and_smaller():
+    import io
+    import soundfile as sf
+
+    wav = pcm_to_wav(_clip(1.0, 1.0, 1.5), RATE)
+    data, filename = prepare_for_upload(wav, threshold=300, audio_format="flac")
+    assert filename == "audio.flac"
+    assert len(data) < len(wav) / 2
+
+    decoded, rate = sf.read(io.BytesIO(data), dtype="int16")
+    assert rate == RATE
+    expected = trim_silence(wav_to_pcm(wav)[0], RATE, threshold=300)
+    assert decoded.tobytes() == expected
@@ -0,0 +1,91 @@
+import time
+import wave
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+
+from core import dsp
+from core.audio_decode import wrap_pcm
+from core.clip_speech import (
+    CLIP_RATE,
+    ClipLibrary,
+    cardinal,
+    concatenate,
+    date_tokens,
+    ordinal,
+    time_tokens,
+    trim_clip,
+    vocabulary,
+)
+
+
+def _fake_tts(text: str) -> bytes:
+    """Тон 0.2 с, обрамлений тишею — як TTS для одного слова"""
+    t = np.arange(int(CLIP_RATE * 0.2)) / CLIP_RATE
+    tone = 8000 * np.sin(2 * np.pi * (200 + len(text) * 10) * t)
+    silence = np.zeros(int(CLIP_RATE * 0.3))
+    return wrap_pcm(dsp.array_to_pcm16(np.concatenate((silence, tone, silence))))
+
+
+def test_number_words():
+    assert cardinal(21, "uk") == "двадцять один"
+    assert cardinal(0, "uk") == "нуль"
+    assert ordinal(26, "uk") == "двадцять шостого"
+    assert ordinal(17, "uk") == "сімнадцятого"
+    assert cardinal(21, "de") == "einundzwanzig"
+    assert ordinal(3, "de") == "dritte" and ordinal(21, "de") == "einundzwanzigste"
+    assert cardinal(45, "en") == "forty-five"
+    assert ordinal(22, "en") == "twenty-second"
+
+
+def test_tokens_follow_each_language_grammar():
+    assert time_tokens(14, 5, "uk") == ["now", "n14", "n0", "n5"]
+    assert time_tokens(9, 0, "uk") == ["now", "n9", "exact"]
+    assert time_tokens(1, 30, "de") == ["now", "ein", "uhr", "n30"]
+    assert time_tokens(7, 5, "en") == ["now", "n7", "oh", "n5"]
+
+    friday = datetime(2026, 10, 16)
+    uk = date_tokens(friday, "uk")
+    assert uk == ["today", "w4", "_pause", "o16", "m10", "y2000", "o26", "year"]
+    words = vocabulary("uk", years=(2026,))
+    assert [words[t] for t in uk if t != "_pause"] == [
+        "Сьогодні", "п'ятниця", "шістнадцятого", "жовтня", "дві тисячі", "двадцять шостого", "року"
+    ]
+    assert date_tokens(friday, "de")[3:5] == ["der", "o16"]
+    assert date_tokens(datetime(2005, 1, 1), "en") is None
+
+
+def test_trim_and_crossfade_keep_joins_smooth():
+    tone = np.ones(CLIP_RATE // 10, dtype=np.float32) * 1000
+    padded = np.concatenate((np.zeros(CLIP_RATE // 2, dtype=np.float32), tone, np.zeros(CLIP_RATE // 2, dtype=np.float32)))
+    trimmed = trim_clip(padded)
+    assert len(trimmed) < len(tone) + CLIP_RATE // 10
+
+    joined = concatenate([tone, -tone], crossfade=0.015)
+    overlap = int(CLIP_RATE * 0.015)
+    assert len(joined) == 2 * len(tone) - overlap
+    assert np.abs(np.diff(joined)).max() < 300  # без стрибка на стику
+
+
+def test_library_builds_once_and_renders_offline(tmp_path):
+    calls = []
+    library = ClipLibrary(tmp_path, "uk", "onyx")
+    built = library.build(lambda text: calls.append(text) or _fake_tts(text), years=(2026,))
+    assert built == len(vocabulary("uk", (2026,))) == len(calls)
+    assert library.missing((2026,)) == []
+    assert library.build(_fake_tts, years=(2026,)) == 0
+
+    fresh = ClipLibrary(tmp_path, "uk", "onyx")
+    start = time.perf_counter()
+    audio = fresh.render_date(datetime(2026, 10, 16))
+    assert time.perf_counter() - start < 0.5
+    with wave.open(BytesIO(audio)) as wf:
+        assert wf.getframerate() == CLIP_RATE and wf.getnchannels() == 1
+        assert wf.getnframes() > CLIP_RATE  # 7 слів + пауза
+    assert fresh.render_time(datetime(2026, 10, 16, 14, 5)) is not None
+
+
+def test_missing_clip_falls_back(tmp_path):
+    library = ClipLibrary(tmp_path, "en", "onyx")
+    assert library.render_time(datetime(2026, 1, 1, 12, 0)) is None
@@ -0,0 +1,67 @@
+import numpy as np
+
+from core.endpointer import Endpointer
+from core.metrics import LatencyMetrics
+
+RATE = 16000
+CHUNK = 1024
+CHUNK_SECONDS = CHUNK / RATE
+
+
+def _chunk(level: float) -> bytes:
+    return np.full(CHUNK, level, dtype="<i2").tobytes()
+
+
+def _run(endpointer: Endpointer, pattern):
+    """pattern: [(рівень, секунди), ...] → True, якщо endpointer зупинився"""
+    for level, seconds in pattern:
+        for _ in range(int(round(seconds / CHUNK_SECONDS))):
+            if endpointer.feed(_chunk(level)):
+                return True
+    return False
+
+
+def test_endpointer_short_hangover_after_complete_phrase():
+    ep = Endpointer(RATE, CHUNK, noise_rms=100, hangover=0.5, incomplete_hangover=1.2)
+    assert _run(ep, [(1000, 1.0), (100, 2.0)])
+    assert ep.reason == "silence"
+    assert 0.5 <= ep.endpoint_latency < 0.5 + 2 * CHUNK_SECONDS
+
+
+def test_endpointer_waits_longer_when_phrase_looks_unfinished():
+    ep = Endpointer(RATE, CHUNK, noise_rms=100, hangover=0.5, incomplete_hangover=1.2)
+    # «Привіт бот…» — мови мало, пауза 0.8 с ще не кінець
+    assert not _run(ep, [(1000, 0.3), (100, 0.8)])
+    assert _run(ep, [(1000, 0.8), (100, 2.0)])
+    assert ep.gaps and ep.gaps[0] > 0.7
+    # Після такої паузи всередині фрази кінцева тиша теж довша
+    assert ep.endpoint_latency > 0.9
+
+
+def test_endpointer_threshold_follows_noise_floor():
+    quiet = Endpointer(RATE, CHUNK, noise_rms=50, min_threshold=150)
+    noisy = Endpointer(RATE, CHUNK, noise_rms=600, min_threshold=150)
+    assert quiet.threshold == 150
+    assert noisy.threshold == 1500
+    # Гучний фон не вважається мовою — лише таймаут без мови, не 10 с
+    assert _run(noisy, [(600, 6.0)])
+    assert noisy.reason == "no_speech"
+    assert noisy.endpoint_latency is None
+
+
+def test_endpointer_max_duration():
+    ep = Endpointer(RATE, CHUNK, noise_rms=100, max_duration=2.0)
+    assert _run(ep, [(1000, 3.0)])
+    assert ep.reason == "max_duration"
+
+
+def test_latency_metrics_summary():
+    m = LatencyMetrics(window=3)
+    assert m.summary("x") is None
+    for value in (0.1, 0.2, 0.3, 0.4):
+        m.observe("x", value)
+    stats = m.summary("x")
+    assert stats["count"] == 3
+    assert stats["last"] == 0.4
+    assert stats["p50"] == 0.3
+    assert "n=3" in m.format("x")
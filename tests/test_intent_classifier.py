@@ -0,0 +1,119 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core import command_router
+from core.command_router import (
+    CLASSIFIER_INTENTS,
+    CommandType,
+    determine_command_type,
+    get_intent_classifier,
+    history_label,
+    process_command_result,
+    record_history,
+)
+from core.intent_classifier import IntentClassifier, covers, pattern_examples
+from scripts.intent_corpus import NEAR_MISS
+
+
+def test_pattern_examples_drop_slots_and_expand_alternatives():
+    assert pattern_examples("(включи|грай) пісню (.+)") == ["включи пісню", "грай пісню"]
+    assert pattern_examples(r"встанов таймер на (\d+)") == ["встанов таймер на"]
+    assert pattern_examples("tell (me )?(a )?joke") == ["tell me a joke"]
+
+
+def test_example_must_cover_its_words_and_most_of_the_phrase():
+    assert covers("скажи котру годину".split(), "котра година".split())
+    assert not covers("скільки тобі років".split(), "скільки годин".split())
+    assert not covers("what time does the shop close".split(), "what's the time".split())
+
+
+def test_near_miss_phrasings_are_classified_without_llm():
+    command_type, params = determine_command_type("скажи котру годину", "uk")
+    assert command_type == CommandType.TIME and "confidence" in params
+    assert determine_command_type("яке в нас сьогодні число", "uk")[0] == CommandType.DATE
+    # часткові гіпотези STT — лише шаблони
+    assert determine_command_type("скажи котру годину", "uk", use_classifier=False)[0] == CommandType.UNKNOWN
+    # класифікатор не вчиться на власних здогадках
+    assert history_label(command_type, params) is None
+    assert history_label(CommandType.TIME, {}) == CommandType.TIME
+
+
+@pytest.mark.parametrize("language, text", [
+    ("en", "stop"),
+    ("de", "stopp"),
+    ("uk", "зупинись"),
+    ("uk", "скільки тобі років"),
+    ("uk", "котрий зараз рік"),
+    ("en", "what year is it"),
+    ("en", "what time does the shop close"),
+])
+def test_similar_words_or_slotless_actions_go_to_llm(language, text):
+    assert determine_command_type(text, language) == (CommandType.UNKNOWN, None)
+
+
+def test_held_out_phrases_never_get_a_wrong_intent():
+    hits = 0
+    for language, text, expected in NEAR_MISS:
+        command_type, _ = determine_command_type(text, language)
+        assert command_type in (expected, CommandType.UNKNOWN), (language, text, command_type)
+        assert command_type == CommandType.UNKNOWN or command_type in CLASSIFIER_INTENTS
+        hits += command_type == expected != CommandType.UNKNOWN
+    assert hits >= 10
+
+
+def test_chit_chat_stays_unknown_as_typed_result():
+    reply = process_command_result("привіт як справи", "uk")
+    assert reply.intent == CommandType.UNKNOWN
+    assert process_command_result("котра година", "uk").intent == CommandType.TIME
+
+
+def test_precomputed_intent_is_not_classified_again(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("determine_command_type called twice in one turn")
+
+    intent = determine_command_type("котра година", "uk")
+    monkeypatch.setattr(command_router, "determine_command_type", fail)
+    assert process_command_result("котра година", "uk", intent=intent).intent == CommandType.TIME
+
+
+def test_history_examples_teach_new_phrasings():
+    base = [("котра година", CommandType.TIME), ("розкажи жарт", CommandType.JOKE)]
+    assert IntentClassifier(base).predict("ану насміши мене") is None
+    learned = IntentClassifier(base + [("насміши мене", CommandType.JOKE)])
+    assert learned.predict("ану насміши мене")[0] == CommandType.JOKE
+
+
+def test_added_example_is_learned_once():
+    classifier = IntentClassifier([("котра година", CommandType.TIME), ("розкажи жарт", CommandType.JOKE)])
+    assert classifier.predict("ану насміши мене") is None
+    assert classifier.add("Насміши мене!", CommandType.JOKE)
+    assert not classifier.add("насміши мене", CommandType.JOKE)
+    assert len(classifier) == 3
+    assert classifier.predict("ану насміши мене")[0] == CommandType.JOKE
+    assert classifier.predict("котра година")[0] == CommandType.TIME
+
+
+def test_new_labelled_history_updates_the_cached_classifier(monkeypatch):
+    import storage.database
+    from storage.database import Base
+    from storage import models  # noqa: F401  # реєструє таблиці
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(storage.database, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(command_router, "INTENT_CLASSIFIERS", {})
+
+    user_id = 4242
+    classifier = get_intent_classifier("uk", user_id)
+    assert classifier.predict("ану насміши мене") is None
+    record_history(user_id, "насміши мене", "Жарт", "uk", intent=CommandType.JOKE)
+    assert get_intent_classifier("uk", user_id) is classifier  # без перенавчання
+    assert classifier.predict("ану насміши мене")[0] == CommandType.JOKE
+    size = len(classifier)
+    record_history(user_id, "насміши мене", "Жарт", "uk", intent=CommandType.JOKE)
+    assert len(classifier) == size
+    # Після рестарту той самий приклад приходить з історії
+    monkeypatch.setattr(command_router, "INTENT_CLASSIFIERS", {})
+    assert get_intent_classifier("uk", user_id).predict("ану насміши мене")[0] == CommandType.JOKE
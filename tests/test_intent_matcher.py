@@ -0,0 +1,41 @@
+from core.command_router import determine_command_type
+from core.intent_matcher import IntentMatcher, required_literal
+from scripts.intent_corpus import GOLDEN, SHADOWED, legacy_determine_command_type
+
+
+def test_golden_corpus():
+    for language, text, intent, params in GOLDEN:
+        command_type, found = determine_command_type(text, language)
+        assert (command_type, found or {}) == (intent, params), (language, text)
+
+
+def test_identical_to_legacy_loop_except_shadowed():
+    for language, text, _, _ in GOLDEN:
+        legacy = legacy_determine_command_type(text, language)
+        if text in SHADOWED:
+            assert legacy != determine_command_type(text, language)
+        else:
+            assert legacy == determine_command_type(text, language), (language, text)
+
+
+def test_generic_patterns_do_not_shadow_specific_ones():
+    matcher = IntentMatcher({"music": ["грай (.+)"], "timer": ["таймер на (\\d+)"]}, generic=["грай (.+)"])
+    assert matcher.match("грай таймер на 5") == ("timer", {"action": "5"})
+    assert matcher.match("грай джаз") == ("music", {"action": "джаз"})
+    # пріоритет важить більше за позицію у фразі
+    matcher = IntentMatcher({"a": ["кінець"], "b": ["початок"]})
+    assert matcher.match("початок і кінець") == ("a", {})
+    assert required_literal("set (a )?timer for (\\d+)") == "timer for "
+    assert required_literal("(включи|грай) пісню (.+)") == " пісню "
+
+
+def test_optional_characters_are_not_required_literals():
+    assert required_literal("tell me (a )?jokes?") == "tell me "
+    assert required_literal("jokes?") == "joke"
+    assert required_literal("colou?r") == "colo"
+    assert required_literal("go+al") == "go"
+    assert required_literal("ha{0,3}ppy") == "ppy"
+    assert required_literal("gr[ae]y") == "gr"
+    matcher = IntentMatcher({"joke": ["jokes?"], "music": ["play (.+)"]}, generic=["play (.+)"])
+    assert matcher.match("play a joke") == ("joke", {})
+
@@ -0,0 +1,93 @@
+import numpy as np
+
+from core.keyword_spotter import (
+    KeywordSpotter,
+    MFCCExtractor,
+    dtw_distance,
+    templates_from_json,
+    templates_to_json,
+)
+
+RATE = 16000
+
+# Послідовності голосних (F1, F2, тривалість) — грубі «фрази»
+WAKE = [(700, 1200, 0.15), (300, 2300, 0.12), (500, 1800, 0.15), (400, 800, 0.2)]
+OTHER = [(500, 1500, 0.15), (650, 1000, 0.15), (300, 2200, 0.15), (450, 900, 0.2)]
+
+
+def _vowel(f0, f1, f2, seconds, rng):
+    t = np.arange(int(RATE * seconds)) / RATE
+    signal = np.zeros_like(t)
+    for k in range(1, 40):
+        freq = f0 * k
+        if freq > 7000:
+            break
+        gain = (np.exp(-((freq - f1) / 150) ** 2) + 0.7 * np.exp(-((freq - f2) / 250) ** 2)) / np.sqrt(k)
+        signal += gain * np.sin(2 * np.pi * freq * t + rng.uniform(0, 2 * np.pi))
+    return signal / np.abs(signal).max()
+
+
+def _phrase(sequence, seed, stretch=1.0, gain=5000.0):
+    rng = np.random.default_rng(seed)
+    parts = [np.zeros(int(0.2 * RATE))]
+    for f1, f2, seconds in sequence:
+        parts.append(gain * _vowel(130 * rng.uniform(0.95, 1.05), f1, f2, seconds * stretch * rng.uniform(0.9, 1.1), rng))
+    parts.append(np.zeros(int(0.2 * RATE)))
+    signal = np.concatenate(parts)
+    signal += rng.normal(0, 100, signal.size)
+    return np.clip(signal, -32768, 32767).astype("<i2").tobytes()
+
+
+def _enrolled() -> KeywordSpotter:
+    spotter = KeywordSpotter()
+    for seed, stretch in enumerate((0.9, 1.0, 1.15)):
+        spotter.enroll(_phrase(WAKE, seed, stretch))
+    return spotter
+
+
+def test_streaming_mfcc_matches_one_shot():
+    pcm = _phrase(WAKE, 0)
+    extractor = MFCCExtractor()
+    one_shot = extractor.compute(pcm)
+    streamed = np.concatenate([extractor.process(pcm[i:i + 2048]) for i in range(0, len(pcm), 2048)])
+    assert streamed.shape == one_shot.shape
+    assert np.allclose(streamed, one_shot, atol=1e-3)
+
+
+def test_dtw_tolerates_time_stretch():
+    extractor = MFCCExtractor()
+    a = extractor.compute(_phrase(WAKE, 1, stretch=0.85))
+    b = extractor.compute(_phrase(WAKE, 1, stretch=1.2))
+    c = extractor.compute(_phrase(OTHER, 1))
+    assert dtw_distance(a, a) == 0.0
+    assert dtw_distance(a, b) < dtw_distance(a, c)
+
+
+def test_spotter_accepts_wake_phrase_and_rejects_others():
+    spotter = _enrolled()
+    for seed in range(10, 13):
+        assert spotter.matches(_phrase(WAKE, seed, stretch=1.1, gain=3000))
+        assert not spotter.matches(_phrase(OTHER, seed))
+
+
+def test_templates_json_roundtrip():
+    spotter = _enrolled()
+    restored = templates_from_json(templates_to_json(spotter.templates))
+    assert len(restored) == 3
+    assert np.allclose(restored[0], spotter.templates[0], atol=1e-2)
+    assert templates_from_json(None) == []
+    assert templates_from_json("not json") == []
+
+
+def test_threshold_follows_new_samples_but_not_over_explicit_one():
+    spotter = KeywordSpotter()
+    spotter.enroll(_phrase(WAKE, 0, 1.0))
+    spotter.enroll(_phrase(WAKE, 1, 1.0))
+    narrow = spotter.threshold
+    spotter.enroll(_phrase(OTHER, 2))
+    assert spotter.threshold > narrow
+
+    fixed = KeywordSpotter(threshold=0.5)
+    fixed.enroll(_phrase(WAKE, 0))
+    fixed.enroll(_phrase(OTHER, 1))
+    assert fixed.threshold == 0.5
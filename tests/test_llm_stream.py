@@ -0,0 +1,71 @@
+import threading
+import time
+
+from core.llm_stream import StreamedReply, clauses, iter_tokens
+from core.metrics import metrics
+from core.speech_pipeline import SpeechPipeline
+
+
+class _Delta:
+    def __init__(self, content):
+        self.delta = type("Delta", (), {"content": content})()
+
+
+class _Chunk:
+    def __init__(self, content):
+        self.choices = [_Delta(content)]
+
+
+def test_first_clause_cut_at_comma_then_by_sentence():
+    tokens = ["Ну що ж, мій дорогий ", "друже, ", "зараз 3.5 ", "градуси. Одягайся, ", "бо змерзнеш. А", " взагалі все добре"]
+    assert list(clauses(tokens)) == [
+        "Ну що ж, мій дорогий друже,",
+        "зараз 3.5 градуси.",
+        "Одягайся, бо змерзнеш.",
+        "А взагалі все добре",
+    ]
+    assert list(clauses(["слово "] * 60, max_chars=50))[0].count("слово") <= 9
+
+
+def test_iter_tokens_skips_empty_deltas_and_closes_stream():
+    class Stream(list):
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    stream = Stream([_Chunk(None), _Chunk("При"), _Chunk("віт")])
+    assert "".join(iter_tokens(stream)) == "Привіт"
+    assert stream.closed
+
+
+def test_first_clause_plays_while_llm_still_generates():
+    metrics.reset()
+    release_rest = threading.Event()
+    played = []
+
+    def tokens():
+        yield "Перша частина відповіді, "
+        yield "ще трохи. "
+        release_rest.wait(2.0)  # модель «думає» далі
+        yield "Кінець."
+
+    reply = StreamedReply(tokens(), "uk")
+    pipeline = SpeechPipeline(synthesize=lambda text: text.encode(), play=lambda audio: played.append(audio.decode()))
+    worker = threading.Thread(target=lambda: pipeline.speak_stream(reply, on_first_audio=reply.mark_first_audio))
+    worker.start()
+
+    deadline = time.time() + 2.0
+    while not played and time.time() < deadline:
+        time.sleep(0.01)
+    assert played[:1] == ["Перша частина відповіді,"]
+    assert reply.finished_at is None  # звук пішов до кінця генерації
+    release_rest.set()
+    worker.join(2.0)
+    pipeline.shutdown()
+
+    assert played == ["Перша частина відповіді,", "ще трохи.", "Кінець."]
+    assert reply.text == "Перша частина відповіді, ще трохи. Кінець."
+    assert metrics.summary("llm_time_to_first_audio")["count"] == 1
+    assert metrics.summary("llm_completion_time")["count"] == 1
+    assert reply.first_audio_at < reply.finished_at
@@ -0,0 +1,45 @@
+import numpy as np
+
+from core import dsp
+from core.audio_decode import wrap_pcm
+from core.pcm_cache import PCMCache
+from core.playback import PlaybackEngine
+
+
+def test_put_returns_mapped_view_and_get_hits(tmp_path):
+    cache = PCMCache(tmp_path, max_bytes=1 << 20)
+    view = cache.put("k", 44100, 2, b"\x01\x02" * 100)
+    assert bytes(view) == b"\x01\x02" * 100
+    again = cache.get("k", 44100, 2)
+    assert bytes(again) == b"\x01\x02" * 100
+    assert cache.get("k", 48000, 2) is None  # інший формат пристрою — окремий запис
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["mapped"] == 1
+
+
+def test_budget_evicts_least_recently_used_even_while_mapped(tmp_path):
+    cache = PCMCache(tmp_path, max_bytes=250)
+    first = cache.put("a", 44100, 2, b"a" * 100)
+    cache.put("b", 44100, 2, b"b" * 100)
+    cache.put("c", 44100, 2, b"c" * 100)  # a витісняється, хоча view ще живий
+    assert not cache.contains("a", 44100, 2)
+    assert bytes(first[:3]) == b"aaa"
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 200
+
+
+def test_rendered_phrase_replays_without_conversion(tmp_path):
+    engine = PlaybackEngine()
+    engine.rate, engine.channels = 44100, 2
+    t = np.arange(24000) / 24000
+    wav = wrap_pcm(dsp.array_to_pcm16(8000 * np.sin(2 * np.pi * 440 * t)))
+    device_pcm = engine.render(wav)
+    assert abs(len(device_pcm) // 4 - 44100) < 64
+
+    cache = PCMCache(tmp_path, max_bytes=1 << 20)
+    cache.put("hello", engine.rate, engine.channels, device_pcm)
+    job = engine.play_device_pcm(cache.get("hello", 44100, 2), wait=False)
+    assert isinstance(job._blocks[0], memoryview)
+    played = bytearray()
+    while not job.done.is_set():
+        played += engine._callback(None, 1024, {}, 0)[0]
+    assert bytes(played[:len(device_pcm)]) == device_pcm
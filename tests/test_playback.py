@@ -0,0 +1,106 @@
+import threading
+
+import numpy as np
+
+from core import dsp
+from core.metrics import metrics
+from core.playback import PA_CONTINUE, PlaybackEngine
+
+
+def _engine(rate: int = 48000, channels: int = 2) -> PlaybackEngine:
+    engine = PlaybackEngine(frames_per_buffer=256)
+    engine.rate = rate
+    engine.channels = channels
+    return engine
+
+
+def _tone(rate: int, seconds: float) -> bytes:
+    t = np.arange(int(rate * seconds)) / rate
+    return dsp.array_to_pcm16(8000 * np.sin(2 * np.pi * 440 * t))
+
+
+def test_callback_outputs_silence_when_idle():
+    engine = _engine()
+    data, flag = engine._callback(None, 256, {}, 0)
+    assert flag == PA_CONTINUE
+    assert data == b"\x00" * 256 * 4
+
+
+def test_job_is_resampled_to_device_rate_and_completes_via_event():
+    engine = _engine()
+    job = engine.begin(24000, channels=1)
+    job.write(_tone(24000, 0.5))
+    job.finish()
+    assert not job.done.is_set()
+
+    played = bytearray()
+    while not job.done.is_set():
+        data, _ = engine._callback(None, 256, {}, 0)
+        played += data
+    assert abs(job.frames_played - 48000 * 0.5) < 256
+    left = dsp.pcm16_to_array(bytes(played))[0::2]
+    right = dsp.pcm16_to_array(bytes(played))[1::2]
+    assert np.array_equal(left, right)
+    assert not engine._jobs
+
+
+def test_streamed_blocks_play_in_order_and_report_start_latency():
+    metrics.reset()
+    engine = _engine(rate=16000, channels=1)
+    job = engine.begin(16000)
+    job.write(b"\x01\x00" * 100)
+    first, _ = engine._callback(None, 256, {}, 0)
+    assert first[:200] == b"\x01\x00" * 100 and first[200:] == b"\x00" * 312
+    job.write(b"\x02\x00" * 256)
+    second, _ = engine._callback(None, 256, {}, 0)
+    assert second == b"\x02\x00" * 256
+    job.finish()
+    engine._callback(None, 256, {}, 0)
+    assert job.done.is_set()
+    assert metrics.summary("playback_start_latency")["count"] == 1
+
+
+def test_wait_is_woken_by_callback_and_cancel_drops_queue():
+    engine = _engine()
+    job = engine.begin(48000, channels=2)
+    job.write(b"\x00\x01" * 48000)
+    job.finish()
+    woke = threading.Event()
+    waiter = threading.Thread(target=lambda: engine.wait(job) and woke.set())
+    waiter.start()
+    while not job.done.is_set():
+        engine._callback(None, 1024, {}, 0)
+    waiter.join(1.0)
+    assert woke.is_set()
+
+    other = engine.begin(48000)
+    other.write(_tone(48000, 1.0))
+    other.cancel()
+    assert other.done.is_set() and other.cancelled
+    data, _ = engine._callback(None, 256, {}, 0)
+    assert data == b"\x00" * 256 * 4
+
+
+def test_jitter_buffer_holds_stream_until_prebuffer_is_filled():
+    engine = _engine(rate=24000, channels=1)
+    job = engine.begin(24000, prebuffer_seconds=0.1)
+    job.write(b"\x01\x00" * 1000)
+    assert engine._callback(None, 256, {}, 0)[0] == b"\x00" * 512
+    job.write(b"\x01\x00" * 1400)
+    assert engine._callback(None, 256, {}, 0)[0] == b"\x01\x00" * 256
+    assert job.first_sample_at is not None
+
+
+def test_play_stream_realigns_chunks_and_keeps_source_errors():
+    engine = _engine(rate=24000, channels=1)
+
+    def chunks():
+        yield b"\x01"
+        yield b"\x00\x02\x00\x03"
+        raise ConnectionError("reset")
+
+    job = engine.play_stream(chunks(), 24000, prebuffer_seconds=0.0, wait=False)
+    assert isinstance(job.error, ConnectionError)
+    data, _ = engine._callback(None, 4, {}, 0)
+    assert data == b"\x01\x00\x02\x00" + b"\x00" * 4
+    assert job.done.is_set()
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from core.command_router import LLM_RACE_INTENTS, CommandType
+from core.race import RaceTask, race
+from core.spoken import Reply
+
+
+def test_fast_llm_beats_slow_router_and_router_is_not_awaited():
+    release = threading.Event()
+
+    def slow_router():
+        release.wait(2.0)
+        return Reply("📰 За запитом я знайшов...")
+
+    router = RaceTask("router", slow_router, valid=lambda reply: reply.ok)
+    llm = RaceTask("llm", lambda: "Коротка відповідь.")
+    start = time.perf_counter()
+    assert race([router, llm], timeout=2.0) is llm
+    assert time.perf_counter() - start < 1.0
+    release.set()
+
+
+def test_invalid_answer_waits_for_the_other_and_loser_is_cancelled():
+    cancelled = threading.Event()
+
+    def llm():
+        cancelled.wait(2.0)
+        return ""
+
+    router = RaceTask("router", lambda: Reply("В Києві 12 градусів, хмарно."), valid=lambda reply: reply.ok)
+    assert race([router, RaceTask("llm", llm, cancel=cancelled.set)]) is router
+    assert cancelled.is_set()
+
+    failed = RaceTask("router", lambda: Reply("❌ Місто 'Ххх' не знайдено"), valid=lambda reply: reply.ok)
+    broken = RaceTask("llm", lambda: 1 / 0)
+    assert race([failed, broken]) is None
+    assert failed.done and not failed.result.ok and isinstance(broken.error, ZeroDivisionError)
+
+
+def test_policies_never_race_music():
+    assert LLM_RACE_INTENTS["off"] == frozenset()
+    assert CommandType.WEATHER not in LLM_RACE_INTENTS["content"]
+    assert all(CommandType.SPOTIFY not in intents for intents in LLM_RACE_INTENTS.values())
@@ -0,0 +1,61 @@
+import threading
+
+from voice.speculative_stt import SpeculativeTranscriber
+
+
+class _FakeSTT:
+    """Двійник STT: запам'ятовує, що відправляли"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, wav: bytes) -> str:
+        self.calls.append(wav)
+        self.release.wait(timeout=2.0)
+        return f"text:{wav.decode()}"
+
+
+def test_speculation_used_when_pause_becomes_endpoint():
+    stt = _FakeSTT()
+    spec = SpeculativeTranscriber(stt)
+    spec.on_pause(lambda: b"kotra")
+    spec.on_pause(lambda: b"ignored")  # одна спекуляція на паузу
+    assert spec.finish(b"kotra+silence") == "text:kotra"
+    assert stt.calls == [b"kotra"]
+
+
+def test_speculation_discarded_when_speech_resumes():
+    stt = _FakeSTT()
+    stt.release.clear()
+    spec = SpeculativeTranscriber(stt)
+    spec.on_pause(lambda: b"part")
+    spec.on_speech()
+    assert not spec.pending and spec.cancelled == 1
+    stt.release.set()
+    assert spec.finish(b"full") == "text:full"
+    assert stt.calls[-1] == b"full"
+
+
+def test_speculation_failure_falls_back_to_full_clip():
+    calls = []
+
+    def flaky(wav: bytes) -> str:
+        calls.append(wav)
+        if wav == b"part":
+            raise RuntimeError("network")
+        return "ok"
+
+    spec = SpeculativeTranscriber(flaky)
+    spec.on_pause(lambda: b"part")
+    assert spec.finish(b"full") == "ok"
+    assert calls == [b"part", b"full"]
+
+
+def test_no_pause_means_plain_transcription():
+    stt = _FakeSTT()
+    spec = SpeculativeTranscriber(stt)
+    spec.on_speech()  # нічого скасовувати
+    assert spec.finish(b"full") == "text:full"
+    assert spec.started == 0 and spec.cancelled == 0
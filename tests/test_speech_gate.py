@@ -0,0 +1,56 @@
+import io
+import wave
+
+import numpy as np
+
+from core.cues import get_cue
+from voice.audio_encoding import pcm_to_wav
+from voice.speech_gate import SpeechGate, is_hallucination
+
+RATE = 16000
+
+
+def _voiced(seconds: float, f0: float = 140.0) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    signal = np.zeros_like(t)
+    for k in range(1, 30):
+        freq = f0 * k
+        signal += (np.exp(-((freq - 700) / 400) ** 2) + 0.6 * np.exp(-((freq - 1800) / 500) ** 2)) / k * np.sin(2 * np.pi * freq * t)
+    return 3000 * signal / np.abs(signal).max()
+
+
+def _wav(signal: np.ndarray) -> bytes:
+    return pcm_to_wav(np.clip(signal, -32768, 32767).astype("<i2").tobytes(), RATE)
+
+
+def test_gate_rejects_noise_only_clip():
+    noise = np.random.default_rng(0).normal(0, 200, RATE * 2)
+    gate = SpeechGate()
+    assert not gate.has_speech(_wav(noise))
+    assert gate.last_probability < 0.5
+
+
+def test_gate_accepts_clip_with_speech():
+    rng = np.random.default_rng(1)
+    signal = np.concatenate((rng.normal(0, 100, RATE), _voiced(0.6) + rng.normal(0, 100, int(RATE * 0.6)), rng.normal(0, 100, RATE)))
+    gate = SpeechGate()
+    assert gate.has_speech(_wav(signal))
+    assert gate.last_voiced_seconds > 0.3
+
+
+def test_hallucination_filter():
+    assert is_hallucination("")
+    assert is_hallucination(" ... ")
+    assert is_hallucination("Дякую за перегляд!")
+    assert is_hallucination("Thanks for watching.")
+    assert is_hallucination("Субтитри зроблені спільнотою Amara.org")
+    assert not is_hallucination("Котра година?")
+    assert not is_hallucination("Дякую")
+
+
+def test_cue_is_prerendered_stereo_wav():
+    cue = get_cue("not_heard")
+    assert get_cue("not_heard") is cue
+    with wave.open(io.BytesIO(cue)) as wf:
+        assert wf.getnchannels() == 2 and wf.getframerate() == 44100
+        assert 0.2 < wf.getnframes() / 44100 < 0.5
@@ -0,0 +1,50 @@
+import threading
+import time
+
+from core.speech_pipeline import SpeechPipeline, split_sentences
+
+
+def test_split_merges_short_and_cuts_long_sentences():
+    assert split_sentences("Так. Зараз 15.30, сонячно! Він сказав «добре.» Потім пішов… А ти?") == [
+        "Так. Зараз 15.30, сонячно!",
+        "Він сказав «добре.» Потім пішов… А ти?",
+    ]
+    long = ", ".join(["частина речення номер десять"] * 12) + "."
+    parts = split_sentences(long, max_chars=100)
+    assert len(parts) > 1 and all(len(p) <= 100 for p in parts)
+    assert " ".join(parts) == long
+    assert split_sentences("  ") == []
+
+
+def test_playback_is_in_order_and_starts_before_last_sentence_is_ready():
+    release_last = threading.Event()
+    played = []
+
+    def synthesize(text: str) -> bytes:
+        if text.startswith("Третє"):
+            release_last.wait(2.0)
+        elif text.startswith("Друге"):
+            time.sleep(0.05)
+        return text.encode()
+
+    def play(audio: bytes) -> None:
+        played.append(audio.decode())
+        if len(played) == 2:
+            release_last.set()  # третє ще синтезується, поки звучать перші
+
+    pipeline = SpeechPipeline(synthesize, play, max_workers=3)
+    text = "Перше речення відповіді. Друге речення відповіді. Третє речення відповіді."
+    assert pipeline.speak(text) == 3
+    assert played == split_sentences(text)
+
+
+def test_failed_sentence_is_skipped():
+    def synthesize(text: str) -> bytes:
+        if text.startswith("Друге"):
+            raise RuntimeError("TTS 500")
+        return text.encode()
+
+    played = []
+    pipeline = SpeechPipeline(synthesize, played.append, max_workers=2)
+    assert pipeline.speak("Перше речення відповіді. Друге речення відповіді. Третє речення відповіді.") == 2
+    assert [p.decode()[:5] for p in played] == ["Перше", "Третє"]
@@ -0,0 +1,36 @@
+from core.command_router import process_command, process_command_result
+from core.spoken import SPEECH_BUDGET, Reply, to_speech
+from integrations.weather import WeatherManager
+
+
+WEATHER = {"city": "Києві", "temp": 12, "feels_like": 10, "humidity": 80, "description": "хмарно", "wind_speed": 3}
+
+
+def test_to_speech_drops_emoji_bullets_and_newlines():
+    text = "📜 Останні команди:\n\n1. [10:00] котра година\n2. [10:05] яка погода\n"
+    assert to_speech(text, "uk") == "Останні команди: [10:00] котра година. [10:05] яка погода."
+    assert to_speech("⏸️ Пауза") == "Пауза."
+
+
+def test_to_speech_respects_budget_at_sentence_boundary():
+    text = "Перше речення тут. " * 30
+    spoken = to_speech(text, "uk")
+    assert len(spoken) <= SPEECH_BUDGET["uk"] and spoken.endswith(".")
+    assert to_speech(text, "uk", budget=0) == text.strip()
+    assert len(to_speech("слово " * 100, "en")) <= SPEECH_BUDGET["en"]
+
+
+def test_weather_speech_is_much_shorter_than_telegram_text():
+    text = WeatherManager.format_text(WEATHER, "uk")
+    speech = WeatherManager.format_speech(WEATHER, "uk")
+    assert speech == "В Києві 12 градусів, хмарно."
+    assert len(speech) * 3 < len(text) and "🌡" in text
+    assert WeatherManager.format_speech({**WEATHER, "temp": 22}, "uk").startswith("В Києві 22 градуси")
+    assert WeatherManager.format_speech({**WEATHER, "temp": -1}, "uk").startswith("В Києві -1 градус,")
+
+
+def test_router_returns_both_forms():
+    reply = process_command_result("нагадай через 5", "uk")
+    assert isinstance(reply, Reply)
+    assert reply.text.startswith("⏰") and reply.speech.startswith("Скажи")
+    assert process_command("котра година", "uk") == process_command_result("котра година", "uk").text
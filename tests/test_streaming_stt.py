@@ -0,0 +1,69 @@
+import io
+import threading
+import wave
+
+from core.command_router import CommandType
+from voice.streaming_stt import ScriptedSTT, StreamingRecognizer, WhisperWindowSTT, pcm_to_wav
+
+CHUNK = b"\x00\x00" * 1600  # 0.1 с при 16 кГц
+
+
+def _feed(recognizer: StreamingRecognizer, seconds: float) -> int:
+    """Годує тишею; повертає номер чанка, на якому спрацював ранній інтент (або -1)"""
+    for i in range(int(round(seconds / 0.1))):
+        if recognizer.feed(CHUNK):
+            return i
+    return -1
+
+
+def test_early_intent_fires_on_partial():
+    engine = ScriptedSTT([(0.5, "привіт"), (1.0, "привіт бот котра"), (1.4, "привіт бот котра година")])
+    recognizer = StreamingRecognizer(engine, language="uk")
+    stopped_at = _feed(recognizer, 3.0)
+    assert stopped_at == 13  # 1.4 с, а не кінець запису
+    assert recognizer.early_intent == CommandType.TIME
+    assert recognizer.early_text == "привіт бот котра година"
+
+
+def test_non_deterministic_intents_wait_for_final():
+    engine = ScriptedSTT([(0.5, "включи"), (1.0, "включи пісню океан ельзи")], final="включи пісню океан ельзи")
+    recognizer = StreamingRecognizer(engine, language="uk")
+    assert _feed(recognizer, 2.0) == -1
+    assert recognizer.early_intent is None
+    assert engine.finish() == "включи пісню океан ельзи"
+
+
+def test_whisper_window_requests_partials_in_background():
+    seen = []
+    release = threading.Event()
+
+    def transcribe(wav: bytes) -> str:
+        with wave.open(io.BytesIO(wav)) as wf:
+            seconds = wf.getnframes() / wf.getframerate()
+        seen.append(seconds)
+        release.wait(timeout=2.0)
+        return "котра година" if seconds >= 0.8 else "котра"
+
+    engine = WhisperWindowSTT(transcribe, interval=0.4, max_partial_seconds=1.0)
+    recognizer = StreamingRecognizer(engine, language="uk")
+    for _ in range(4):
+        assert not recognizer.feed(CHUNK)
+    # Один запит у польоті — нові не ставляться в чергу, поки він не завершився
+    for _ in range(5):
+        recognizer.feed(CHUNK)
+    assert engine.requests == 1
+    release.set()
+    fired = False
+    for _ in range(50):
+        if recognizer.feed(b""):
+            fired = True
+            break
+        threading.Event().wait(0.02)
+    assert fired and recognizer.early_intent == CommandType.TIME
+    assert all(seconds <= 1.0 for seconds in seen)
+
+
+def test_pcm_to_wav_roundtrip():
+    with wave.open(io.BytesIO(pcm_to_wav(CHUNK))) as wf:
+        assert wf.getframerate() == 16000
+        assert wf.readframes(wf.getnframes()) == CHUNK
@@ -0,0 +1,44 @@
+import io
+
+from voice import stt_engine
+from voice.stt import transcribe_audio
+from voice.stt_engine import FakeSTTEngine, LocalWhisperSTTEngine, OpenAISTTEngine, get_stt_engine
+
+
+def test_fake_engine_is_deterministic():
+    engine = FakeSTTEngine(["котра година", "дякую"])
+    assert engine.transcribe(b"a") == "котра година"
+    assert engine.transcribe(b"b", language="en", filename="audio.flac") == "дякую"
+    assert engine.transcribe(b"c") == "дякую"
+    assert engine.calls[1] == (b"b", "en", "audio.flac")
+
+
+def test_transcribe_audio_delegates_to_engine(tmp_path):
+    engine = FakeSTTEngine(["ok"])
+    assert transcribe_audio(1, b"wav", language="de", filename="audio.ogg", engine=engine) == "ok"
+    assert engine.calls[-1] == (b"wav", "de", "audio.ogg")
+
+    # Шлях і відкритий файл читаються в bytes, ім'я файлу зберігається
+    path = tmp_path / "cmd.flac"
+    path.write_bytes(b"flac")
+    transcribe_audio(1, str(path), engine=engine)
+    assert engine.calls[-1][0] == b"flac" and engine.calls[-1][2] == "cmd.flac"
+    transcribe_audio(1, io.BytesIO(b"raw"), engine=engine)
+    assert engine.calls[-1] == (b"raw", "uk", "audio.wav")
+
+
+def test_engine_selection_and_fallback(monkeypatch):
+    assert isinstance(get_stt_engine("fake", 1), FakeSTTEngine)
+    assert isinstance(get_stt_engine("openai", 1), OpenAISTTEngine)
+    assert isinstance(get_stt_engine("unknown", 1), OpenAISTTEngine)
+
+    monkeypatch.setattr(stt_engine, "FASTER_WHISPER_AVAILABLE", False)
+    assert isinstance(get_stt_engine("local", 1), OpenAISTTEngine)
+    monkeypatch.setattr(stt_engine, "FASTER_WHISPER_AVAILABLE", True)
+    engine = get_stt_engine("LOCAL", 1)
+    assert isinstance(engine, LocalWhisperSTTEngine) and not engine.remote
+
+
+def test_users_cannot_pick_the_test_double():
+    assert "fake" not in stt_engine.USER_STT_ENGINES
+    assert set(stt_engine.USER_STT_ENGINES) - {"auto"} <= set(stt_engine.STT_ENGINES)
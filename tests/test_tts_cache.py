@@ -0,0 +1,56 @@
+import os
+
+from core.phrases import speaker_phrases, telegram_phrases
+from core.tts_cache import TTSCache, cache_key
+
+
+def test_key_depends_on_all_parameters_and_ignores_whitespace():
+    base = cache_key("⏸️ Пауза", "onyx", "uk", "tts-1", "pcm")
+    assert cache_key("  ⏸️   Пауза ", "onyx", "uk", "tts-1", "pcm") == base
+    assert cache_key("⏸️ Пауза", "alloy", "uk", "tts-1", "pcm") != base
+    assert cache_key("⏸️ Пауза", "onyx", "uk", "tts-1", "mp3") != base
+
+
+def test_get_or_create_synthesizes_once_and_counts_hits(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=1024)
+    calls = []
+
+    def synthesize():
+        calls.append(1)
+        return b"audio"
+
+    key = cache_key("Привіт", "onyx", "uk", "tts-1", "mp3")
+    assert cache.get_or_create(key, "mp3", synthesize) == b"audio"
+    assert cache.get_or_create(key, "mp3", synthesize) == b"audio"
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["entries"] == 1
+
+
+def test_lru_eviction_is_size_bounded_and_survives_restart(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=300)
+    for name in ("a", "b", "c"):
+        cache.put(name, "pcm", b"x" * 100)
+    assert cache.get("a", "pcm") is not None  # a — найсвіжіший
+    os.utime(tmp_path / "b.pcm", (1, 1))
+    os.utime(tmp_path / "c.pcm", (2, 2))
+
+    reopened = TTSCache(tmp_path, max_bytes=300)
+    reopened.put("d", "pcm", b"x" * 100)
+    assert not reopened.contains("b", "pcm")
+    assert reopened.contains("a", "pcm") and reopened.contains("c", "pcm")
+    assert reopened.stats()["evictions"] == 1 and reopened.stats()["bytes"] == 300
+    assert not (tmp_path / "b.pcm").exists()
+
+
+def test_disabled_cache_always_synthesizes(tmp_path):
+    cache = TTSCache(tmp_path, max_bytes=0)
+    assert cache.get_or_create("k", "mp3", lambda: b"1") == b"1"
+    assert cache.get_or_create("k", "mp3", lambda: b"2") == b"2"
+    assert not any(tmp_path.iterdir())
+
+
+def test_static_phrase_sets():
+    assert "Пауза." in speaker_phrases("uk")  # у формі для озвучки
+    assert "Timer für 5 Minuten ist abgelaufen!" in telegram_phrases("de")
+    assert telegram_phrases("fr")[0] == "Music stopped. I'm listening!"
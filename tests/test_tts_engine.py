@@ -0,0 +1,76 @@
+import shutil
+
+import pytest
+
+from core import tts
+from core.audio_decode import TTS_PCM_RATE, decode_audio
+from core.tts_cache import TTSCache
+from core.tts_engine import FakeTTSEngine, LocalTTSEngine, TTSRouter, get_tts_engine
+
+
+def test_fake_engine_records_calls_and_returns_wav():
+    engine = FakeTTSEngine()
+    pcm, rate, channels = decode_audio(engine.synthesize("привіт", "uk", "onyx", "pcm"))
+    assert rate == TTS_PCM_RATE and channels == 1 and len(pcm) > 0
+    assert engine.calls == [("привіт", "uk", "onyx", "pcm")]
+    assert b"".join(engine.stream("привіт")) == pcm
+
+
+def test_get_tts_engine_by_name():
+    assert get_tts_engine("fake", 1).name == "fake"
+    assert get_tts_engine("openai", 1).name == "openai"
+    assert get_tts_engine("nonsense", 1).name == "openai"
+
+
+def test_router_sends_system_phrases_to_their_engine():
+    cloud, local = FakeTTSEngine(remote=True), FakeTTSEngine()
+    local.formats = ("pcm",)
+    router = TTSRouter(cloud, system=local)
+    assert router.engine_for("system", "pcm") is local
+    assert router.engine_for("reply", "pcm") is cloud
+    assert router.engine_for("system", "mp3") is cloud  # локальний не вміє mp3
+
+
+def test_slow_cloud_falls_back_and_backs_off():
+    cloud, local = FakeTTSEngine(delay=0.5, remote=True), FakeTTSEngine()
+    router = TTSRouter(cloud, fallback=local, timeout=0.05, backoff=60)
+    _, used = router.synthesize("відповідь")
+    assert used is local
+    _, used = router.synthesize("ще одна")
+    assert used is local and len(cloud.calls) == 1  # хмару не смикаємо під час backoff
+
+
+def test_long_but_healthy_cloud_synthesis_is_not_replaced():
+    cloud, local = FakeTTSEngine(transfer=0.2, remote=True), FakeTTSEngine()
+    router = TTSRouter(cloud, fallback=local, timeout=0.05)
+    _, used = router.synthesize("довга відповідь, яка синтезується довше за таймаут")
+    assert used is cloud and not local.calls
+
+
+def test_stream_falls_back_before_first_chunk():
+    cloud, local = FakeTTSEngine(error=RuntimeError("offline"), remote=True), FakeTTSEngine()
+    router = TTSRouter(cloud, fallback=local, timeout=1.0)
+    used, chunks = router.open_stream("відповідь")
+    assert used is local and b"".join(chunks)
+
+
+def test_fallback_audio_is_not_cached_under_cloud_key(tmp_path, monkeypatch):
+    cloud, local = FakeTTSEngine(error=RuntimeError("offline"), remote=True), FakeTTSEngine()
+    cloud.model = "cloud"
+    router = TTSRouter(cloud, fallback=local, timeout=1.0)
+    cache = TTSCache(tmp_path, max_bytes=1 << 20)
+    monkeypatch.setattr(tts, "get_tts_router", lambda user_id: router)
+    monkeypatch.setattr(tts, "tts_cache", cache)
+
+    assert tts.text_to_speech(1, "привіт", response_format="pcm")
+    assert cache.stats()["entries"] == 0
+
+    router.fallback, router.primary = None, local
+    tts.text_to_speech(1, "привіт", response_format="pcm")
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.skipif(shutil.which("espeak-ng") is None, reason="espeak-ng не встановлено")
+def test_local_espeak_engine():
+    pcm, rate, _ = decode_audio(LocalTTSEngine(model_path="").synthesize("test", "en"))
+    assert rate > 0 and len(pcm) > 0
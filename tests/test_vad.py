@@ -0,0 +1,65 @@
+import numpy as np
+
+from core.vad import SpectralVAD
+
+RATE = 16000
+CHUNK = 1024
+
+
+def _chunks(signal: np.ndarray):
+    pcm = np.clip(signal, -32768, 32767).astype("<i2").tobytes()
+    step = CHUNK * 2
+    return [pcm[i:i + step] for i in range(0, len(pcm) - step + 1, step)]
+
+
+def _noise(seconds: float, level: float = 150.0, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(0, level, int(RATE * seconds))
+
+
+def _voiced(seconds: float, f0: float = 140.0, amplitude: float = 3000.0) -> np.ndarray:
+    """Гармонічний сигнал з формантною огинаючою — грубе наближення голосної"""
+    t = np.arange(int(RATE * seconds)) / RATE
+    signal = np.zeros_like(t)
+    for k in range(1, 30):
+        freq = f0 * k
+        # Форманти F1/F2 і спад спектра ~1/k, як у голосового джерела
+        gain = (np.exp(-((freq - 700) / 400) ** 2) + 0.6 * np.exp(-((freq - 1800) / 500) ** 2)) / k
+        signal += gain * np.sin(2 * np.pi * freq * t)
+    return amplitude * signal / np.abs(signal).max()
+
+
+def _primed_vad() -> SpectralVAD:
+    vad = SpectralVAD(RATE, sensitivity=0.8)
+    for data in _chunks(_noise(0.5, seed=1)):
+        vad.prime(data)
+    return vad
+
+
+def test_vad_ignores_background_noise():
+    vad = _primed_vad()
+    assert not any(vad.is_speech(data) for data in _chunks(_noise(2.0, seed=2)))
+    assert vad.noise_rms > 0
+
+
+def test_vad_detects_voiced_speech():
+    vad = _primed_vad()
+    signal = _voiced(0.6) + _noise(0.6, seed=3)
+    decisions = [vad.is_speech(data) for data in _chunks(signal)]
+    assert sum(decisions) >= len(decisions) - 1
+
+
+def test_vad_rejects_door_slam():
+    vad = _primed_vad()
+    rng = np.random.default_rng(4)
+    # Широкосмуговий удар із затуханням — гучно, але спектр плаский
+    slam = rng.normal(0, 12000, int(RATE * 0.3)) * np.exp(-np.arange(int(RATE * 0.3)) / 1500)
+    signal = np.concatenate((slam, _noise(0.3, seed=5)))
+    assert not any(vad.is_speech(data) for data in _chunks(signal))
+
+
+def test_vad_adapts_to_steady_loud_noise():
+    vad = _primed_vad()
+    loud = _noise(3.0, level=1500.0, seed=6)
+    decisions = [vad.is_speech(data) for data in _chunks(loud)]
+    assert not any(decisions[-10:])
+    assert vad.noise_rms > 1000
@@ -1,4 +1,117 @@
+import threading
+
 import pytest
 
+from core.audio_buffer import AudioRingBuffer
+
+
 def test_voice_placeholder():
     assert True
+
+
+def test_ring_buffer_independent_readers():
+    ring = AudioRingBuffer(capacity_chunks=4)
+    for i in range(3):
+        ring.append(bytes([i]))
+
+    # Кожен читач має власний курсор і бачить усі чанки
+    assert ring.read(0) == (0, b"\x00")
+    assert ring.read(0) == (0, b"\x00")
+    assert ring.read(2) == (2, b"\x02")
+
+
+def test_ring_buffer_overrun_skips_to_oldest():
+    ring = AudioRingBuffer(capacity_chunks=3)
+    for i in range(5):
+        ring.append(bytes([i]))
+
+    assert ring.oldest_seq == 2
+    assert ring.read(0) == (2, b"\x02")
+    assert ring.snapshot(10) == [b"\x02", b"\x03", b"\x04"]
+
+
+def test_ring_buffer_read_waits_for_writer():
+    ring = AudioRingBuffer(capacity_chunks=2)
+    assert ring.read(0, timeout=0.01) is None
+
+    timer = threading.Timer(0.05, ring.append, args=(b"x",))
+    timer.start()
+    assert ring.read(0, timeout=2.0) == (0, b"x")
+
+
+def test_ring_buffer_close_wakes_readers():
+    ring = AudioRingBuffer(capacity_chunks=2)
+    threading.Timer(0.05, ring.close).start()
+    assert ring.read(0, timeout=2.0) is None
+
+
+class _FakePyAudio:
+    """Мінімальний двійник PyAudio для перевірки реєстру пристроїв"""
+
+    def __init__(self, devices, supported_rates):
+        self._devices = devices
+        self._rates = supported_rates
+        self.format_checks = 0
+
+    def get_device_count(self):
+        return len(self._devices)
+
+    def get_device_info_by_index(self, index):
+        return self._devices[index]
+
+    def is_format_supported(self, rate, **kwargs):
+        self.format_checks += 1
+        if rate not in self._rates:
+            raise ValueError("Invalid sample rate")
+        return True
+
+
+def _usb_devices():
+    return [
+        {"name": "bcm2835 Headphones: - (hw:0,0)", "maxInputChannels": 0, "maxOutputChannels": 2, "defaultSampleRate": 44100.0},
+        {"name": "USB PnP Sound Device: Audio (hw:2,0)", "maxInputChannels": 1, "maxOutputChannels": 0, "defaultSampleRate": 44100.0},
+    ]
+
+
+def test_device_registry_probes_once_and_caches(tmp_path):
+    from core.audio_devices import AudioDeviceRegistry
+
+    cards = tmp_path / "cards"
+    cards.write_text(" 0 [Headphones]\n 2 [Device]\n")
+    cache = tmp_path / "devices.json"
+
+    pa = _FakePyAudio(_usb_devices(), {16000, 44100, 48000})
+    registry = AudioDeviceRegistry(cache_path=str(cache), cards_path=str(cards))
+    assert registry.refresh(pa) is True
+    assert registry.select_input() == (1, 44100)
+    assert cache.exists()
+
+    # Новий процес з тим самим набором карт — жодного пробування
+    pa_again = _FakePyAudio(_usb_devices(), {16000, 44100, 48000})
+    reloaded = AudioDeviceRegistry(cache_path=str(cache), cards_path=str(cards))
+    assert reloaded.refresh(pa_again) is False
+    assert pa_again.format_checks == 0
+    assert reloaded.select_input() == (1, 44100)
+    assert reloaded.has_changed() is False
+
+    # Hot-plug: набір карт змінився — перепробовуємо
+    cards.write_text(" 0 [Headphones]\n")
+    assert reloaded.has_changed() is True
+    assert reloaded.refresh(_FakePyAudio(_usb_devices()[:1], {44100})) is True
+    assert reloaded.select_input() is None
+
+
+def test_device_registry_respects_mic_alsa_hw(tmp_path, monkeypatch):
+    from core.audio_devices import AudioDeviceRegistry
+
+    devices = _usb_devices() + [
+        {"name": "seeed-2mic-voicecard: wm8960-hifi (hw:3,0)", "maxInputChannels": 2, "maxOutputChannels": 2, "defaultSampleRate": 48000.0},
+    ]
+    registry = AudioDeviceRegistry(cache_path=str(tmp_path / "c.json"), cards_path=str(tmp_path / "missing"))
+    registry.refresh(_FakePyAudio(devices, {16000, 48000}))
+
+    # Без підказки USB-мікрофон має пріоритет (ReSpeaker — для відтворення)
+    assert registry.select_input() == (1, 16000)
+    monkeypatch.setenv("MIC_ALSA_HW", "3,0")
+    assert registry.select_input() == (2, 48000)
+    assert registry.find_output("hw:3,0").index == 2
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pyaudio")  # core.wake_word тягне сервіс захоплення
+
+from core.vad import SpectralVAD
+from core.wake_word import WakeWordDetector, WakeWordMode
+
+
+@pytest.mark.parametrize("mode", [WakeWordMode.SPECTRAL, WakeWordMode.KEYWORD])
+def test_noise_rms_comes_from_spectral_vad(mode):
+    detector = WakeWordDetector.__new__(WakeWordDetector)  # без мікрофона
+    detector.mode = mode
+    detector.noise_level = None
+    detector.spectral_vad = SpectralVAD(16000)
+    noise = np.random.default_rng(0).normal(0, 300, 1024).astype(np.int16).tobytes()
+    detector.spectral_vad.prime(noise)
+    assert detector.spectral_vad.noise_rms > 0
+    assert detector.noise_rms == detector.spectral_vad.noise_rms
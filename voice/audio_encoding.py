@@ -0,0 +1,127 @@
+"""
+Підготовка запису до відправки в STT.
+
+Сирий WAV з record_until_silence містить тишу до мови і весь hangover
+endpointer'а, а 16-бітний PCM — найдорожчий формат для Wi-Fi на Pi. Тут:
+
+1. тиша з обох кінців обрізається за рішенням VAD (поріг мови від рівня шуму);
+2. запис кодується у компактний формат, який приймає Whisper
+   (FLAC без втрат або Ogg/Opus), з фолбеком на WAV.
+"""
+
+from __future__ import annotations
+
+import wave
+from io import BytesIO
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core import dsp
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):  # OSError — немає libsndfile
+    SOUNDFILE_AVAILABLE = False
+
+
+BLOCK_SECONDS = 0.02
+
+
+def wav_to_pcm(wav_bytes: bytes) -> Tuple[bytes, int]:
+    """WAV → (PCM16 mono, частота)"""
+    with wave.open(BytesIO(wav_bytes), "rb") as wf:
+        return wf.readframes(wf.getnframes()), wf.getframerate()
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """PCM16 mono → WAV"""
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def trim_silence(
+    pcm: bytes,
+    sample_rate: int,
+    threshold: float,
+    head_pad: float = 0.15,
+    tail_pad: float = 0.25,
+) -> bytes:
+    """
+    Обрізає не-мову на початку і в кінці запису
+
+    Args:
+        pcm: PCM16 mono
+        threshold: Поріг мови (RMS блоку 20 мс), той самий, що в endpointer
+        head_pad / tail_pad: Запас навколо мови, щоб не зрізати приголосні
+
+    Returns:
+        Обрізаний PCM (оригінал, якщо мови не знайдено)
+    """
+    block = max(1, int(sample_rate * BLOCK_SECONDS))
+    levels = dsp.block_rms(pcm, block)
+    voiced = np.flatnonzero(levels >= threshold)
+    if voiced.size == 0:
+        return pcm
+    start = max(0, voiced[0] * block - int(head_pad * sample_rate))
+    end = min(len(pcm) // 2, (voiced[-1] + 1) * block + int(tail_pad * sample_rate))
+    return pcm[start * 2:end * 2]
+
+
+def encode_pcm(pcm: bytes, sample_rate: int, audio_format: str = "flac") -> Tuple[bytes, str]:
+    """
+    Кодує PCM у формат для завантаження
+
+    Returns:
+        (bytes, ім'я файлу) — розширення підказує API формат
+    """
+    audio_format = audio_format.lower()
+    if audio_format in ("flac", "opus") and SOUNDFILE_AVAILABLE:
+        try:
+            samples = dsp.pcm16_to_array(pcm)
+            buffer = BytesIO()
+            if audio_format == "flac":
+                sf.write(buffer, samples, sample_rate, format="FLAC", subtype="PCM_16")
+                return buffer.getvalue(), "audio.flac"
+            sf.write(buffer, samples, sample_rate, format="OGG", subtype="OPUS")
+            return buffer.getvalue(), "audio.ogg"
+        except Exception as e:
+            print(f"⚠️  Кодування {audio_format} не вдалося, відправляю WAV: {e}")
+    elif audio_format != "wav":
+        print(f"⚠️  soundfile недоступний — {audio_format} неможливий, відправляю WAV")
+    return pcm_to_wav(pcm, sample_rate), "audio.wav"
+
+
+def prepare_for_upload(
+    wav_bytes: bytes,
+    threshold: Optional[float] = None,
+    audio_format: str = "flac",
+) -> Tuple[bytes, str]:
+    """
+    WAV із запису → обрізаний і стиснутий файл для STT
+
+    Args:
+        wav_bytes: WAV mono 16 біт (вихід record_until_silence)
+        threshold: Поріг мови; None — без обрізання
+        audio_format: flac | opus | wav
+
+    Returns:
+        (bytes, ім'я файлу)
+    """
+    pcm, sample_rate = wav_to_pcm(wav_bytes)
+    trimmed = trim_silence(pcm, sample_rate, threshold) if threshold else pcm
+    data, filename = encode_pcm(trimmed, sample_rate, audio_format)
+
+    trimmed_seconds = (len(pcm) - len(trimmed)) / 2 / sample_rate
+    saving = 100.0 * (1 - len(data) / len(wav_bytes)) if wav_bytes else 0.0
+    print(
+        f"📦 Аудіо для STT: {len(wav_bytes) // 1024} KB WAV → {len(data) // 1024} KB "
+        f"{filename.rsplit('.', 1)[-1].upper()} (−{saving:.0f}%, обрізано {trimmed_seconds:.1f}s тиші)"
+    )
+    return data, filename
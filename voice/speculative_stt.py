@@ -0,0 +1,93 @@
+"""
+Спекулятивне розпізнавання мови.
+
+Поки endpointer вичікує тишу в кінці фрази, мережа простоює. Тут запис,
+зроблений до початку паузи, одразу відправляється в STT у фоні:
+
+- пауза дійшла до кінця репліки → використовуємо вже готовий (або майже
+  готовий) транскрипт;
+- мова продовжилась → спекулятивний результат відкидаємо, а в кінці
+  відправляємо повний запис.
+
+Для коротких команд («котра година») це ховає більшу частину STT-запиту
+всередині hangover endpointer'а.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from core.metrics import metrics
+
+
+# Спільний пул: максимум один спекулятивний і один повний запит одночасно
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stt-speculative")
+
+
+class SpeculativeTranscriber:
+    """Запускає STT на першій паузі і віддає результат, якщо пауза стала кінцем"""
+
+    def __init__(self, transcribe: Callable[[bytes], str], pause_seconds: float = 0.25):
+        """
+        Args:
+            transcribe: Функція WAV bytes → текст (наприклад, обгортка transcribe_audio)
+            pause_seconds: Тиша після мови, з якої стартує спекуляція
+        """
+        self.transcribe = transcribe
+        self.pause_seconds = pause_seconds
+        self._future: Optional[Future] = None
+        self.started = 0    # скільки спекулятивних запитів відправлено
+        self.cancelled = 0  # скільки з них відкинуто через продовження мови
+
+    @property
+    def pending(self) -> bool:
+        """Є актуальна спекуляція (після неї мова не продовжувалась)"""
+        return self._future is not None
+
+    def on_pause(self, audio_wav: Callable[[], bytes]) -> None:
+        """
+        Пауза досягла pause_seconds — відправляємо запис до цього моменту
+
+        Args:
+            audio_wav: Ледачий конструктор WAV (викликається лише якщо запит справді стартує)
+        """
+        if self._future is not None:
+            return
+        self.started += 1
+        print("🏎️  Спекулятивне STT: пауза — відправляю запис наперед")
+        self._future = _executor.submit(self.transcribe, audio_wav())
+
+    def on_speech(self) -> None:
+        """Мова продовжилась — спекулятивний результат більше не актуальний"""
+        if self._future is None:
+            return
+        # Запит, що вже виконується, не перервати — просто ігноруємо його результат
+        self._future.cancel()
+        self._future = None
+        self.cancelled += 1
+        print("↩️  Спекулятивне STT скасовано: мова продовжилась")
+
+    def finish(self, audio_wav: bytes) -> str:
+        """
+        Транскрипт повної репліки
+
+        Використовує спекулятивний результат, якщо він актуальний, інакше
+        (або якщо спекуляція впала) — розпізнає повний запис.
+        """
+        wait_start = time.perf_counter()
+        future, self._future = self._future, None
+        text: Optional[str] = None
+        if future is not None:
+            try:
+                text = future.result()
+                print("✅ Спекулятивне STT використано")
+            except Exception as e:
+                print(f"⚠️  Спекулятивне STT не вдалося, розпізнаю повний запис: {e}")
+        if text is None:
+            text = self.transcribe(audio_wav)
+        # Скільки STT лишилось видимим для користувача після кінця запису
+        metrics.observe("stt_visible_latency", time.perf_counter() - wait_start)
+        print(f"  ⏱️ {metrics.format('stt_visible_latency')}")
+        return text
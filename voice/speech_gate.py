@@ -0,0 +1,88 @@
+"""
+Фільтр «порожніх» ходів між записом і STT.
+
+Якщо в записі немає мови (спрацював тригер, а команди не було), немає сенсу
+відправляти його у Whisper, а потім ще й синтезувати «я не почув» через TTS.
+Тут:
+
+- оцінюється ймовірність мови в кліпі (спектральний VAD по всьому запису);
+- відкидаються типові галюцинації Whisper на тиші/шумі
+  («Дякую за перегляд!», «Thanks for watching» тощо).
+
+Пропущений хід озвучується локальним сигналом (core/cues.py) і рахується в метриках.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+
+from core.vad import SpectralVAD
+from voice.audio_encoding import wav_to_pcm
+
+
+# Фрази, які Whisper «чує» в тиші — навчався на субтитрах відео.
+# Порівнюються після нормалізації (нижній регістр, без пунктуації).
+# Коротке «дякую»/«thank you» сюди не входить: користувач може сказати це боту,
+# а тишу вже відсіює оцінка ймовірності мови.
+HALLUCINATIONS = frozenset({
+    # uk
+    "дякую за перегляд", "дякуємо за перегляд", "продовження слідує",
+    "підписуйтесь на канал", "ставте лайки",
+    # en
+    "thank you for watching", "thanks for watching", "you", "please subscribe",
+    # de
+    "vielen dank fürs zuschauen", "bis zum nächsten mal",
+})
+
+_PREFIXES = ("субтитри", "subtitles by", "untertitel")
+_PUNCT_RE = re.compile(r"[^\w\s]+", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_transcript(text: str) -> str:
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub("", text.lower())).strip()
+
+
+def is_hallucination(text: str) -> bool:
+    """Порожній транскрипт, одна пунктуація або відома галюцинація Whisper"""
+    normalized = normalize_transcript(text or "")
+    if len(normalized) < 2:
+        return True
+    return normalized in HALLUCINATIONS or normalized.startswith(_PREFIXES)
+
+
+class SpeechGate:
+    """Ймовірність мови в записі + фільтр галюцинацій"""
+
+    def __init__(self, threshold: float = 0.5, tau: float = 0.2, sensitivity: float = 0.6):
+        """
+        Args:
+            threshold: Мінімальна ймовірність мови для відправки в STT
+            tau: Масштаб (с) — скільки мовних кадрів дають p≈0.63
+            sensitivity: Чутливість спектрального VAD
+        """
+        self.threshold = threshold
+        self.tau = tau
+        self.sensitivity = sensitivity
+        self.last_probability = 0.0
+        self.last_voiced_seconds = 0.0
+
+    def speech_probability(self, wav_bytes: bytes) -> float:
+        """
+        p = 1 − exp(−T/τ), де T — сумарна тривалість мовних кадрів
+
+        Шум оцінюється з найтихіших кадрів самого запису, тож оцінка не
+        залежить від того, чи був у кліпі фрагмент чистої тиші.
+        """
+        pcm, rate = wav_to_pcm(wav_bytes)
+        vad = SpectralVAD(rate, sensitivity=self.sensitivity)
+        vad.prime_from_quietest(pcm)
+        decisions = vad.process(pcm)
+        voiced = float(decisions.sum()) * vad.frame_size / rate
+        self.last_voiced_seconds = voiced
+        self.last_probability = 1.0 - math.exp(-voiced / self.tau)
+        return self.last_probability
+
+    def has_speech(self, wav_bytes: bytes) -> bool:
+        return self.speech_probability(wav_bytes) >= self.threshold
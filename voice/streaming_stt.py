@@ -0,0 +1,189 @@
+"""
+Інкрементальне розпізнавання мови з частковими гіпотезами.
+
+Рушій отримує PCM 16 кГц по чанках прямо під час запису і віддає часткові
+транскрипти. StreamingRecognizer проганяє кожну часткову гіпотезу через
+command_router.determine_command_type: детерміновані інтенти (час, дата)
+спрацьовують ще до того, як людина замовкне — запис зупиняється, і відповідь
+не чекає ні кінця тиші, ні фінального STT.
+
+Рушії:
+- WhisperWindowSTT — Whisper API не стрімить, тому накопичений запис
+  періодично перерозпізнається у фоні (лише для коротких фраз);
+- ScriptedSTT — локальний двійник із заданим сценарієм гіпотез (тести, офлайн).
+"""
+
+from __future__ import annotations
+
+import wave
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, FrozenSet, List, Optional, Tuple
+
+from core.command_router import CommandType, determine_command_type
+
+
+# Інтенти, на які можна відповісти з часткової гіпотези: відповідь не залежить
+# від решти фрази. Музика сюди не входить — «пауза» і «включи X» в роутері це
+# один SPOTIFY-інтент, і назва треку відома лише в кінці фрази.
+EARLY_INTENTS: FrozenSet[str] = frozenset({CommandType.TIME, CommandType.DATE})
+
+SAMPLE_RATE = 16000
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-partial")
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """PCM16 mono → WAV bytes"""
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class StreamingSTT(ABC):
+    """Базовий рушій: PCM 16 кГц по чанках → часткові гіпотези"""
+
+    def __init__(self):
+        self.partial = ""
+        self._pcm = bytearray()
+
+    @property
+    def audio_seconds(self) -> float:
+        return len(self._pcm) / 2 / SAMPLE_RATE
+
+    def feed(self, pcm: bytes) -> Optional[str]:
+        """
+        Додає чанк аудіо
+
+        Returns:
+            Нова часткова гіпотеза, якщо вона змінилась, інакше None
+        """
+        self._pcm.extend(pcm)
+        hypothesis = self._poll()
+        if hypothesis is not None and hypothesis != self.partial:
+            self.partial = hypothesis
+            return hypothesis
+        return None
+
+    @abstractmethod
+    def _poll(self) -> Optional[str]:
+        """Поточна гіпотеза рушія (None — поки немає)"""
+
+    @abstractmethod
+    def finish(self) -> str:
+        """Фінальний транскрипт усього запису"""
+
+    def close(self) -> None:
+        """Відкидає незавершену роботу"""
+
+
+class WhisperWindowSTT(StreamingSTT):
+    """Псевдо-стрімінг поверх Whisper: перерозпізнає накопичений запис у фоні"""
+
+    def __init__(
+        self,
+        transcribe: Callable[[bytes], str],
+        interval: float = 0.8,
+        max_partial_seconds: float = 4.0,
+    ):
+        """
+        Args:
+            transcribe: WAV bytes → текст (обгортка transcribe_audio)
+            interval: Скільки нового аудіо накопичити між частковими запитами
+            max_partial_seconds: Довші фрази не перерозпізнаємо (ціна росте квадратично,
+                а ранні інтенти — короткі команди)
+        """
+        super().__init__()
+        self.transcribe = transcribe
+        self.interval = interval
+        self.max_partial_seconds = max_partial_seconds
+        self._future: Optional[Future] = None
+        self._submitted_bytes = 0
+        self.requests = 0
+
+    def _poll(self) -> Optional[str]:
+        hypothesis = None
+        if self._future is not None and self._future.done():
+            try:
+                hypothesis = self._future.result()
+            except Exception as e:
+                print(f"⚠️  Часткове STT не вдалося: {e}")
+            self._future = None
+
+        grown = (len(self._pcm) - self._submitted_bytes) / 2 / SAMPLE_RATE
+        if self._future is None and grown >= self.interval and self.audio_seconds <= self.max_partial_seconds:
+            self._submitted_bytes = len(self._pcm)
+            self.requests += 1
+            self._future = _executor.submit(self.transcribe, pcm_to_wav(bytes(self._pcm)))
+        return hypothesis
+
+    def finish(self) -> str:
+        self.close()
+        return self.transcribe(pcm_to_wav(bytes(self._pcm)))
+
+    def close(self) -> None:
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+
+class ScriptedSTT(StreamingSTT):
+    """Локальний двійник: гіпотези за сценарієм [(секунда аудіо, текст), ...]"""
+
+    def __init__(self, script: List[Tuple[float, str]], final: Optional[str] = None):
+        super().__init__()
+        self.script = sorted(script)
+        self.final = final
+
+    def _poll(self) -> Optional[str]:
+        hypothesis = None
+        for at, text in self.script:
+            if at <= self.audio_seconds:
+                hypothesis = text
+        return hypothesis
+
+    def finish(self) -> str:
+        if self.final is not None:
+            return self.final
+        return self.script[-1][1] if self.script else ""
+
+
+class StreamingRecognizer:
+    """Годує рушій аудіо і ловить ранній інтент у часткових гіпотезах"""
+
+    def __init__(self, engine: StreamingSTT, language: str = "uk", early_intents: FrozenSet[str] = EARLY_INTENTS):
+        self.engine = engine
+        self.language = language
+        self.early_intents = early_intents
+        self.early_intent: Optional[str] = None
+        self.early_text: Optional[str] = None
+
+    def feed(self, pcm: bytes) -> bool:
+        """
+        Чанк PCM 16 кГц із запису
+
+        Returns:
+            True, якщо з часткової гіпотези вже зрозуміло, що відповідати (запис можна зупинити)
+        """
+        if self.early_intent is not None:
+            return True
+        partial = self.engine.feed(pcm)
+        if not partial:
+            return False
+        # Лише шаблони: обірвана фраза для класифікатора — шум
+        command_type, _ = determine_command_type(partial, self.language, use_classifier=False)
+        print(f"  💬 Часткова гіпотеза ({self.engine.audio_seconds:.1f}s): {partial} → {command_type}")
+        if command_type in self.early_intents:
+            self.early_intent = command_type
+            self.early_text = partial
+            print(f"⚡ Ранній інтент {command_type} — відповідаю, не чекаючи кінця фрази")
+            return True
+        return False
+
+    def close(self) -> None:
+        self.engine.close()
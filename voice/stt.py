@@ -1,68 +1,53 @@
 from __future__ import annotations
 
-from typing import BinaryIO
-from io import BytesIO
+import os
+from typing import BinaryIO, Optional
 
-from openai import OpenAI
+from core.metrics import metrics
+from voice.stt_engine import NamedBytesIO, STTEngine, get_stt_engine  # noqa: F401  (NamedBytesIO — зворотна сумісність)
 
-from core.api_manager import api_manager
 
-
-class NamedBytesIO(BytesIO):
-    """In-memory bytes buffer з іменем файлу для сумісності з OpenAI SDK."""
-    def __init__(self, initial_bytes: bytes, name: str):
-        super().__init__(initial_bytes)
-        self.name = name  # деякі SDK очікують атрибут .name
-
-
-def transcribe_audio(telegram_user_id: int, audio_file: str | bytes | BinaryIO, language: str = "uk") -> str:
+def transcribe_audio(
+    telegram_user_id: int,
+    audio_file: str | bytes | BinaryIO,
+    language: str = "uk",
+    filename: Optional[str] = None,
+    engine: Optional[STTEngine] = None,
+) -> str:
     """
-    Розпізнавання голосу через OpenAI Whisper API
-    
+    Розпізнавання голосу обраним STT рушієм (OpenAI Whisper API за замовчуванням)
+
     Args:
         telegram_user_id: ID користувача Telegram
         audio_file: Аудіо файл (шлях, bytes або BinaryIO)
         language: Мова аудіо (uk, en, de) для покращення точності розпізнавання
-    
+        filename: Ім'я файлу для bytes (розширення визначає формат: audio.flac, audio.ogg)
+        engine: Рушій STT (None — з налаштувань STT_ENGINE)
+
     Returns:
         Розпізнаний текст
     """
     import time
     start_time = time.time()
-    
-    print("🎧 Розпізнаю голос через Whisper...")
-    
-    api_key = api_manager.get_openai_key(telegram_user_id)
-    client = OpenAI(api_key=api_key)
 
-    # Whisper API приймає ISO 639-1 коди мов
-    # uk = українська, en = англійська, de = німецька
+    engine = engine or get_stt_engine(None, telegram_user_id)
+    print(f"🎧 Розпізнаю голос ({engine.name})...")
+
+    # Рушії працюють з bytes: шлях і відкритий файл читаємо в пам'ять
     if isinstance(audio_file, str):
+        filename = filename or os.path.basename(audio_file)
         with open(audio_file, "rb") as f:
-            response = client.audio.transcriptions.create(
-                model="whisper-1", 
-                file=f,
-                language=language
-            )
+            audio = f.read()
     elif isinstance(audio_file, bytes):
-        # Обробка in-memory bytes без файлової системи
-        buffer = NamedBytesIO(audio_file, name="audio.wav")
-        response = client.audio.transcriptions.create(
-            model="whisper-1", 
-            file=buffer,
-            language=language
-        )
+        audio = audio_file
     else:
-        # BinaryIO (наприклад, вже відкритий файл/буфер)
-        response = client.audio.transcriptions.create(
-            model="whisper-1", 
-            file=audio_file,
-            language=language
-        )
-    
-    elapsed = time.time() - start_time
-    print(f"⏱️  STT (Whisper) відповіла за {elapsed:.1f}s")
+        filename = filename or os.path.basename(getattr(audio_file, "name", "") or "audio.wav")
+        audio = audio_file.read()
 
-    return getattr(response, "text", "")
+    text = engine.transcribe(audio, language=language, filename=filename or "audio.wav")
 
+    elapsed = time.time() - start_time
+    metrics.observe("stt_request", elapsed)
+    print(f"⏱️  STT ({engine.name}) відповіла за {elapsed:.1f}s (аудіо {len(audio) // 1024} KB)")
 
+    return text
@@ -0,0 +1,180 @@
+"""
+Рушії розпізнавання мови (STT).
+
+- OpenAISTTEngine — Whisper API; клієнт кешується на ключ (core.api_manager.openai_client), а не створюється
+  на кожен запит;
+- LocalWhisperSTTEngine — faster-whisper на CPU: модель вантажиться один раз
+  на процес і лишається «теплою» (0.5–3 с замість 3–6 с через API);
+- FakeSTTEngine — детермінований двійник для тестів.
+
+Рушій обирається для користувача (users.stt_engine) або глобально (STT_ENGINE).
+"""
+
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import get_settings
+
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+
+class STTEngine(ABC):
+    """Базовий рушій: аудіо bytes → текст"""
+
+    name = "base"
+    remote = False  # True — аудіо йде мережею (варто стискати перед відправкою)
+
+    def is_available(self) -> bool:
+        return True
+
+    def warm_up(self) -> None:
+        """Підготовка наперед (завантаження моделі, з'єднання)"""
+
+    @abstractmethod
+    def transcribe(self, audio: bytes, language: str = "uk", filename: str = "audio.wav") -> str:
+        """Текст розпізнаного аудіо"""
+
+
+# ----------------------------------------------------------------------
+# OpenAI Whisper API
+# ----------------------------------------------------------------------
+
+class NamedBytesIO(BytesIO):
+    """In-memory bytes buffer з іменем файлу для сумісності з OpenAI SDK."""
+    def __init__(self, initial_bytes: bytes, name: str):
+        super().__init__(initial_bytes)
+        self.name = name  # деякі SDK очікують атрибут .name
+
+
+class OpenAISTTEngine(STTEngine):
+    """Whisper API (whisper-1)"""
+
+    name = "openai"
+    remote = True
+
+    def __init__(self, telegram_user_id: int, model: str = "whisper-1"):
+        self.telegram_user_id = telegram_user_id
+        self.model = model
+
+    def _client(self) -> Any:
+        from core.api_manager import api_manager, openai_client
+        return openai_client(api_manager.get_openai_key(self.telegram_user_id))
+
+    def warm_up(self) -> None:
+        try:
+            self._client()
+        except Exception as e:
+            print(f"⚠️  OpenAI STT: клієнт не створено: {e}")
+
+    def transcribe(self, audio: bytes, language: str = "uk", filename: str = "audio.wav") -> str:
+        # Whisper API приймає ISO 639-1 коди мов (uk, en, de)
+        response = self._client().audio.transcriptions.create(
+            model=self.model,
+            file=NamedBytesIO(audio, name=filename),
+            language=language,
+        )
+        return getattr(response, "text", "")
+
+
+# ----------------------------------------------------------------------
+# Локальний faster-whisper
+# ----------------------------------------------------------------------
+
+_local_models: Dict[Tuple[str, str], Any] = {}
+_local_lock = threading.Lock()
+
+
+class LocalWhisperSTTEngine(STTEngine):
+    """faster-whisper на CPU, модель спільна для всіх користувачів процесу"""
+
+    name = "local"
+
+    def __init__(self, model_size: Optional[str] = None, compute_type: Optional[str] = None):
+        settings = get_settings()
+        self.model_size = model_size or settings.stt_local_model
+        self.compute_type = compute_type or settings.stt_local_compute_type
+
+    def is_available(self) -> bool:
+        return FASTER_WHISPER_AVAILABLE
+
+    def _model(self) -> Any:
+        key = (self.model_size, self.compute_type)
+        with _local_lock:
+            model = _local_models.get(key)
+            if model is None:
+                print(f"🔄 Завантажую локальну модель Whisper ({self.model_size}, {self.compute_type})...")
+                model = _local_models[key] = WhisperModel(self.model_size, device="cpu", compute_type=self.compute_type)
+                print("✅ Локальна модель Whisper готова")
+            return model
+
+    def warm_up(self) -> None:
+        self._model()
+
+    def transcribe(self, audio: bytes, language: str = "uk", filename: str = "audio.wav") -> str:
+        if filename.endswith(".wav"):
+            # WAV декодуємо самі — без зайвого проходу через ffmpeg/av
+            from voice.audio_encoding import wav_to_pcm
+            from core import dsp
+
+            pcm, rate = wav_to_pcm(audio)
+            if rate != 16000:
+                pcm = dsp.resample(pcm, rate, 16000)
+            source: Any = dsp.pcm16_to_array(pcm).astype(np.float32) / 32768.0
+        else:
+            source = BytesIO(audio)
+        segments, _ = self._model().transcribe(source, language=language, beam_size=1, vad_filter=False)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+# ----------------------------------------------------------------------
+# Двійник для тестів
+# ----------------------------------------------------------------------
+
+class FakeSTTEngine(STTEngine):
+    """Повертає заздалегідь задані тексти по черзі (останній — далі завжди)"""
+
+    name = "fake"
+
+    def __init__(self, responses: Optional[List[str]] = None):
+        self.responses = list(responses or [""])
+        self.calls: List[Tuple[bytes, str, str]] = []
+
+    def transcribe(self, audio: bytes, language: str = "uk", filename: str = "audio.wav") -> str:
+        self.calls.append((audio, language, filename))
+        index = min(len(self.calls), len(self.responses)) - 1
+        return self.responses[index]
+
+
+STT_ENGINES = ("openai", "local", "fake")
+
+# Що користувач може обрати в Telegram ("stt: ..."); fake — лише для тестів і конфігу
+USER_STT_ENGINES = ("openai", "local", "auto")
+
+
+def get_stt_engine(name: Optional[str], telegram_user_id: int) -> STTEngine:
+    """
+    Рушій за назвою (None — з налаштувань STT_ENGINE)
+
+    Локальний рушій без faster-whisper тихо замінюється на OpenAI.
+    """
+    name = (name or get_settings().stt_engine).lower()
+    if name == "local":
+        engine = LocalWhisperSTTEngine()
+        if engine.is_available():
+            return engine
+        print("⚠️  faster-whisper не встановлено — STT через OpenAI")
+    elif name == "fake":
+        return FakeSTTEngine()
+    elif name != "openai":
+        print(f"⚠️  Невідомий STT рушій '{name}', використовую OpenAI")
+    return OpenAISTTEngine(telegram_user_id)
@@ -24,27 +24,77 @@ except:
     pass
 
 # Тепер імпорти решти
+import threading
+import random
 import time
-from core.wake_word import WakeWordDetector
+from typing import Any, Dict, List, Optional, Tuple, Union
+from core.wake_word import WakeWordDetector, WakeWordMode
+from core.keyword_spotter import templates_from_json
 from hardware.led_controller import led_controller
 from core.audio_manager import AudioManager
+from core.audio_capture import audio_capture
+from core.playback import playback
 from voice.stt import transcribe_audio
-from core.tts import text_to_speech
+from voice.stt_engine import STTEngine, get_stt_engine
+from voice.audio_encoding import prepare_for_upload
+from voice.speech_gate import SpeechGate, is_hallucination
+from core.cues import get_cue
+from core.metrics import metrics
+from voice.speculative_stt import SpeculativeTranscriber
+from voice.streaming_stt import StreamingRecognizer, WhisperWindowSTT
+from core.tts import speech_key, stream_speech, text_to_speech, warm_up as warm_tts_cache
+from core.tts_cache import tts_cache
+from core.pcm_cache import pcm_cache
+from core.speech_pipeline import SpeechPipeline, split_sentences
+from core.clip_speech import ClipLibrary
+from core.spoken import to_speech
+from core.llm_stream import StreamedReply, iter_tokens
+from core.phrases import EMPTY_COMMAND, FALLBACK, speaker_phrases, telegram_phrases
 from storage.database import SessionLocal
 from storage.models import User
-from core.command_router import process_command as route_command
+from core.command_router import LLM_RACE_INTENTS, CommandType, determine_command_type, get_intent_classifier
+from core.race import RaceTask, race
+from config import get_settings
 
 
 class VoiceDaemon:
     def __init__(self, telegram_user_id: int):
         self.user_id = telegram_user_id
+        # Режим детектора з конфігу (vad / spectral / ...)
+        try:
+            wake_mode = WakeWordMode(get_settings().wake_word_mode.lower())
+        except ValueError:
+            print(f"⚠️  Невідомий WAKE_WORD_MODE, використовую VAD")
+            wake_mode = WakeWordMode.VAD
         # Підвищена чутливість VAD для кращого спрацьовування після першої команди
-        self.wake_word = WakeWordDetector(sensitivity=0.8)
+        self.wake_word = WakeWordDetector(mode=wake_mode, sensitivity=0.8)
         self.audio = AudioManager()
         self.is_running = False
         self.is_paused = False  # Новий стан паузи
         self.language = "uk"
         self.personality = None
+        self.preroll_seconds = get_settings().voice_preroll_seconds
+        self.stt_engine: Optional[STTEngine] = None
+        self.speech_gate = SpeechGate(threshold=get_settings().voice_speech_gate_threshold)
+        self.tts_format = get_settings().tts_playback_format  # pcm — відповідь без декодування MP3
+        self.tts_streaming = get_settings().tts_streaming
+        pipeline_workers = get_settings().tts_pipeline_workers
+        self.speech_pipeline: Optional[SpeechPipeline] = None
+        if pipeline_workers > 0:
+            self.speech_pipeline = SpeechPipeline(
+                synthesize=lambda segment: text_to_speech(
+                    self.user_id, segment, self.language, voice="onyx", response_format=self.tts_format
+                ),
+                play=lambda audio: self.audio.play_audio(audio),
+                max_workers=pipeline_workers,
+            )
+        self.clip_speech = get_settings().clip_speech
+        self.llm_streaming = get_settings().llm_streaming
+        race_policy = get_settings().llm_race_policy.lower()
+        if race_policy not in LLM_RACE_INTENTS:
+            print(f"⚠️  Невідома LLM_RACE_POLICY '{race_policy}', змагання вимкнено")
+        self.race_intents = LLM_RACE_INTENTS.get(race_policy, frozenset())
+        self._clips: Optional[ClipLibrary] = None
         
     def load_user_settings(self):
         """Завантажує налаштування з БД"""
@@ -59,6 +109,10 @@ class VoiceDaemon:
         if user:
             self.language = user.language
             self.personality = user.personality_prompt
+            # STT рушій: вибір користувача або STT_ENGINE з конфігу
+            self.stt_engine = get_stt_engine(user.stt_engine, self.user_id)
+            # Зразки ключової фрази (режим KEYWORD, scripts/enroll_wake_word.py)
+            self.wake_word.set_keyword_templates(templates_from_json(user.wake_word_templates))
             return True
         return False
     
@@ -90,8 +144,22 @@ class VoiceDaemon:
             print("❌ Користувач не знайдений")
             return
             
+        # Локальна модель вантажиться один раз тут, а не на першій команді
+        if self.stt_engine is not None:
+            self.stt_engine.warm_up()
+        
+        # Вихідний потік відкривається заздалегідь — перша відповідь не чекає на ALSA
+        playback.start()
+        
+        # Статичні фрази — у TTS-кеш у фоні, щоб звучали без мережі
+        threading.Thread(target=self._warm_tts_cache, name="tts-warmup", daemon=True).start()
+        # Класифікатор інтентів навчається до першої команди, а не на її промаху
+        threading.Thread(
+            target=get_intent_classifier, args=(self.language, self.user_id), name="intent-warmup", daemon=True
+        ).start()
+        
         self.is_running = True
-        print(f"✅ Daemon запущено (мова: {self.language})")
+        print(f"✅ Daemon запущено (мова: {self.language}, STT: {self.stt_engine.name if self.stt_engine else '—'})")
         
         if listen_immediately:
             print("🎙️ Режим постійного прослуховування активовано")
@@ -126,88 +194,262 @@ class VoiceDaemon:
         print("👂 Слухаю команду...")
         
         # 2. Записуємо аудіо
-        # Синхронізуємо sample rate запису з відкритим VAD, щоб уникнути Invalid sample rate
-        try:
-            if hasattr(self.wake_word, "sample_rate"):
-                self.audio.sample_rate = self.wake_word.sample_rate  # type: ignore[attr-defined]
-        except Exception:
-            pass
-        # Звільняємо мікрофон wake-word на час запису
-        try:
-            self.wake_word.pause_listen()
-        except Exception:
-            pass
+        # Мікрофон не перевідкриваємо: і wake word, і запис читають
+        # спільний потік захоплення (core/audio_capture.py)
         
-        # Коротка пауза перед записом (щоб користувач встиг почати говорити після wake word)
-        import time
-        time.sleep(0.3)
+        # Без паузи перед записом: pre-roll повертає звук, сказаний разом із
+        # тригером ("Привіт бот, котра година" — один хід без мертвої зони)
+        settings = get_settings()
+        # STT стартує вже на першій паузі, поки endpointer вичікує кінець тиші
+        speculative = None
+        if settings.voice_speculative_stt:
+            speculative = SpeculativeTranscriber(
+                self._transcribe,
+                pause_seconds=settings.voice_speculative_pause
+            )
+        # Часткові гіпотези під час запису: «котра година» відповідаємо, не чекаючи тиші
+        recognizer = None
+        if settings.voice_streaming_stt:
+            recognizer = StreamingRecognizer(
+                WhisperWindowSTT(
+                    self._transcribe,
+                    interval=settings.voice_partial_interval
+                ),
+                language=self.language
+            )
         
-        # Запис до тиші (більш природно)
+        # Кінець фрази — від живого рівня шуму wake-детектора, а не фіксованих 1.5 с
         audio_data = self.audio.record_until_silence(
-            silence_threshold=200,  # Зменшено з 500 до 200
-            silence_duration=1.5,   # 1.5 сек тиші = кінець
-            max_duration=10         # максимум 10 сек
+            silence_threshold=200,  # нижня межа порогу мови
+            silence_duration=settings.voice_endpoint_max_silence,  # тиша для незавершеної фрази
+            max_duration=10,        # максимум 10 сек
+            preroll_seconds=self.preroll_seconds,
+            noise_rms=self.wake_word.noise_rms,
+            speculative=speculative,
+            stop_when=recognizer.feed if recognizer is not None else None
         )
         print("✅ Запис завершено")
+        if recognizer is not None:
+            recognizer.close()
         
-        # КРИТИЧНО: звільняємо PyAudio ресурси перед відновленням VAD
-        try:
-            self.audio.cleanup()
-        except Exception as e:
-            print(f"⚠️  Помилка cleanup AudioManager: {e}")
+        # 3. Розпізнаємо (STT) з вказанням мови для точності
+        if recognizer is not None and recognizer.early_text:
+            command = recognizer.early_text
+        else:
+            # Запис без мови не відправляємо ні в STT, ні далі в LLM/TTS
+            probability = self.speech_gate.speech_probability(audio_data)
+            if probability < self.speech_gate.threshold:
+                print(f"🔇 Мови в записі немає (p={probability:.2f}, {self.speech_gate.last_voiced_seconds:.2f}s)")
+                self._skip_turn("no_speech")
+                return
+            if speculative is not None:
+                command = speculative.finish(audio_data)
+            else:
+                command = self._transcribe(audio_data)
+        print(f"📝 Розпізнано: {command}")
         
-        # Невелика пауза для стабілізації ALSA
-        import time as _t
-        _t.sleep(0.3)
+        if is_hallucination(command):
+            print(f"🔇 Порожній транскрипт або галюцінація Whisper: '{command}'")
+            self._skip_turn("hallucination")
+            return
         
-        # Переініціалізуємо AudioManager для відтворення
+        # 4. Обробляємо команду
         try:
-            self.audio = AudioManager()
-        except Exception as e:
-            print(f"⚠️  Помилка переініціалізації AudioManager: {e}")
+            led_controller.start_thinking()
+        except Exception:
+            pass
+        # Інтент — один раз на хід: кліпи, гонка з LLM і router беруть його звідси
+        self._refresh_language()
+        intent = determine_command_type(command, self.language, self.user_id)
+        # Час і дата — склеєні кліпи, без router/LLM/TTS
+        if not self._speak_clips(intent[0]):
+            response = self.process_command(command, intent)
+            
+            # 5-6. Відповідаємо голосом (TTS) через ІСНУЮЧИЙ self.audio
+            if isinstance(response, StreamedReply):
+                self._speak_stream(response)
+            else:
+                self._speak(response)
         
-        # Відновлюємо wake-word після запису
-        try:
-            self.wake_word.resume_listen()
-        except Exception as e:
-            print(f"⚠️  Помилка resume_listen: {e}")
+        # Голос бота не повинен потрапити в pre-roll наступної команди
+        audio_capture.mark_barrier()
         
-        # 3. Розпізнаємо (STT) з вказанням мови для точності
-        command = transcribe_audio(self.user_id, audio_data, language=self.language)
-        print(f"📝 Розпізнано: {command}")
+        try:
+            led_controller.blink_success()
+        except Exception:
+            pass
+        print("✅ Відповідь відтворена")
         
-        # 4. Обробляємо команду
+    def _speak(self, text: str) -> None:
+        """TTS → динамік: потоково, поки відповідь завантажується; при збої — цілим файлом"""
+        print("🔊 Відтворюю відповідь...")
         try:
-            led_controller.start_thinking()
+            led_controller.start_speaking()
         except Exception:
             pass
-        response = self.process_command(command)
         
-        # 5. Відповідаємо голосом (TTS)
+        # Системні фрази можуть іти локальним рушієм (TTS_SYSTEM_ENGINE), відповіді — хмарним
+        kind = "system" if text in speaker_phrases(self.language) else "reply"
+        
+        # Гарячі фрази: PCM-кеш (mmap) → повтор з TTS-кешу (і перенос у PCM-кеш)
+        key = speech_key(self.user_id, text, self.language, "onyx", self.tts_format, kind)
+        if self.audio.play_cached(key):
+            return
+        if tts_cache.contains(key, self.tts_format):
+            audio_response = text_to_speech(
+                self.user_id, text, self.language, voice="onyx", response_format=self.tts_format, kind=kind
+            )
+            if not (self.audio.cache_pcm(key, audio_response) and self.audio.play_cached(key)):
+                self.audio.play_audio(audio_response)
+            return
+        
+        # Кілька речень — синтезуємо паралельно, звучить з першого
+        segments = split_sentences(text)
+        if self.speech_pipeline is not None and len(segments) > 1:
+            if self.speech_pipeline.speak(text, segments):
+                return
+        
+        if self.tts_streaming:
+            chunks = stream_speech(self.user_id, text, self.language, voice="onyx", kind=kind)  # Глибокий чоловічий голос
+            if self.audio.play_stream(chunks):
+                return
+            print("⚠️  Потоковий TTS не відповів — пробую звичайний")
+        
         audio_response = text_to_speech(
             self.user_id, 
-            response, 
+            text, 
             self.language,
-            voice="onyx"  # Глибокий чоловічий голос
+            voice="onyx",
+            response_format=self.tts_format,
+            kind=kind
         )
+        self.audio.play_audio(audio_response)
         
-        # 6. Відтворюємо через ІСНУЮЧИЙ self.audio
-        print("🔊 Відтворюю відповідь...")
+    def _speak_stream(self, reply: StreamedReply) -> None:
+        """LLM → TTS по клаузах: перша звучить, поки модель дописує решту"""
+        print("🔊 Відтворюю відповідь (потоково)...")
         try:
             led_controller.start_speaking()
         except Exception:
             pass
         
-        # Використовуємо існуючий self.audio (НЕ створюємо новий AudioManager)
-        self.audio.play_audio(audio_response)
+        if self.speech_pipeline is not None:
+            if self.speech_pipeline.speak_stream(reply, on_first_audio=reply.mark_first_audio):
+                print(f"✓ LLM: {reply.text[:50]}...")
+                return
+            text = reply.text
+        else:
+            try:
+                text = " ".join(reply)
+            except Exception as e:
+                print(f"⚠️  Потік LLM перервано: {e}")
+                text = ""
+            if text:
+                reply.mark_first_audio()
+        # Нічого не прозвучало (збій TTS або порожня відповідь) — звичайний шлях
+        self._speak(text or random.choice(FALLBACK.get(self.language, FALLBACK["en"])))
+        
+    def _clip_library(self) -> ClipLibrary:
+        """Бібліотека кліпів поточної мови (мова може змінитися в Telegram)"""
+        if self._clips is None or self._clips.language != self.language:
+            self._clips = ClipLibrary(get_settings().clip_library_dir, self.language, voice="onyx")
+        return self._clips
         
+    def _speak_clips(self, command_type: str) -> bool:
+        """Озвучує час/дату з кліпів; False — не та команда або кліпів ще немає"""
+        if not self.clip_speech:
+            return False
+        if command_type == CommandType.TIME:
+            audio = self._clip_library().render_time()
+        elif command_type == CommandType.DATE:
+            audio = self._clip_library().render_date()
+        else:
+            return False
+        if audio is None:
+            return False
+        print(f"🧱 Відповідь з кліпів ({command_type})")
         try:
-            led_controller.blink_success()
+            led_controller.start_speaking()
         except Exception:
             pass
-        print("✅ Відповідь відтворена")
+        self.audio.play_audio(audio)
+        return True
+        
+    def _warm_tts_cache(self) -> None:
+        """Рендерить статичні фрази в TTS-кеш (динамік + голосові в Telegram)"""
+        try:
+            spoken = warm_tts_cache(
+                self.user_id, speaker_phrases(self.language), self.language,
+                voice="onyx", response_format=self.tts_format
+            )
+            sent = warm_tts_cache(self.user_id, telegram_phrases(self.language), self.language, kind="reply")
+            stats = tts_cache.stats()
+            print(f"🗄️  TTS-кеш прогріто: +{spoken + sent} фраз, всього {stats['entries']} ({stats['bytes'] / 1024:.0f} KB)")
+            
+            # Фрази для динаміка — ще й у формат пристрою (PCM-кеш, mmap)
+            for phrase in speaker_phrases(self.language):
+                key = speech_key(self.user_id, phrase, self.language, "onyx", self.tts_format, "system")
+                if pcm_cache.contains(key, playback.rate, playback.channels):
+                    continue
+                if tts_cache.contains(key, self.tts_format):
+                    audio = text_to_speech(
+                        self.user_id, phrase, self.language, voice="onyx", response_format=self.tts_format, kind="system"
+                    )
+                    self.audio.cache_pcm(key, audio)
+            pcm_stats = pcm_cache.stats()
+            print(f"⚡ PCM-кеш: {pcm_stats['entries']} фраз ({pcm_stats['bytes'] / 1024:.0f} KB)")
+            
+            # Кліпи для часу і дати (один раз на мову і голос)
+            if self.clip_speech:
+                year = time.localtime().tm_year
+                built = self._clip_library().build(
+                    lambda text: text_to_speech(self.user_id, text, self.language, voice="onyx", response_format="pcm", use_cache=False),
+                    years=(year, year + 1),
+                )
+                if built:
+                    print(f"🧱 Кліпи часу/дати: +{built}")
+        except Exception as e:
+            print(f"⚠️  Прогрів TTS-кешу не вдався: {e}")
+        
+    def _skip_turn(self, reason: str) -> None:
+        """Хід без команди: локальний сигнал замість STT/LLM/TTS"""
+        skipped = metrics.increment(f"turns_skipped_{reason}")
+        print(f"⏭️  Хід пропущено ({reason}), всього: {skipped}")
+        self.audio.play_audio(get_cue("not_heard"))
+        audio_capture.mark_barrier()
+        try:
+            led_controller.stop_animation()
+        except Exception:
+            pass
+        
+    def _transcribe(self, audio_wav: bytes) -> str:
+        """Обрізає тишу, стискає запис (лише для мережевих рушіїв) і відправляє в STT"""
+        engine = self.stt_engine or get_stt_engine(None, self.user_id)
+        data, filename = prepare_for_upload(
+            audio_wav,
+            threshold=self.audio.last_speech_threshold,
+            audio_format=get_settings().stt_upload_format if engine.remote else "wav"
+        )
+        return transcribe_audio(self.user_id, data, language=self.language, filename=filename, engine=engine)
+        
+    def _refresh_language(self) -> None:
+        """Оновлює мову користувача з БД (її можуть змінити в Telegram)"""
+        try:
+            db = SessionLocal()
+            user = db.query(User).filter(User.telegram_user_id == self.user_id).first()
+            if user:
+                self.language = user.language
+        except Exception:
+            pass
+        finally:
+            try:
+                db.close()  # type: ignore[name-defined]
+            except Exception:
+                pass
         
-    def process_command(self, command: str) -> str:
+    def process_command(
+        self, command: str, intent: Optional[Tuple[str, Optional[Dict[str, Any]]]] = None
+    ) -> Union[str, StreamedReply]:
         """
         Обробляє команду з застосуванням промпту особистості "Орест" через OpenAI
         
@@ -215,21 +457,16 @@ class VoiceDaemon:
         1. Отримуємо базову відповідь від command_router (факти: час, дата, веб-пошук)
         2. Пропускаємо через OpenAI з промптом особистості для стилізації
         3. Повертаємо відповідь у стилі "Ореста"
-        """
-        import re
-        import random
-        from datetime import datetime
-        from openai import OpenAI
-        from core.api_manager import api_manager
         
+        Повертає текст для озвучки (core/spoken: без емодзі, у межах бюджету символів)
+        або StreamedReply, якщо відповідь LLM ще генерується (LLM_STREAMING).
+        
+        intent — (тип, параметри), уже визначені в handle_command; без нього
+        мова оновлюється з БД і команда класифікується тут.
+        """
         # Перевірка, чи команда не порожня
         if not command or command.strip() == "":
-            if self.language == "uk":
-                return "Вибачте, я не почув жодної команди. Спробуйте ще раз."
-            elif self.language == "de":
-                return "Entschuldigung, ich habe keinen Befehl gehört. Bitte versuchen Sie es erneut."
-            else:
-                return "Sorry, I didn't hear any command. Please try again."
+            return EMPTY_COMMAND.get(self.language, EMPTY_COMMAND["en"])
         
         # Жорстко зашитий промпт особистості
         BASE_PERSONALITY = (
@@ -240,41 +477,31 @@ class VoiceDaemon:
             "нечіткий — саркастично попроси перефразувати."
         )
         
-        # Оновлюємо мову користувача з БД
-        try:
-            db = SessionLocal()
-            user = db.query(User).filter(User.telegram_user_id == self.user_id).first()
-            if user:
-                self.language = user.language
-        except Exception:
-            pass
-        finally:
-            try:
-                db.close()  # type: ignore[name-defined]
-            except Exception:
-                pass
+        if intent is None:
+            self._refresh_language()
+            intent = determine_command_type(command, self.language, self.user_id)
         
         self.personality = BASE_PERSONALITY
         
+        # Повільні (мережеві) інтенти — наввипередки з LLM; класифікація лишається локальною
+        command_type, params = intent
+        if command_type in self.race_intents:
+            raced = self._race_router_and_llm(command, command_type, params)
+            if raced:
+                return raced
+        
         # КРОК 1: Отримуємо базову відповідь (факти) від command_router
         base_response = None
-        is_fallback = False
         
         try:
-            from core.command_router import process_command as router_process
-            base_response = router_process(command, self.language, self.user_id)
-            
-            # Перевіряємо чи це fallback відповідь
-            fallback_keywords = [
-                "не зрозумів", "didn't understand", "nicht verstanden",
-                "не впевнений", "not sure", "nicht sicher",
-                "не розпізнав", "didn't recognize", "nicht erkannt"
-            ]
-            is_fallback = any(keyword in base_response.lower() for keyword in fallback_keywords)
+            from core.command_router import process_command_result
+            base_reply = process_command_result(command, self.language, self.user_id, intent=intent)
+            # У динамік — коротка форма без емодзі (повний текст лишається для Telegram)
+            base_response = base_reply.speech
             
-            # Якщо це НЕ fallback (тобто конкретна команда: час, дата, погода)
-            # → повертаємо відповідь БЕЗ OpenAI для швидкості
-            if not is_fallback:
+            # Якщо router впізнав команду (шаблоном або локальним класифікатором:
+            # час, дата, погода) → повертаємо відповідь БЕЗ OpenAI для швидкості
+            if base_reply.intent != CommandType.UNKNOWN:
                 print(f"✓ Router обробив: {base_response[:50]}...")
                 return base_response
             
@@ -290,73 +517,42 @@ class VoiceDaemon:
         # КРОК 2: Пропускаємо через LLM (Groq/OpenAI) з промптом особистості
         # (тільки для fallback або складних запитів)
         try:
-            import time
-            start_time = time.time()
-            
-            # Використовуємо тільки API (Groq/OpenAI)
-            # Спочатку перевіряємо Groq з .env
-            from config import settings
-            groq_key = settings.groq_api_key
-            
-            if groq_key:
-                # Використовуємо Groq з .env
-                api_key = groq_key
-                is_groq = True
-            else:
-                # Fallback: OpenAI/Groq з БД користувача
-                api_key = api_manager.get_openai_key(self.user_id)
-                is_groq = api_key.startswith("gsk_") if api_key else False
-            
-            if api_key:
-                if is_groq:
-                    # Groq API (5x швидше!)
-                    client = OpenAI(
-                        api_key=api_key,
-                        base_url="https://api.groq.com/openai/v1"
-                    )
-                    model = "llama-3.1-8b-instant"  # Швидка модель
-                    print("⚡ Використовую Groq API (швидкий режим)")
-                else:
-                    # Стандартний OpenAI
-                    client = OpenAI(api_key=api_key)
-                    model = "gpt-3.5-turbo"
-                    print("🤖 Використовую OpenAI API")
-                
-                # Формуємо системний промт
-                system_prompt = f"{BASE_PERSONALITY}\n\nВідповідай українською мовою коротко (1-2 речення)."
-                
-                if self.language == "de":
-                    system_prompt = f"{BASE_PERSONALITY}\n\nAntworte auf Deutsch kurz (1-2 Sätze)."
-                elif self.language == "en":
-                    system_prompt = f"{BASE_PERSONALITY}\n\nAnswer in English briefly (1-2 sentences)."
-                
-                # Діагностика: показуємо що промпт використовується
-                print(f"💬 Промпт: {BASE_PERSONALITY[:50]}...")
-                
-                # Формуємо prompt користувача
-                user_prompt = f"Користувач сказав: {command}\n\nВідповідай у своєму стилі."
+            request = self._llm_request(command)
+            if request is not None:
+                client, model, messages = request
                 
                 # Викликаємо LLM з timeout
                 start_time = time.time()
+                request_started = time.perf_counter()
+                
+                if self.llm_streaming:
+                    # Токени по мірі генерації — перша клауза звучить до кінця відповіді
+                    stream = client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=80,
+                        temperature=0.8,
+                        timeout=15,
+                        stream=True
+                    )
+                    return StreamedReply(iter_tokens(stream), self.language, started=request_started)
                 
                 response = client.chat.completions.create(
                     model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
+                    messages=messages,
                     max_tokens=80,  # Зменшено для швидших відповідей
                     temperature=0.8,
                     timeout=15  # Максимум 15 секунд
                 )
                 
                 elapsed = time.time() - start_time
+                metrics.observe("llm_completion_time", time.perf_counter() - request_started)
                 print(f"⏱️  LLM відповіла за {elapsed:.1f}s")
                 
                 if response.choices and response.choices[0].message:
                     content = response.choices[0].message.content
                     if content:
-                        return content
+                        return to_speech(content, self.language, budget=0)
                         
         except Exception as e:
             print(f"❌ Помилка OpenAI: {e}")
@@ -369,31 +565,132 @@ class VoiceDaemon:
             return base_response
         
         # Остаточний fallback
-        responses = {
-            "uk": [
-                "Вибачте, я не зрозумів вашу команду.",
-                "Не впевнений, що ви маєте на увазі.",
-                "Можете сформулювати по-іншому?"
-            ],
-            "de": [
-                "Entschuldigung, ich habe Ihren Befehl nicht verstanden.",
-                "Ich bin nicht sicher, was Sie meinen.",
-                "Könnten Sie es anders formulieren?"
-            ],
-            "en": [
-                "Sorry, I didn't understand your command.",
-                "I'm not sure what you mean.",
-                "Could you rephrase that?"
-            ]
-        }
-        
-        language_responses = responses.get(self.language, responses["en"])
-        return random.choice(language_responses)
+        return random.choice(FALLBACK.get(self.language, FALLBACK["en"]))
+        
+    def _llm_request(self, command: str) -> Optional[Tuple[Any, str, List[Dict[str, str]]]]:
+        """Клієнт, модель і повідомлення для LLM з промптом особистості; None — немає ключа"""
+        from openai import OpenAI
+        from core.api_manager import api_manager
+        
+        # Використовуємо тільки API (Groq/OpenAI)
+        # Спочатку перевіряємо Groq з .env
+        from config import settings
+        groq_key = settings.groq_api_key
+        
+        if groq_key:
+            # Використовуємо Groq з .env
+            api_key = groq_key
+            is_groq = True
+        else:
+            # Fallback: OpenAI/Groq з БД користувача
+            api_key = api_manager.get_openai_key(self.user_id)
+            is_groq = api_key.startswith("gsk_") if api_key else False
+        
+        if not api_key:
+            return None
+        
+        if is_groq:
+            # Groq API (5x швидше!)
+            client = OpenAI(
+                api_key=api_key,
+                base_url="https://api.groq.com/openai/v1"
+            )
+            model = "llama-3.1-8b-instant"  # Швидка модель
+            print("⚡ Використовую Groq API (швидкий режим)")
+        else:
+            # Стандартний OpenAI
+            client = OpenAI(api_key=api_key)
+            model = "gpt-3.5-turbo"
+            print("🤖 Використовую OpenAI API")
+        
+        # Формуємо системний промт
+        system_prompt = f"{self.personality}\n\nВідповідай українською мовою коротко (1-2 речення)."
+        
+        if self.language == "de":
+            system_prompt = f"{self.personality}\n\nAntworte auf Deutsch kurz (1-2 Sätze)."
+        elif self.language == "en":
+            system_prompt = f"{self.personality}\n\nAnswer in English briefly (1-2 sentences)."
+        
+        # Діагностика: показуємо що промпт використовується
+        print(f"💬 Промпт: {(self.personality or '')[:50]}...")
+        
+        # Формуємо prompt користувача
+        user_prompt = f"Користувач сказав: {command}\n\nВідповідай у своєму стилі."
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        return client, model, messages
+        
+    def _race_router_and_llm(self, command: str, command_type: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        Повільний інтент router і LLM одночасно (LLM_RACE_POLICY); перша валідна відповідь
+        
+        None — LLM недоступна (далі звичайний шлях без змагання).
+        """
+        from core.command_router import history_label, record_history, run_intent
+        
+        try:
+            request = self._llm_request(command)
+        except Exception as e:
+            print(f"⚠️  LLM для змагання недоступна: {e}")
+            request = None
+        if request is None:
+            return None
+        client, model, messages = request
+        cancelled = threading.Event()
+        
+        def ask_llm() -> str:
+            stream = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=80,
+                temperature=0.8,
+                timeout=15,
+                stream=True
+            )
+            tokens = iter_tokens(stream)
+            parts = []
+            try:
+                for token in tokens:
+                    if cancelled.is_set():
+                        break  # router уже відповів — обриваємо генерацію
+                    parts.append(token)
+            finally:
+                tokens.close()
+            return "".join(parts).strip()
+        
+        router = RaceTask(
+            "router",
+            lambda: run_intent(command_type, params, command, self.language, self.user_id),
+            valid=lambda reply: reply.ok,
+        )
+        llm = RaceTask("llm", ask_llm, cancel=cancelled.set)
+        print(f"🏁 {command_type}: router і LLM наввипередки")
+        winner = race([router, llm], timeout=20)
+        
+        if winner is router:
+            record_history(self.user_id, command, router.result.text, self.language, history_label(command_type, params))
+            return router.result.speech
+        if winner is llm:
+            record_history(self.user_id, command, llm.result, self.language, history_label(command_type, params))
+            return to_speech(llm.result, self.language, budget=0)
+        # Router відповів помилкою («не знайдено»), а LLM не змогла — озвучуємо помилку
+        if router.done and router.result is not None:
+            return router.result.speech
+        return random.choice(FALLBACK.get(self.language, FALLBACK["en"]))
         
     def stop(self):
         """Зупиняє daemon"""
         self.is_running = False
+        if self.speech_pipeline is not None:
+            self.speech_pipeline.cancel()
         self.wake_word.stop()
+        try:
+            self.audio.cleanup()
+        except Exception:
+            pass
+        playback.stop()
         try:
             led_controller.stop_animation()
             led_controller.turn_off()